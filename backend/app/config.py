@@ -14,6 +14,68 @@ class Settings(BaseSettings):
     
     # OpenAI API 설정 (개발 환경에서는 선택적)
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"  # 로컬 테스트 서버로 교체 가능
+    CHAT_MODEL: str = "gpt-3.5-turbo"
+    LLM_TIMEOUT: float = 30.0  # 호출당 기본 타임아웃 (초)
+    LLM_MAX_CONCURRENCY: int = 8  # 동시 LLM 호출 수 제한
+    LLM_MAX_CONNECTIONS: int = 20  # keep-alive 연결 풀 크기
+    
+    # AI 공급자 선택 (openai: OpenAI 호환 API, fake: 네트워크 없는 결정적 가짜 응답)
+    AI_PROVIDER: str = "openai"
+    FAKE_AI_LATENCY_MS: float = 200.0  # 호출당 지연 (채팅은 첫 토큰까지)
+    FAKE_AI_TOKENS_PER_SECOND: float = 50.0  # 채팅 응답 생성 속도
+    FAKE_AI_COMPLETION_TOKENS: int = 200  # 채팅 응답 토큰 수 (max_tokens 이하)
+    
+    # RAG 인덱싱 설정
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_BATCH_SIZE: int = 100  # 임베딩 API 1회 호출당 청크 수
+    EMBEDDING_STORAGE: str = "vector"  # 청크 임베딩 저장/검색 형식: vector(float32), halfvec(float16)
+    # halfvec 저장 시 float32 임베딩도 함께 저장 - 재채점 정확도 대신 청크당 임베딩 저장량 약 1.5배 (false면 절반)
+    EMBEDDING_KEEP_FULL_PRECISION: bool = False
+    RAG_RESCORE_CANDIDATES: int = 100  # halfvec 검색 후 float32로 재채점할 후보 수 (KEEP_FULL_PRECISION일 때만, 0이면 안 함)
+    RAG_CHUNKER: str = "sentence"  # sentence: 문장/제목 경계 + 토큰 제한, character: 글자 수 기준
+    RAG_CHUNK_TOKENS: int = 400  # 문장 단위 청크 최대 토큰 수
+    RAG_CHUNK_OVERLAP_TOKENS: int = 50  # 토큰 초과로 나뉜 다음 청크에 이어 붙일 앞 청크 끝 문장 토큰 수
+    RAG_CHUNK_SIZE: int = 1000  # 청크 최대 길이 (문자, character 분할기)
+    RAG_CHUNK_OVERLAP: int = 200  # 인접 청크 간 중첩 길이 (문자, character 분할기)
+    RAG_SEARCH_MODE: str = "auto"  # auto, vector, lexical, hybrid, keyword
+    RAG_LEXICAL_THRESHOLD: float = 0.3  # pg_trgm word_similarity 최소값
+    RAG_HYBRID_CANDIDATES: int = 20  # 하이브리드 검색 경로별 후보 수
+    RAG_RRF_K: int = 60  # Reciprocal Rank Fusion 상수
+    RAG_RERANK_ENABLED: bool = True  # 후보를 넓게 가져와 재순위화 후 상위 k개 사용
+    RAG_RERANK_CANDIDATES: int = 50  # 재순위화 대상 후보 수
+    RAG_CONTEXT_TOKEN_BUDGET: int = 2000  # 프롬프트에 넣을 검색 컨텍스트 최대 토큰 수
+    VECTOR_INDEX_ENABLED: bool = False  # 벡터 검색을 프로세스 메모리 인덱스에서 처리 (소규모 코퍼스용)
+    VECTOR_INDEX_MAX_CHUNKS: int = 200_000  # 메모리 인덱스 최대 청크 수 (초과 시 DB 검색 사용)
+    
+    # 백그라운드 인덱싱 작업 큐 설정
+    INDEXING_WORKERS: int = 2  # 프로세스당 워커 태스크 수
+    INDEXING_POLL_INTERVAL_SECONDS: float = 2.0
+    INDEXING_JOB_TIMEOUT_SECONDS: int = 30 * 60  # running 상태로 이 시간을 넘기면 재시도
+    INDEXING_MAX_ATTEMPTS: int = 3
+    INDEXING_RETRY_BASE_SECONDS: float = 30.0  # 실패 후 재시도 대기 (시도마다 2배)
+    INDEXING_RETRY_MAX_SECONDS: float = 600.0  # 재시도 대기 최대값
+    REINDEX_MAX_WORKERS: int = 4  # 일괄 재인덱싱 동시 문서 수 상한 (작업자마다 DB 연결 사용, 풀 5+10개)
+    
+    # 문서 텍스트 추출 설정
+    EXTRACTION_PROCESSES: int = 2  # PDF/DOCX 파싱 프로세스 수
+    EXTRACTION_PAGES_PER_TASK: int = 8  # 프로세스 작업 1건당 PDF 페이지 수
+    
+    # 시맨틱 답변 캐시 설정
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # 캐시 적중 최소 코사인 유사도
+    SEMANTIC_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    SEMANTIC_CACHE_MAX_SIZE: int = 1000
+    
+    # 일괄 질문 답변(/chat/batch) 설정
+    CHAT_BATCH_MAX_QUESTIONS: int = 500
+    CHAT_BATCH_RETRIEVAL_CONCURRENCY: int = 4  # 동시 검색 수 (하이브리드 검색은 질문당 DB 연결 2개 사용)
+    CHAT_BATCH_LLM_CONCURRENCY: int = 4  # 동시 GPT 호출 수 (LLM_MAX_CONCURRENCY 중 일부만 사용해 대화형 요청 보호)
+    
+    # 대화 기록 백그라운드 저장 설정
+    CHAT_HISTORY_BATCH_SIZE: int = 50  # 한 번에 INSERT할 최대 건수
+    CHAT_HISTORY_FLUSH_INTERVAL_SECONDS: float = 1.0  # 배치가 덜 찼을 때 최대 대기 시간
+    CHAT_HISTORY_QUEUE_SIZE: int = 10000  # 대기열이 가득 차면 기록을 버리고 로그만 남김
     
     # JWT 설정
     SECRET_KEY: str = "your-default-secret-key-change-this"
@@ -5,6 +5,7 @@ PostgreSQL + pgvector를 사용합니다.
 from sqlmodel import SQLModel, create_engine, Session
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import text
+from typing import Optional
 from app.config import settings
 
 # 데이터베이스 엔진 생성
@@ -17,25 +18,188 @@ engine = create_engine(
 )
 
 
+# 기존 테이블에 추가된 컬럼 (이름, DDL) - create_all은 기존 테이블을 변경하지 않음
+COLUMN_MIGRATIONS = [
+    (
+        "documents.content_hash",
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"
+    ),
+    (
+        "documents.file_mtime",
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_mtime DOUBLE PRECISION"
+    ),
+    (
+        "document_chunks.category",
+        "ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS category VARCHAR"
+    ),
+    (
+        "document_chunks.is_indexed",
+        "ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS is_indexed BOOLEAN NOT NULL DEFAULT false"
+    ),
+    (
+        "indexing_jobs.next_attempt_at",
+        "ALTER TABLE indexing_jobs ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP"
+    ),
+]
+
+
+# halfvec 저장 형식 전용 컬럼 - pgvector 0.7 이상 필요, EMBEDDING_STORAGE=halfvec일 때만 추가 (enable_halfvec)
+HALFVEC_COLUMN_MIGRATIONS = [
+    (
+        "document_chunks.embedding_half",
+        "ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS embedding_half halfvec(1536)"
+    ),
+]
+HALFVEC_MIN_PGVECTOR = (0, 7)
+
+
+# 추가된 컬럼의 기존 데이터 채우기 (이름, SQL) - 이미 채워진 행은 건너뜀
+DATA_MIGRATIONS = [
+    (
+        "document_chunks.category/is_indexed",
+        "UPDATE document_chunks dc SET category = d.category, is_indexed = d.is_indexed "
+        "FROM documents d WHERE dc.document_id = d.id AND dc.category IS NULL"
+    ),
+]
+
+
+# 검색/조회용 인덱스 (이름, DDL)
+# document_chunks 검색 인덱스는 RAG / 그 외 카테고리 부분 인덱스로 나눠 각 행을 한 번만 색인
+SEARCH_INDEXES = [
+    (
+        # RAG 카테고리 전용 부분 인덱스 - 필터링으로 버려지는 후보 없이 RAG 청크만 탐색
+        "ix_document_chunks_rag_embedding_hnsw",
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_rag_embedding_hnsw "
+        "ON document_chunks USING hnsw (embedding vector_cosine_ops) "
+        "WHERE category = 'RAG' AND is_indexed"
+    ),
+    (
+        "ix_document_chunks_rag_embedding_half_hnsw",
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_rag_embedding_half_hnsw "
+        "ON document_chunks USING hnsw (embedding_half halfvec_cosine_ops) "
+        "WHERE category = 'RAG' AND is_indexed"
+    ),
+    (
+        "ix_document_chunks_rag_content_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_rag_content_trgm "
+        "ON document_chunks USING gin (content gin_trgm_ops) "
+        "WHERE category = 'RAG' AND is_indexed"
+    ),
+    (
+        # RAG 외 카테고리 - `category = '<상수>'` 조건이 `category <> 'RAG'`를 함의하므로 같은 검색 쿼리에서 사용됨
+        "ix_document_chunks_other_embedding_hnsw",
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_other_embedding_hnsw "
+        "ON document_chunks USING hnsw (embedding vector_cosine_ops) "
+        "WHERE category <> 'RAG' AND is_indexed"
+    ),
+    (
+        "ix_document_chunks_other_embedding_half_hnsw",
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_other_embedding_half_hnsw "
+        "ON document_chunks USING hnsw (embedding_half halfvec_cosine_ops) "
+        "WHERE category <> 'RAG' AND is_indexed"
+    ),
+    (
+        "ix_document_chunks_other_content_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_other_content_trgm "
+        "ON document_chunks USING gin (content gin_trgm_ops) "
+        "WHERE category <> 'RAG' AND is_indexed"
+    ),
+    (
+        "ix_documents_title_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_documents_title_trgm "
+        "ON documents USING gin (title gin_trgm_ops)"
+    ),
+    (
+        "ix_chat_histories_user_created",
+        "CREATE INDEX IF NOT EXISTS ix_chat_histories_user_created "
+        "ON chat_histories (user_id, created_at DESC, id DESC)"
+    ),
+]
+
+
+# 부분 인덱스로 대체되어 삭제할 인덱스 (이름, DDL) - 모든 청크를 색인해 RAG 행이 중복 색인되던 인덱스
+OBSOLETE_INDEXES = [
+    ("ix_document_chunks_embedding_hnsw", "DROP INDEX IF EXISTS ix_document_chunks_embedding_hnsw"),
+    ("ix_document_chunks_content_trgm", "DROP INDEX IF EXISTS ix_document_chunks_content_trgm"),
+]
+
+
+def search_indexes(storage: Optional[str] = None):
+    """
+    저장 형식(EMBEDDING_STORAGE)에 필요한 검색 인덱스 목록
+    사용하지 않는 임베딩 컬럼의 HNSW 인덱스는 만들지 않음 (halfvec 재채점은 인덱스 없이 후보만 계산)
+    """
+    unused_column = "(embedding_half " if (storage or settings.EMBEDDING_STORAGE) == "vector" else "(embedding "
+    return [(name, ddl) for name, ddl in SEARCH_INDEXES if unused_column not in ddl]
+
+
 def init_db():
     """
     데이터베이스 초기화
-    - 테이블 생성 (데이터 보존)
-    - pgvector 확장 활성화
+    - 테이블 생성 (데이터 보존) 및 추가 컬럼 마이그레이션/기존 데이터 채우기
+      (halfvec 컬럼은 EMBEDDING_STORAGE=halfvec이고 pgvector 0.7 이상일 때만)
+    - pgvector, pg_trgm 확장 활성화
+    - 검색/조회 인덱스 생성 (부분 인덱스로 대체된 인덱스는 삭제)
+    """
+    # pgvector / pg_trgm 확장 활성화
+    with Session(engine) as session:
+        for extension in ("vector", "pg_trgm"):
+            try:
+                session.exec(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+                session.commit()
+                print(f"✅ {extension} extension enabled")
+            except Exception as e:
+                print(f"❌ Error enabling {extension}: {e}")
+                session.rollback()
+    
+    # 모든 테이블 생성 (기존 테이블이 있으면 건너뜀)
+    SQLModel.metadata.create_all(engine)
+    print("✅ Database tables created/verified")
+    
+    # 추가 컬럼 마이그레이션 및 검색/조회용 인덱스 생성 (이미 있으면 건너뜀)
+    _run_ddl(COLUMN_MIGRATIONS, "Column")
+    if settings.EMBEDDING_STORAGE == "halfvec":
+        enable_halfvec()
+    _run_ddl(DATA_MIGRATIONS, "Backfill")
+    _run_ddl(OBSOLETE_INDEXES, "Obsolete index", action="dropped")
+    _run_ddl(search_indexes(), "Index")
+
+
+def enable_halfvec() -> bool:
+    """
+    halfvec 저장 준비 - pgvector 확장을 설치된 최신 버전으로 올리고 버전 확인 후 embedding_half 컬럼 추가
+    pgvector가 0.7 미만이면 컬럼을 추가하지 않고 False 반환
     """
-    # pgvector 확장 활성화
     with Session(engine) as session:
         try:
-            session.exec(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            session.exec(text("ALTER EXTENSION vector UPDATE"))
             session.commit()
-            print("✅ pgvector extension enabled")
         except Exception as e:
-            print(f"❌ Error enabling pgvector: {e}")
+            print(f"⚠️ Error updating vector extension: {e}")
             session.rollback()
+        version = session.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        ).scalar()
     
-    # 모든 테이블 생성 (기존 테이블이 있으면 건너뜀)
-    SQLModel.metadata.create_all(engine)
-    print("✅ Database tables created/verified")
+    if version is None or tuple(int(part) for part in version.split(".")[:2]) < HALFVEC_MIN_PGVECTOR:
+        print(f"❌ halfvec requires pgvector >= 0.7 (installed: {version}) - use EMBEDDING_STORAGE=vector")
+        return False
+    
+    _run_ddl(HALFVEC_COLUMN_MIGRATIONS, "Column")
+    return True
+
+
+def _run_ddl(statements, label: str, action: str = "created/verified"):
+    """멱등 DDL 목록 실행 (개별 실패는 로그만 남기고 계속 진행)"""
+    with Session(engine) as session:
+        for name, ddl in statements:
+            try:
+                session.exec(text(ddl))
+                session.commit()
+                print(f"✅ {label} {action}: {name}")
+            except Exception as e:
+                print(f"❌ Error applying {label.lower()} {name}: {e}")
+                session.rollback()
 
 
 def get_session():
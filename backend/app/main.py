@@ -3,13 +3,21 @@ FastAPI 메인 애플리케이션
 은행 신입사원 멘토 시스템
 """
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
 from app.config import settings
 from app.database import init_db
+from app.services.ai_provider import close_ai_provider
+from app.services.indexing_queue import indexing_workers
+from app.services.chat_history_writer import chat_history_writer
+from app.services.vector_index import vector_index
+from app.utils.text_extractor import shutdown_process_pool
+from app.utils.metrics import render_metrics
 from app.routers import auth, chat, documents, anonymous_board, dashboard, admin, exam, simulation, advanced_simulation, rag_simulation
 
 
@@ -29,12 +37,26 @@ async def lifespan(app: FastAPI):
     
     print("✅ Database initialized")
     print(f"✅ Upload directory created: {settings.UPLOAD_DIR}")
+    
+    # 벡터 검색용 메모리 인덱스 로드
+    if settings.VECTOR_INDEX_ENABLED:
+        await asyncio.to_thread(vector_index.load)
+    
+    # 문서 인덱싱 워커 시작
+    indexing_workers.start(settings.INDEXING_WORKERS)
+    
+    # 대화 기록 백그라운드 저장 시작
+    chat_history_writer.start()
     print(f"📚 API Documentation: http://localhost:8000/docs")
     
     yield
     
     # 종료 시
     print("👋 Shutting down...")
+    await indexing_workers.stop()
+    await chat_history_writer.stop()
+    await close_ai_provider()
+    shutdown_process_pool()
 
 
 # FastAPI 앱 생성
@@ -91,6 +113,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 지표 (RAG 단계별/채팅 요청 지연 시간 히스토그램)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
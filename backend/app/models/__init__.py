@@ -2,7 +2,10 @@
 데이터베이스 모델 패키지
 """
 from .user import User, UserCreate, UserRead, UserUpdate
-from .document import Document, DocumentCreate, DocumentRead, DocumentChunk
+from .document import (
+    Document, DocumentCreate, DocumentRead, DocumentUploadRead, DocumentChunk, EmbeddingCache,
+    IndexingJob, IndexingJobRead
+)
 from .post import Post, PostCreate, PostRead, Comment, CommentCreate, CommentRead
 from .mentor import MentorMenteeRelation, ExamScore, ExamQuestion, ExamResult, LearningTopic, ChatHistory
 
@@ -14,7 +17,11 @@ __all__ = [
     "Document",
     "DocumentCreate",
     "DocumentRead",
+    "DocumentUploadRead",
     "DocumentChunk",
+    "EmbeddingCache",
+    "IndexingJob",
+    "IndexingJobRead",
     "Post",
     "PostCreate",
     "PostRead",
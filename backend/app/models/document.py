@@ -4,9 +4,11 @@
 """
 from sqlmodel import SQLModel, Field, Column
 from sqlalchemy import Text
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC, Vector
+
+from app.config import settings
 
 
 class Document(SQLModel, table=True):
@@ -30,6 +32,10 @@ class Document(SQLModel, table=True):
     
     # 인덱싱 상태
     is_indexed: bool = Field(default=False)  # RAG에 인덱싱 완료 여부
+    
+    # 변경 감지용 파일 지문 (마지막 인덱싱 시점 기준)
+    content_hash: Optional[str] = Field(default=None, max_length=64)  # 파일 내용 sha256
+    file_mtime: Optional[float] = None  # 파일 수정 시각 (epoch 초)
 
 
 class DocumentCreate(SQLModel):
@@ -53,6 +59,11 @@ class DocumentRead(SQLModel):
     is_indexed: bool
 
 
+class DocumentUploadRead(DocumentRead):
+    """문서 업로드 응답 모델 (백그라운드 인덱싱 작업 ID 포함)"""
+    job_id: Optional[int] = None
+
+
 class DocumentChunk(SQLModel, table=True):
     """문서 청크 및 벡터 임베딩 저장"""
     __tablename__ = "document_chunks"
@@ -70,11 +81,72 @@ class DocumentChunk(SQLModel, table=True):
         sa_column=Column(Vector(1536))
     )
     
+    # float16 임베딩 (인덱스/저장 공간 절반) - halfvec 타입은 pgvector 0.7 이상이 필요하므로
+    # EMBEDDING_STORAGE=halfvec일 때만 매핑 (vector 모드에서는 컬럼이 없어도 조회/저장 가능)
+    if settings.EMBEDDING_STORAGE == "halfvec":
+        embedding_half: Optional[List[float]] = Field(
+            default=None,
+            sa_column=Column(HALFVEC(1536))
+        )
+    
+    # 검색 필터용 비정규화 컬럼 (문서의 category / is_indexed와 같은 값, 인덱싱 시 함께 기록)
+    category: Optional[str] = None
+    is_indexed: bool = Field(default=False)
+    
     # 메타데이터
     chunk_metadata: Optional[str] = None  # JSON 문자열
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class EmbeddingCache(SQLModel, table=True):
+    """청크 임베딩 캐시 - 재인덱싱 시 변경되지 않은 청크의 임베딩 재사용"""
+    __tablename__ = "embedding_cache"
+    
+    # sha256(모델명 + 청크 텍스트)
+    content_hash: str = Field(primary_key=True, max_length=64)
+    model: str
+    
+    embedding: List[float] = Field(sa_column=Column(Vector(1536)))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class IndexingJob(SQLModel, table=True):
+    """문서 인덱싱 작업 큐 (워커가 FOR UPDATE SKIP LOCKED로 가져감)"""
+    __tablename__ = "indexing_jobs"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    document_id: int = Field(foreign_key="documents.id", index=True)
+    
+    # 작업 상태: queued, running, completed, failed
+    status: str = Field(default="queued", index=True)
+    stage: Optional[str] = None  # 현재 단계: fingerprint, index
+    progress: float = Field(default=0.0)  # 0.0 ~ 1.0
+    attempts: int = Field(default=0)
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    timings: Optional[str] = None  # 단계별 소요 시간 JSON (ms)
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None  # 실패 후 재시도 가능 시각 (지수 백오프)
+
+
+class IndexingJobRead(SQLModel):
+    """인덱싱 작업 상태 응답 모델"""
+    id: int
+    document_id: int
+    status: str
+    stage: Optional[str] = None
+    progress: float
+    attempts: int
+    error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None
+
+
 class DocumentCategory(SQLModel):
     """문서 카테고리 목록"""
     categories: List[str] = [
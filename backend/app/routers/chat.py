@@ -2,15 +2,27 @@
 챗봇 API 라우터
 RAG 기반 대화 처리
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select
+from sqlalchemy import tuple_
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+from datetime import datetime
+import json
+import time
 
+from app.config import settings
 from app.database import get_session
+from app.models.mentor import ChatHistory
 from app.models.user import User
 from app.utils.auth import get_current_user
 from app.services.rag_service import RAGService
+from app.services.semantic_cache import answer_cache
+from app.services.single_flight import query_flight
+from app.services.vector_index import vector_index
+from app.utils.metrics import chat_request_seconds
+from app.services.chat_history_writer import chat_history_writer
 
 router = APIRouter(prefix="/chat", tags=["Chatbot"])
 
@@ -19,6 +31,7 @@ class ChatRequest(BaseModel):
     """채팅 요청 모델"""
     message: str
     session_id: Optional[str] = None
+    include_timings: bool = False  # 응답에 단계별 소요 시간 포함 여부
 
 
 class ChatResponse(BaseModel):
@@ -26,14 +39,47 @@ class ChatResponse(BaseModel):
     answer: str
     sources: List[Dict]
     response_time: float
+    cached: bool = False  # 시맨틱 캐시 적중 여부
+    coalesced: bool = False  # 동시에 들어온 동일 질문의 답변을 공유했는지 여부
+    timings: Optional[Dict[str, float]] = None  # 단계별 소요 시간 (ms, include_timings 요청 시)
+
+
+class ChatBatchRequest(BaseModel):
+    """일괄 질문 요청 모델"""
+    questions: List[str]
+    include_timings: bool = False
+
+
+class ChatBatchItem(BaseModel):
+    """일괄 질문 항목별 결과 (입력 순서 유지)"""
+    index: int
+    question: str
+    status: str  # ok, cached, error
+    answer: str
+    sources: List[Dict]
+    error: Optional[str] = None
+    response_time: float
+    duplicate_of: Optional[int] = None  # 같은 질문이 앞에 있으면 그 항목의 index (결과 공유)
+    timings: Optional[Dict[str, float]] = None
+
+
+class ChatBatchResponse(BaseModel):
+    """일괄 질문 응답 모델"""
+    results: List[ChatBatchItem]
+    total: int
+    succeeded: int
+    failed: int
+    response_time: float
 
 
 class ChatHistoryItem(BaseModel):
-    """채팅 기록 항목"""
+    """채팅 기록 항목 (다음 페이지 조회 시 마지막 항목의 created_at, id를 커서로 사용)"""
+    id: int
     user_message: str
     bot_response: str
     created_at: str
     sources: List[Dict]
+    response_time: Optional[float] = None
 
 
 @router.post("/", response_model=ChatResponse)
@@ -50,14 +96,29 @@ async def chat(
     """
     try:
         rag_service = RAGService(session)
+        started = time.perf_counter()
         
         # RAG로 답변 생성
         result = await rag_service.process_query(request.message)
+        response_time = round(time.perf_counter() - started, 3)
+        chat_request_seconds.observe(response_time, endpoint="chat", cached=str(result.get("cached", False)).lower())
+        
+        # 대화 기록은 백그라운드에서 배치 저장 (응답 지연 없음)
+        chat_history_writer.record(
+            current_user.id,
+            request.message,
+            result["answer"],
+            result["sources"],
+            response_time
+        )
         
         return ChatResponse(
             answer=result["answer"],
             sources=result["sources"],
-            response_time=result["response_time"]
+            response_time=response_time,
+            cached=result.get("cached", False),
+            coalesced=result.get("coalesced", False),
+            timings=result.get("timings") if request.include_timings else None
         )
     
     except Exception as e:
@@ -68,17 +129,162 @@ async def chat(
         )
 
 
+@router.post("/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    챗봇과 대화하기 (스트리밍, Server-Sent Events)
+    - event: sources → 검색된 참고자료 (답변 생성 전에 먼저 전송)
+    - event: token → 답변 토큰 (마지막 토큰에 참고 자료 목록 포함)
+    - event: done → 완료
+    - event: error → 오류
+    """
+    rag_service = RAGService(session)
+    user_id = current_user.id
+    
+    async def event_stream():
+        started = time.perf_counter()
+        answer_parts = []
+        async for event in rag_service.stream_rag_answer(request.message, request.include_timings):
+            if event["event"] == "token":
+                answer_parts.append(event["data"])
+            elif event["event"] == "done":
+                chat_request_seconds.observe(time.perf_counter() - started, endpoint="stream", cached="false")
+                # 스트림이 끝까지 전송된 대화만 백그라운드 저장
+                chat_history_writer.record(
+                    user_id,
+                    request.message,
+                    "".join(answer_parts),
+                    event["data"]["sources"],
+                    round(time.perf_counter() - started, 3)
+                )
+            data = json.dumps(event["data"], ensure_ascii=False)
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시 버퍼링 비활성화
+        }
+    )
+
+
+@router.post("/batch", response_model=ChatBatchResponse)
+async def chat_batch(
+    request: ChatBatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    여러 질문 일괄 답변 (FAQ 답변지 생성 등)
+    - 질의 임베딩 일괄 계산, 검색 동시 실행, GPT 호출은 동시 실행 수 제한
+    - 결과는 입력 순서대로 항목별 상태(ok / cached / error)와 함께 반환
+    - 모든 항목을 대화 기록에 저장
+    """
+    if not request.questions:
+        raise HTTPException(status_code=400, detail="questions must not be empty")
+    if len(request.questions) > settings.CHAT_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many questions (max {settings.CHAT_BATCH_MAX_QUESTIONS})"
+        )
+    
+    started = time.perf_counter()
+    results = await RAGService(session).answer_batch(request.questions)
+    response_time = round(time.perf_counter() - started, 3)
+    chat_request_seconds.observe(response_time, endpoint="batch", cached="false")
+    
+    items = [
+        ChatBatchItem(**{
+            **result,
+            "timings": result["timings"] if request.include_timings else None
+        })
+        for result in results
+    ]
+    failed = sum(1 for item in items if item.status == "error")
+    
+    # 단일 질문과 같은 경로로 대화 기록 백그라운드 저장 (입력 순서, 오류 안내 답변 포함)
+    for item in items:
+        chat_history_writer.record(
+            current_user.id,
+            item.question,
+            item.answer,
+            item.sources,
+            item.response_time
+        )
+    
+    return ChatBatchResponse(
+        results=items,
+        total=len(items),
+        succeeded=len(items) - failed,
+        failed=failed,
+        response_time=response_time
+    )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    시맨틱 답변 캐시 통계
+    - 적중/실패 횟수, 적중률, 현재 크기
+    - single_flight: 동일 질문 병합 통계 (실제 실행 수, 병합된 요청 수)
+    - vector_index: 메모리 벡터 인덱스 상태 (카테고리별 청크 수, 메모리 사용량)
+    """
+    return {
+        **answer_cache.stats(),
+        "single_flight": query_flight.stats(),
+        "vector_index": vector_index.stats()
+    }
+
+
 @router.get("/history", response_model=List[ChatHistoryItem])
 async def get_chat_history(
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
-    사용자의 채팅 기록 조회
+    사용자의 채팅 기록 조회 (최신순, 키셋 페이지네이션)
+    - 다음 페이지: 이전 응답 마지막 항목의 created_at, id를 before_created_at, before_id로 전달
+    - (user_id, created_at DESC, id DESC) 인덱스를 사용하므로 기록 수와 관계없이 일정한 속도
     """
-    # 간단한 구현 - 빈 리스트 반환
-    return []
+    statement = select(ChatHistory).where(ChatHistory.user_id == current_user.id)
+    
+    if before_created_at is not None and before_id is not None:
+        statement = statement.where(
+            tuple_(ChatHistory.created_at, ChatHistory.id) < tuple_(before_created_at, before_id)
+        )
+    elif before_created_at is not None or before_id is not None:
+        raise HTTPException(
+            status_code=400,
+            detail="before_created_at and before_id must be provided together"
+        )
+    
+    statement = statement.order_by(
+        ChatHistory.created_at.desc(),
+        ChatHistory.id.desc()
+    ).limit(limit)
+    
+    return [
+        ChatHistoryItem(
+            id=chat.id,
+            user_message=chat.user_message,
+            bot_response=chat.bot_response,
+            created_at=chat.created_at.isoformat(),
+            sources=json.loads(chat.source_documents) if chat.source_documents else [],
+            response_time=chat.response_time
+        )
+        for chat in session.exec(statement).all()
+    ]
 
 
 @router.post("/feedback/{chat_id}")
@@ -91,9 +297,6 @@ async def provide_feedback(
     """
     챗봇 답변에 대한 피드백 제공
     """
-    from app.models.mentor import ChatHistory
-    from sqlmodel import select
-    
     statement = select(ChatHistory).where(
         ChatHistory.id == chat_id,
         ChatHistory.user_id == current_user.id
@@ -128,7 +331,10 @@ async def test_chat(
         return ChatResponse(
             answer=result["answer"],
             sources=result["sources"],
-            response_time=result["response_time"]
+            response_time=result["response_time"],
+            cached=result.get("cached", False),
+            coalesced=result.get("coalesced", False),
+            timings=result.get("timings") if request.include_timings else None
         )
     except Exception as e:
         raise HTTPException(
@@ -2,25 +2,36 @@
 자료실 API 라우터
 문서 업로드, 다운로드, 관리
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from fastapi.responses import FileResponse
 from sqlmodel import Session, select
-from typing import List, Optional
+from sqlalchemy import text, update
+from typing import Dict, List, Optional
 from pathlib import Path
-import aiofiles
+from collections import Counter
+import asyncio
+import json
+import time
 
-from app.database import get_session
+from app.database import engine, get_session
 from app.models.user import User
-from app.models.document import Document, DocumentCreate, DocumentRead
+from app.models.document import (
+    Document, DocumentCreate, DocumentRead, DocumentUploadRead, IndexingJob, IndexingJobRead
+)
 from app.utils.auth import get_current_user, get_current_active_admin
-from app.utils.file_handler import save_upload_file, delete_file, get_file_size_str
-from app.services.rag_service import RAGService
+from app.utils.file_handler import (
+    save_upload_file, delete_file, get_file_size_str, file_fingerprint
+)
+from app.utils.text_extractor import SUPPORTED_FILE_TYPES, iter_document_pages
+from app.services.rag_service import RAGService, notify_corpus_changed
+from app.services.indexing_queue import enqueue_indexing_job
+from app.services.vector_index import vector_index
 from app.config import settings
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 
-@router.post("/upload", response_model=DocumentRead)
+@router.post("/upload", response_model=DocumentUploadRead)
 async def upload_document(
     file: UploadFile = File(...),
     title: str = Form(...),
@@ -33,7 +44,7 @@ async def upload_document(
     문서 업로드 (관리자만 가능)
     - 파일 저장
     - 메타데이터 저장
-    - RAG 인덱싱
+    - RAG 인덱싱 작업 등록 (백그라운드 워커가 처리, job_id로 상태 조회)
     """
     try:
         # 파일 저장
@@ -58,18 +69,12 @@ async def upload_document(
         session.commit()
         session.refresh(document)
         
-        # RAG 인덱싱 (백그라운드 작업으로 처리하는 것이 좋지만, 여기서는 동기적으로 처리)
-        # PDF, TXT 파일만 인덱싱
-        if document.file_type in ['.pdf', '.txt']:
-            try:
-                content = await _extract_text_from_file(file_path, document.file_type)
-                rag_service = RAGService(session)
-                await rag_service.index_document(document.id, content)
-            except Exception as e:
-                print(f"Indexing error: {e}")
-                # 인덱싱 실패해도 문서는 저장됨
+        # RAG 인덱싱은 백그라운드 작업으로 등록 (PDF, TXT, DOCX 파일만 인덱싱)
+        job_id = None
+        if document.file_type in SUPPORTED_FILE_TYPES:
+            job_id = enqueue_indexing_job(session, document.id).id
         
-        return document
+        return DocumentUploadRead(**document.model_dump(), job_id=job_id)
     
     except Exception as e:
         print(f"Upload error: {e}")
@@ -200,23 +205,29 @@ async def delete_document(
     # 파일 삭제
     delete_file(document.file_path)
     
-    # 관련 청크 삭제
+    # 관련 청크 및 인덱싱 작업 삭제
     chunk_statement = select(DocumentChunk).where(DocumentChunk.document_id == document_id)
     chunks = session.exec(chunk_statement).all()
     for chunk in chunks:
         session.delete(chunk)
     
+    job_statement = select(IndexingJob).where(IndexingJob.document_id == document_id)
+    for job in session.exec(job_statement).all():
+        session.delete(job)
+    
     # 청크 삭제 커밋
     session.commit()
     
     # 문서 삭제
     session.delete(document)
     session.commit()
+    vector_index.remove_documents([document_id])
+    notify_corpus_changed()
     
     return {"message": "Document deleted successfully"}
 
 
-@router.post("/upload-multiple", response_model=List[DocumentRead])
+@router.post("/upload-multiple", response_model=List[DocumentUploadRead])
 async def upload_multiple_documents(
     files: List[UploadFile] = File(...),
     current_user: User = Depends(get_current_user),
@@ -226,7 +237,7 @@ async def upload_multiple_documents(
     다중 문서 업로드 (RAG 전용)
     - TXT 파일만 허용
     - 자동으로 RAG 카테고리로 저장
-    - 즉시 인덱싱
+    - 문서별 인덱싱 작업 등록 (job_id로 상태 조회)
     """
     uploaded_documents = []
     
@@ -255,27 +266,44 @@ async def upload_multiple_documents(
             )
             
             session.add(document)
-            session.flush()  # ID 생성을 위해 flush
+            session.commit()
+            session.refresh(document)
             
-            # RAG 인덱싱
-            try:
-                content = await _extract_text_from_file(file_path, ".txt")
-                rag_service = RAGService(session)
-                await rag_service.index_document(document.id, content)
-            except Exception as e:
-                print(f"Indexing error for {file.filename}: {e}")
+            # RAG 인덱싱 작업 등록
+            job = enqueue_indexing_job(session, document.id)
             
-            uploaded_documents.append(document)
+            uploaded_documents.append(DocumentUploadRead(**document.model_dump(), job_id=job.id))
             
         except Exception as e:
             print(f"Upload error for {file.filename}: {e}")
+            session.rollback()
             continue
     
-    session.commit()
-    
     return uploaded_documents
 
 
+@router.get("/jobs/{job_id}", response_model=IndexingJobRead)
+async def get_indexing_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    인덱싱 작업 상태 조회
+    - status: queued, running, completed, failed
+    - 진행률, 단계별 소요 시간(ms), 오류 메시지
+    """
+    job = session.get(IndexingJob, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Indexing job not found")
+    
+    return IndexingJobRead(
+        **job.model_dump(exclude={"timings"}),
+        timings=json.loads(job.timings) if job.timings else None
+    )
+
+
 @router.post("/upload-bulk", response_model=List[DocumentRead])
 async def upload_documents_bulk(
     files: List[UploadFile] = File(...),
@@ -326,45 +354,59 @@ async def upload_documents_bulk(
 
 @router.post("/reindex-rag")
 async def reindex_rag_documents(
+    incremental: bool = False,
+    workers: Optional[int] = Query(None, ge=1, le=settings.REINDEX_MAX_WORKERS),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
     RAG 문서들을 다시 인덱싱
+    - incremental=true: 파일 지문(크기/수정 시각/sha256)이 바뀐 문서만 재인덱싱
+    - workers: 동시에 처리할 문서 수 (기본 4, 최대 REINDEX_MAX_WORKERS, 작업자마다 DB 연결 사용)
+    - 파일이 없어진 문서는 missing으로 보고만 하고 기존 청크는 유지, 문서가 없는 청크는 정리
     """
     try:
-        # RAG 카테고리 문서들 조회
-        statement = select(Document).where(Document.category == "RAG")
-        rag_documents = session.exec(statement).all()
+        started = time.perf_counter()
         
-        reindexed_count = 0
-        failed_count = 0
+        # RAG 카테고리 문서 ID 조회 (각 문서는 작업자별 세션에서 처리)
+        statement = select(Document.id).where(Document.category == "RAG")
+        document_ids = session.exec(statement).all()
         
-        for document in rag_documents:
-            try:
-                # 파일에서 텍스트 추출
-                content = await _extract_text_from_file(document.file_path, document.file_type)
-                
-                # RAG 인덱싱
-                rag_service = RAGService(session)
-                success = await rag_service.index_document(document.id, content)
-                
-                if success:
-                    reindexed_count += 1
-                    print(f"Successfully reindexed: {document.title}")
-                else:
-                    failed_count += 1
-                    print(f"Failed to reindex: {document.title}")
-                    
-            except Exception as e:
-                failed_count += 1
-                print(f"Error reindexing {document.title}: {e}")
+        # 기본값은 FastAPI가 검증하지 않으므로 상한을 직접 적용
+        semaphore = asyncio.Semaphore(min(workers or 4, settings.REINDEX_MAX_WORKERS))
+        
+        async def run(document_id: int) -> Dict:
+            async with semaphore:
+                return await _reindex_document(document_id, incremental)
+        
+        results = await asyncio.gather(*(run(document_id) for document_id in document_ids))
+        
+        # 문서가 없는 청크만 정리 (파일이 없어진 문서는 missing으로 보고하고 기존 청크/인덱싱 상태 유지)
+        orphan_result = session.execute(
+            text("""
+                DELETE FROM document_chunks dc
+                WHERE NOT EXISTS (SELECT 1 FROM documents d WHERE d.id = dc.document_id)
+            """)
+        )
+        session.commit()
+        
+        orphan_chunks_deleted = orphan_result.rowcount or 0
+        if orphan_chunks_deleted:
+            notify_corpus_changed()
+        
+        status_counts = Counter(result["status"] for result in results)
         
         return {
             "message": f"RAG 문서 재인덱싱 완료",
-            "total_documents": len(rag_documents),
-            "reindexed_count": reindexed_count,
-            "failed_count": failed_count
+            "mode": "incremental" if incremental else "full",
+            "total_documents": len(results),
+            "reindexed_count": status_counts["reindexed"],
+            "skipped_count": status_counts["unchanged"] + status_counts["skipped"],
+            "missing_count": status_counts["missing"],
+            "failed_count": status_counts["failed"],
+            "orphan_chunks_deleted": orphan_chunks_deleted,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "documents": results
         }
         
     except Exception as e:
@@ -375,6 +417,89 @@ async def reindex_rag_documents(
         )
 
 
+async def _reindex_document(document_id: int, incremental: bool) -> Dict:
+    """
+    문서 1건 재인덱싱 (문서 정보만 읽고 세션을 닫은 뒤 처리, 삭제된 문서는 skipped)
+    incremental 모드에서는 크기/수정 시각 → sha256 순으로 비교해 바뀌지 않은 문서는 건너뜀
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    
+    def lap(stage: str):
+        nonlocal started
+        now = time.perf_counter()
+        timings[stage] = round((now - started) * 1000, 1)
+        started = now
+    
+    with Session(engine) as worker_session:
+        document = worker_session.get(Document, document_id)
+        if document is not None:
+            # 해시 계산/임베딩 호출 동안 DB 연결을 잡고 있지 않도록 분리 후 세션 종료
+            worker_session.expunge(document)
+    
+    if document is None:
+        # 재인덱싱 도중 삭제된 문서
+        return {"id": document_id, "title": None, "status": "skipped", "timings": timings}
+    
+    result = {"id": document_id, "title": document.title, "status": "reindexed", "timings": timings}
+    
+    try:
+        file_path = Path(document.file_path)
+        if not file_path.exists():
+            result["status"] = "missing"
+            return result
+        
+        stat = file_path.stat()
+        unchanged_stat = (
+            document.is_indexed
+            and document.file_size == stat.st_size
+            and document.file_mtime == stat.st_mtime
+        )
+        if incremental and unchanged_stat:
+            lap("fingerprint")
+            result["status"] = "unchanged"
+            return result
+        
+        fingerprint = await asyncio.to_thread(file_fingerprint, document.file_path)
+        lap("fingerprint")
+        
+        if incremental and document.is_indexed and document.content_hash == fingerprint["content_hash"]:
+            # 내용은 같고 수정 시각만 바뀐 경우 - 지문만 갱신
+            await asyncio.to_thread(_save_fingerprint, document_id, fingerprint)
+            result["status"] = "unchanged"
+            return result
+        
+        # 파일에서 페이지 단위로 텍스트를 추출하며 RAG 인덱싱 (index_document는 단계별 자체 세션 사용)
+        rag_service = RAGService(worker_session)
+        success = await rag_service.index_document(
+            document_id,
+            iter_document_pages(document.file_path, document.file_type),
+            fingerprint=fingerprint
+        )
+        lap("extract_index")
+        
+        if success:
+            print(f"Successfully reindexed: {result['title']}")
+        else:
+            result["status"] = "failed"
+            result["error"] = "No indexable text extracted from document"
+            print(f"Failed to reindex: {result['title']}")
+            
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+        print(f"Error reindexing {result['title']}: {e}")
+    
+    return result
+
+
+def _save_fingerprint(document_id: int, fingerprint: Dict):
+    """파일 지문만 갱신 (내용 해시가 같아 재인덱싱하지 않는 경우)"""
+    with Session(engine) as session:
+        session.execute(update(Document).where(Document.id == document_id).values(**fingerprint))
+        session.commit()
+
+
 @router.get("/categories/list")
 async def get_categories(
     current_user: User = Depends(get_current_user)
@@ -408,6 +533,7 @@ async def sync_filesystem_with_database(
         documents = session.exec(statement).all()
         
         deleted_count = 0
+        deleted_ids = []
         missing_files = []
         
         for document in documents:
@@ -424,8 +550,14 @@ async def sync_filesystem_with_database(
                 for chunk in chunks:
                     session.delete(chunk)
                 
+                # 관련 인덱싱 작업 삭제
+                job_statement = select(IndexingJob).where(IndexingJob.document_id == document.id)
+                for job in session.exec(job_statement).all():
+                    session.delete(job)
+                
                 # 문서 삭제
                 session.delete(document)
+                deleted_ids.append(document.id)
                 deleted_count += 1
             else:
                 missing_files.append({
@@ -436,6 +568,9 @@ async def sync_filesystem_with_database(
                 })
         
         session.commit()
+        if deleted_count:
+            vector_index.remove_documents(deleted_ids)
+            notify_corpus_changed()
         
         return {
             "message": "파일 시스템과 데이터베이스 동기화 완료",
@@ -450,24 +585,3 @@ async def sync_filesystem_with_database(
             status_code=500,
             detail=f"Failed to sync filesystem with database: {str(e)}"
         )
-
-
-async def _extract_text_from_file(file_path: str, file_type: str) -> str:
-    """
-    파일에서 텍스트 추출
-    """
-    if file_type == '.txt':
-        async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-            return await f.read()
-    
-    elif file_type == '.pdf':
-        from pypdf import PdfReader
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    
-    else:
-        raise ValueError(f"Unsupported file type: {file_type}")
-
@@ -151,7 +151,7 @@ async def start_rag_simulation(
     """RAG 시뮬레이션 시작"""
     try:
         service = RAGSimulationService(session)
-        result = service.start_voice_simulation(
+        result = await service.start_voice_simulation(
             current_user.id,
             request.persona_id,
             request.scenario_id,
@@ -241,7 +241,7 @@ async def process_rag_voice_interaction(
             print(f"session_data_dict 내용: {session_data_dict}")
             raise ValueError("세션 데이터가 올바르지 않습니다.")
         
-        result = service.process_voice_interaction(
+        result = await service.process_voice_interaction(
             session_data_dict,
             audio_data,
             text_message
@@ -0,0 +1,217 @@
+"""
+AI 백엔드 공급자
+채팅, 임베딩, 음성 인식(STT), 음성 합성(TTS)을 하나의 인터페이스로 제공합니다.
+settings.AI_PROVIDER로 선택합니다.
+- openai: OpenAI 호환 API (공유 연결 풀 LLMClient 사용)
+- fake: 네트워크 없이 동작하는 결정적 가짜 응답 (부하 테스트/벤치마크용)
+"""
+import asyncio
+import hashlib
+import io
+import json
+import math
+import random
+import wave
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.llm_client import LLMClient, get_llm_client
+
+EMBEDDING_DIMENSIONS = 1536
+
+
+class AIProvider(ABC):
+    """AI 공급자 인터페이스 - 메서드를 모두 구현하지 않은 공급자는 생성 시 TypeError"""
+
+    name = "base"
+
+    @property
+    def is_configured(self) -> bool:
+        """호출 가능 여부 (API 키 등)"""
+        return True
+
+    @abstractmethod
+    async def chat_completion(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> str:
+        """채팅 응답 전체 텍스트"""
+
+    @abstractmethod
+    def stream_chat_completion(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """채팅 응답 토큰 스트림"""
+
+    @abstractmethod
+    async def embeddings(
+        self,
+        inputs: List[str],
+        model: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> List[List[float]]:
+        """입력 순서대로 임베딩 벡터 목록"""
+
+    @abstractmethod
+    async def transcribe(self, audio: bytes, filename: str = "audio.webm", language: str = "ko") -> str:
+        """음성 인식 (STT)"""
+
+    @abstractmethod
+    async def synthesize_speech(self, text: str, voice: str = "alloy", speed: float = 1.0) -> Tuple[bytes, str]:
+        """음성 합성 - (오디오 바이트, MIME 타입) 반환"""
+
+    async def aclose(self):
+        pass
+
+
+class OpenAIProvider(AIProvider):
+    """OpenAI 호환 API 공급자"""
+
+    name = "openai"
+    stt_model = "whisper-1"
+    tts_model = "tts-1"
+
+    def __init__(self, client: LLMClient):
+        self.client = client
+
+    @property
+    def is_configured(self) -> bool:
+        return self.client.is_configured
+
+    async def chat_completion(self, messages, model=None, max_tokens=1000, temperature=0.7, timeout=None) -> str:
+        return await self.client.chat_completion(
+            messages, model=model, max_tokens=max_tokens, temperature=temperature, timeout=timeout
+        )
+
+    def stream_chat_completion(self, messages, model=None, max_tokens=1000, temperature=0.7, timeout=None):
+        return self.client.stream_chat_completion(
+            messages, model=model, max_tokens=max_tokens, temperature=temperature, timeout=timeout
+        )
+
+    async def embeddings(self, inputs, model=None, timeout=None) -> List[List[float]]:
+        return await self.client.embeddings(inputs, model=model, timeout=timeout)
+
+    async def transcribe(self, audio: bytes, filename: str = "audio.webm", language: str = "ko") -> str:
+        return await self.client.transcribe(audio, filename=filename, model=self.stt_model, language=language)
+
+    async def synthesize_speech(self, text: str, voice: str = "alloy", speed: float = 1.0) -> Tuple[bytes, str]:
+        audio = await self.client.speech(text, voice=voice, speed=speed, model=self.tts_model)
+        return audio, "audio/mpeg"
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class FakeAIProvider(AIProvider):
+    """
+    결정적 가짜 공급자 - 같은 입력에는 항상 같은 출력
+    - 채팅: 첫 토큰까지 latency_ms, 이후 tokens_per_second 속도로 토큰 생성
+    - 임베딩: 글자 바이그램 해시 벡터 (비슷한 문장은 코사인 유사도가 높음)
+    - STT/TTS: 고정 문구 / 텍스트 길이에 비례하는 무음 WAV
+    """
+
+    name = "fake"
+    transcripts = [
+        "안녕하세요, 예금 상품 상담을 받고 싶습니다.",
+        "대출 금리가 어떻게 되는지 알려주세요.",
+        "계좌 이체 한도를 늘리고 싶어요.",
+        "카드 분실 신고를 하려고 합니다."
+    ]
+
+    def __init__(self, latency_ms: float, tokens_per_second: float, completion_tokens: int):
+        self.latency = latency_ms / 1000
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+
+    @staticmethod
+    def _seed(*parts) -> int:
+        digest = hashlib.sha256(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def _completion_tokens(self, messages: List[Dict], max_tokens: int) -> List[str]:
+        """프롬프트 단어를 결정적으로 뽑아 응답 토큰 목록 생성"""
+        words = " ".join(message.get("content", "") for message in messages).split() or ["응답"]
+        rng = random.Random(self._seed(messages, max_tokens))
+        count = min(self.completion_tokens, max_tokens)
+        return ["🐻"] + [" " + rng.choice(words) for _ in range(count - 1)]
+
+    async def chat_completion(self, messages, model=None, max_tokens=1000, temperature=0.7, timeout=None) -> str:
+        tokens = self._completion_tokens(messages, max_tokens)
+        await asyncio.sleep(self.latency + len(tokens) / self.tokens_per_second)
+        return "".join(tokens).strip()
+
+    async def stream_chat_completion(self, messages, model=None, max_tokens=1000, temperature=0.7, timeout=None):
+        tokens = self._completion_tokens(messages, max_tokens)
+        await asyncio.sleep(self.latency)
+        for token in tokens:
+            await asyncio.sleep(1 / self.tokens_per_second)
+            yield token
+
+    @staticmethod
+    def _embed(text: str) -> List[float]:
+        vector = [0.0] * EMBEDDING_DIMENSIONS
+        normalized = " ".join(text.lower().split())
+        grams = [normalized[index:index + 2] for index in range(max(len(normalized) - 1, 1))]
+        for gram in grams:
+            digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "big") % EMBEDDING_DIMENSIONS
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    async def embeddings(self, inputs, model=None, timeout=None) -> List[List[float]]:
+        await asyncio.sleep(self.latency)
+        return [self._embed(text) for text in inputs]
+
+    async def transcribe(self, audio: bytes, filename: str = "audio.webm", language: str = "ko") -> str:
+        await asyncio.sleep(self.latency)
+        return self.transcripts[self._seed(hashlib.sha256(audio).hexdigest()) % len(self.transcripts)]
+
+    async def synthesize_speech(self, text: str, voice: str = "alloy", speed: float = 1.0) -> Tuple[bytes, str]:
+        await asyncio.sleep(self.latency)
+        sample_rate = 8000
+        seconds = min(len(text) * 0.1 / max(speed, 0.1), 30.0)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(1)
+            wav.setframerate(sample_rate)
+            wav.writeframes(b"\x80" * int(sample_rate * seconds))
+        return buffer.getvalue(), "audio/wav"
+
+
+_ai_provider: Optional[AIProvider] = None
+
+
+def get_ai_provider() -> AIProvider:
+    """애플리케이션 공용 AI 공급자 (settings.AI_PROVIDER)"""
+    global _ai_provider
+    if _ai_provider is None:
+        if settings.AI_PROVIDER == "fake":
+            _ai_provider = FakeAIProvider(
+                latency_ms=settings.FAKE_AI_LATENCY_MS,
+                tokens_per_second=settings.FAKE_AI_TOKENS_PER_SECOND,
+                completion_tokens=settings.FAKE_AI_COMPLETION_TOKENS
+            )
+        elif settings.AI_PROVIDER == "openai":
+            _ai_provider = OpenAIProvider(get_llm_client())
+        else:
+            raise ValueError(f"Unsupported AI_PROVIDER: {settings.AI_PROVIDER}")
+        print(f"✅ AI provider: {_ai_provider.name}")
+    return _ai_provider
+
+
+async def close_ai_provider():
+    """애플리케이션 종료 시 공급자 연결 정리"""
+    if _ai_provider is not None:
+        await _ai_provider.aclose()
@@ -0,0 +1,121 @@
+"""
+대화 기록 백그라운드 저장
+채팅 응답 경로에서는 대기열에 넣기만 하고, lifespan에서 시작한 태스크가
+모아서 한 번의 INSERT로 chat_histories에 저장합니다.
+"""
+import asyncio
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.config import settings
+from app.database import engine
+from app.models.mentor import ChatHistory
+
+# 대기열 종료 신호
+_STOP = object()
+
+
+def _insert_rows(rows: List[Dict]):
+    with Session(engine) as session:
+        session.execute(insert(ChatHistory), rows)
+        session.commit()
+
+
+class ChatHistoryWriter:
+    """배치 INSERT 방식의 대화 기록 저장기"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=settings.CHAT_HISTORY_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run())
+        print("✅ Chat history writer started")
+
+    def record(
+        self,
+        user_id: int,
+        user_message: str,
+        bot_response: str,
+        sources: List[Dict],
+        response_time: Optional[float] = None
+    ):
+        """대화 1건 저장 요청 (대기하지 않음, 생성 시각은 요청 시점 기준)"""
+        row = {
+            "user_id": user_id,
+            "user_message": user_message,
+            "bot_response": bot_response,
+            "source_documents": json.dumps(sources, ensure_ascii=False),
+            "response_time": response_time,
+            "created_at": datetime.utcnow()
+        }
+        if self._queue is None:
+            print("⚠️ Chat history writer not started - 기록 저장 생략")
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"⚠️ 대화 기록 대기열 가득 참 - 기록 버림 (누적 {self.dropped}건)")
+
+    async def _next_batch(self) -> Tuple[List[Dict], bool]:
+        """
+        첫 항목을 기다린 뒤 배치 크기 또는 flush 주기까지 모음
+        반환: (배치, 종료 신호 수신 여부)
+        """
+        row = await self._queue.get()
+        if row is _STOP:
+            return [], True
+
+        batch = [row]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.CHAT_HISTORY_FLUSH_INTERVAL_SECONDS
+        while len(batch) < settings.CHAT_HISTORY_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    async def _flush(self, rows: List[Dict]):
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(_insert_rows, rows)
+            self.written += len(rows)
+        except Exception as e:
+            self.dropped += len(rows)
+            print(f"❌ 대화 기록 저장 실패 ({len(rows)}건): {e}")
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            await self._flush(batch)
+
+    async def stop(self):
+        """종료 시 대기 중인 기록을 모두 저장 (종료 신호 이전 항목까지 순서대로 처리)"""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+        print(f"✅ Chat history writer stopped (저장 {self.written}건, 누락 {self.dropped}건)")
+
+
+chat_history_writer = ChatHistoryWriter()
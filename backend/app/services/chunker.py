@@ -0,0 +1,278 @@
+"""
+텍스트 청크 분할기
+페이지/블록 단위로 들어오는 텍스트를 받아 청크가 완성되는 대로 반환합니다.
+- SentenceChunker: 문장/마크다운 제목 경계에서 토큰 수 기준으로 분할 (기본값)
+- TextChunker: 글자 수 기준 분할
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+
+class TextChunker:
+    """
+    chunk_size 길이의 청크를 chunk_overlap 만큼 겹치게 분할하는 점진적 분할기
+    문단/줄/문장 경계에서 자르도록 청크 후반부의 구분자를 우선 탐색
+    """
+
+    separators = ["\n\n", "\n", ". ", " "]
+
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._buffer = ""
+        self._buffer_offset = 0  # 버퍼 시작 위치의 전체 텍스트 기준 오프셋
+
+    def feed(self, segment: str) -> List[Dict]:
+        """텍스트 조각 추가 - 완성된 청크 목록 반환"""
+        self._buffer += segment
+        return self._drain(final=False)
+
+    def finish(self) -> List[Dict]:
+        """남은 텍스트를 마지막 청크로 반환"""
+        chunks = self._drain(final=True)
+        self._buffer = ""
+        return chunks
+
+    def split(self, content: str) -> List[Dict]:
+        """전체 텍스트 한 번에 분할"""
+        return self.feed(content) + self.finish()
+
+    def _drain(self, final: bool) -> List[Dict]:
+        chunks = []
+        start = 0
+        length = len(self._buffer)
+
+        # 최종 호출이 아니면 청크 하나를 완성할 만큼 텍스트가 쌓였을 때만 자름
+        while start < length and (final or length - start > self.chunk_size):
+            end = min(start + self.chunk_size, length)
+
+            if end < length:
+                # 청크 후반부에서 가장 뒤쪽 구분자 위치를 경계로 사용
+                min_end = start + self.chunk_size // 2
+                for separator in self.separators:
+                    position = self._buffer.rfind(separator, min_end, end)
+                    if position != -1:
+                        end = position + len(separator)
+                        break
+
+            chunk = self._buffer[start:end].strip()
+            if chunk:
+                chunks.append({
+                    "content": chunk,
+                    "start": self._buffer_offset + start,
+                    "end": self._buffer_offset + end
+                })
+
+            if end >= length:
+                start = length
+                break
+            start = max(end - self.chunk_overlap, start + 1)
+
+        # 이미 청크로 내보낸 앞부분은 버퍼에서 제거
+        self._buffer = self._buffer[start:]
+        self._buffer_offset += start
+        return chunks
+
+
+class _Unit(NamedTuple):
+    """분할 단위 (문장 또는 제목 줄) - text는 뒤따르는 공백/줄바꿈 포함"""
+    text: str
+    start: int
+    tokens: int
+    heading_level: int = 0
+
+
+class SentenceChunker:
+    """
+    문장 단위로 chunk_tokens 토큰까지 모으는 점진적 분할기
+    - 한국어/영어 문장 끝(마침표/물음표/느낌표 + 공백)과 줄바꿈을 경계로 사용
+    - split_level 이하 마크다운 제목(#, ##)에서는 항상 새 청크 시작,
+      더 깊은 제목(###)은 현재 청크가 절반 이상 찼을 때만 새 청크 시작
+    - 토큰 초과로 나눌 때만 앞 청크 끝 문장을 overlap_tokens 이내로 다음 청크에 이어 붙임
+    - 각 청크에 제목 경로(headings)와 섹션 코드(section, 예: BA01)를 metadata로 첨부
+    """
+
+    heading_pattern = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
+    section_pattern = re.compile(r"\[([A-Za-z]+\d+)\]")
+    # 숫자 목록("1. ")은 문장 끝으로 보지 않음
+    sentence_end_pattern = re.compile(r"(?<=[^\d\s][.!?。？！…])\s+")
+    # 줄바꿈 없이 긴 텍스트가 들어올 때 버퍼에 쌓아둘 최대 길이 (문자)
+    max_pending_chars = 16 * 1024
+
+    def __init__(self, chunk_tokens: int, overlap_tokens: int, split_level: int = 2):
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.split_level = split_level
+        self._buffer = ""
+        self._buffer_offset = 0
+        self._units: List[_Unit] = []
+        self._tokens = 0
+        self._carried = 0  # 앞 청크에서 이어 붙인 단위 수
+        self._headings: List[Tuple[int, str]] = []
+        self._metadata: Optional[Dict] = None
+        self._output: List[Dict] = []
+
+    def feed(self, segment: str) -> List[Dict]:
+        """텍스트 조각 추가 - 완성된 청크 목록 반환"""
+        self._buffer += segment
+        self._consume(final=False)
+        return self._take_output()
+
+    def finish(self) -> List[Dict]:
+        """남은 텍스트를 마지막 청크로 반환"""
+        self._consume(final=True)
+        if self._metadata is None and self._units:
+            # 본문 없이 제목만 있는 텍스트도 청크로 남김
+            self._metadata = self._heading_metadata()
+        self._flush(overlap=False)
+        return self._take_output()
+
+    def split(self, content: str) -> List[Dict]:
+        """전체 텍스트 한 번에 분할"""
+        return self.feed(content) + self.finish()
+
+    def _take_output(self) -> List[Dict]:
+        output, self._output = self._output, []
+        return output
+
+    def _consume(self, final: bool):
+        """버퍼에서 완성된 줄(마지막 호출이면 전체)을 단위로 나눠 청크에 추가"""
+        complete = len(self._buffer) if final else self._buffer.rfind("\n") + 1
+        units = self._line_units(self._buffer[:complete], self._buffer_offset)
+        rest = self._buffer[complete:]
+        rest_offset = self._buffer_offset + complete
+
+        # 줄바꿈 없는 긴 텍스트(PDF 페이지 등)는 마지막 미완성 문장만 남기고 처리
+        if len(rest) > self.max_pending_chars:
+            sentences = self._sentence_units(rest, rest_offset)
+            units.extend(sentences[:-1])
+            rest_offset = sentences[-1].start
+            rest = rest[rest_offset - self._buffer_offset - complete:]
+
+        self._buffer = rest
+        self._buffer_offset = rest_offset
+        for unit in units:
+            self._add(unit)
+
+    def _line_units(self, text: str, offset: int) -> List[_Unit]:
+        units = []
+        position = 0
+        for line in text.splitlines(keepends=True):
+            match = self.heading_pattern.match(line.strip())
+            if match:
+                units.append(_Unit(line, offset + position, count_tokens(line), len(match.group(1))))
+            else:
+                units.extend(self._sentence_units(line, offset + position))
+            position += len(line)
+        return units
+
+    def _sentence_units(self, text: str, offset: int) -> List[_Unit]:
+        units = []
+        start = 0
+        for match in self.sentence_end_pattern.finditer(text):
+            units.append(self._unit(text[start:match.end()], offset + start))
+            start = match.end()
+        if start < len(text):
+            units.append(self._unit(text[start:], offset + start))
+        return units
+
+    @staticmethod
+    def _unit(text: str, start: int) -> _Unit:
+        return _Unit(text, start, count_tokens(text) if text.strip() else 0)
+
+    def _add(self, unit: _Unit):
+        if unit.heading_level:
+            if unit.heading_level <= self.split_level or self._tokens >= self.chunk_tokens // 2:
+                self._flush(overlap=False)
+            self._headings = [heading for heading in self._headings if heading[0] < unit.heading_level]
+            self._headings.append((unit.heading_level, unit.text.strip().lstrip("#").strip()))
+            self._append(unit)
+            return
+
+        if not unit.tokens:
+            # 공백/빈 줄은 청크 중간에서만 유지
+            if self._units:
+                self._append(unit)
+            return
+
+        if unit.tokens > self.chunk_tokens:
+            for part in self._split_long(unit):
+                self._add(part)
+            return
+
+        if self._tokens + unit.tokens > self.chunk_tokens and self._metadata is not None:
+            self._flush(overlap=True)
+        if self._metadata is None:
+            # 본문이 시작되는 시점의 제목 경로를 청크 메타데이터로 사용
+            self._metadata = self._heading_metadata()
+        self._append(unit)
+
+    def _append(self, unit: _Unit):
+        self._units.append(unit)
+        self._tokens += unit.tokens
+
+    def _split_long(self, unit: _Unit) -> List[_Unit]:
+        """토큰 제한을 넘는 한 문장을 chunk_tokens 단위로 자름"""
+        parts = []
+        text, start = unit.text, unit.start
+        while text:
+            # 토크나이저 경계에서 잘린 멀티바이트 문자(�)는 다음 조각으로 넘김
+            cut = len(truncate_to_tokens(text, self.chunk_tokens).rstrip("\ufffd")) or 1
+            parts.append(self._unit(text[:cut], start))
+            text, start = text[cut:], start + cut
+        return parts
+
+    def _heading_metadata(self) -> Dict:
+        titles = [title for _, title in self._headings]
+        section = None
+        for title in reversed(titles):
+            match = self.section_pattern.search(title)
+            if match:
+                section = match.group(1)
+                break
+        return {"headings": titles, "section": section}
+
+    def _flush(self, overlap: bool):
+        """
+        현재 청크 내보내기 - 본문이 없거나 앞 청크에서 이어 붙인 문장뿐이면 내보내지 않음
+        제목만 있는 경우(# 대분류 바로 뒤 ## 소제목 등)는 다음 본문과 같은 청크로 유지
+        """
+        if self._metadata is None:
+            return
+        if len(self._units) > self._carried:
+            last = self._units[-1]
+            self._output.append({
+                "content": "".join(unit.text for unit in self._units).strip(),
+                "start": self._units[0].start,
+                "end": last.start + len(last.text),
+                "metadata": self._metadata
+            })
+
+        carried: List[_Unit] = []
+        # 이어 붙인 문장만 남은 상태에서 다시 넘치면 중첩 없이 새로 시작
+        if overlap and len(self._units) > self._carried:
+            tokens = 0
+            for unit in reversed(self._units):
+                if unit.heading_level or tokens + unit.tokens > self.overlap_tokens:
+                    break
+                carried.insert(0, unit)
+                tokens += unit.tokens
+            while carried and not carried[0].tokens:
+                carried.pop(0)
+
+        self._units = carried
+        self._tokens = sum(unit.tokens for unit in carried)
+        self._carried = len(carried)
+        self._metadata = self._metadata if carried else None
+
+
+def create_chunker():
+    """settings.RAG_CHUNKER에 맞는 청크 분할기 생성"""
+    if settings.RAG_CHUNKER == "sentence":
+        return SentenceChunker(settings.RAG_CHUNK_TOKENS, settings.RAG_CHUNK_OVERLAP_TOKENS)
+    if settings.RAG_CHUNKER == "character":
+        return TextChunker(settings.RAG_CHUNK_SIZE, settings.RAG_CHUNK_OVERLAP)
+    raise ValueError(f"Unsupported RAG_CHUNKER: {settings.RAG_CHUNKER}")
@@ -0,0 +1,123 @@
+"""
+RAG 프롬프트 컨텍스트 구성
+검색 결과를 점수 순으로 정렬하고, 같은 문서의 인접 청크 간 중첩 구간을 제거한 뒤
+토큰 예산 안에서만 컨텍스트에 포함합니다.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+# 예산이 이보다 적게 남으면 청크를 잘라 넣지 않고 중단
+MIN_PARTIAL_TOKENS = 50
+
+# 이보다 짧게 일치하는 구간은 우연한 일치로 보고 중첩으로 처리하지 않음
+MIN_OVERLAP_CHARS = 20
+
+# 문장 단위 분할기의 토큰 중첩을 글자 수로 환산할 때 쓰는 토큰당 최대 글자 수 (영문 기준 여유치)
+MAX_CHARS_PER_TOKEN = 6
+
+
+def _max_overlap_chars() -> int:
+    """청크 분할기 설정상 인접 청크가 겹칠 수 있는 최대 길이 (문자)"""
+    if settings.RAG_CHUNKER == "sentence":
+        return settings.RAG_CHUNK_OVERLAP_TOKENS * MAX_CHARS_PER_TOKEN
+    return settings.RAG_CHUNK_OVERLAP
+
+
+def _overlap_length(previous: str, following: str) -> int:
+    """
+    previous의 접미사와 following의 접두사가 일치하는 최대 길이
+    청크 분할 시 중첩 길이를 넘는 일치는 반복 문장일 수 있으므로 검사하지 않음
+    """
+    max_length = min(len(previous), len(following), _max_overlap_chars())
+    if max_length < MIN_OVERLAP_CHARS:
+        return 0
+
+    # following의 첫 글자가 나오는 previous 뒤쪽 위치만 후보로 검사
+    start = len(previous) - max_length
+    first_char = following[0]
+    position = previous.find(first_char, start)
+    while position != -1:
+        length = len(previous) - position
+        if length < MIN_OVERLAP_CHARS:
+            break
+        if following.startswith(previous[position:]):
+            return length
+        position = previous.find(first_char, position + 1)
+    return 0
+
+
+def _strip_neighbor_overlaps(content: str, previous: Optional[str], following: Optional[str]) -> str:
+    """이미 포함된 앞/뒤 청크와 겹치는 구간 제거"""
+    if previous:
+        content = content[_overlap_length(previous, content):]
+    if following and content:
+        overlap = _overlap_length(content, following)
+        if overlap:
+            content = content[:-overlap]
+    return content.strip()
+
+
+def pack_context(similar_docs: List[Dict], token_budget: Optional[int] = None) -> Tuple[str, Dict]:
+    """
+    검색 결과로 프롬프트 컨텍스트 문자열 구성
+    반환: (컨텍스트, 통계) - 통계는 포함/제외 청크 수와 토큰 수
+    """
+    token_budget = token_budget or settings.RAG_CONTEXT_TOKEN_BUDGET
+
+    # 점수 내림차순 (동점이면 검색 결과 순서 유지)
+    ranked = sorted(similar_docs, key=lambda doc: doc.get("similarity") or 0.0, reverse=True)
+
+    # (document_id, chunk_index) -> 원본 청크 내용 (중첩 판단은 원본 기준)
+    included: Dict[Tuple, str] = {}
+    sections = []
+    used_tokens = 0
+    saved_tokens = 0
+    truncated = 0
+
+    for doc in ranked:
+        document_id = doc.get("document_id")
+        chunk_index = doc.get("chunk_index")
+        key = (document_id, chunk_index)
+        if document_id is not None and key in included:
+            continue
+
+        content = doc["content"].strip()
+        if document_id is not None and chunk_index is not None:
+            stripped = _strip_neighbor_overlaps(
+                content,
+                included.get((document_id, chunk_index - 1)),
+                included.get((document_id, chunk_index + 1))
+            )
+            saved_tokens += count_tokens(content) - count_tokens(stripped)
+            included[key] = content
+            content = stripped
+        if not content:
+            continue
+
+        section = f"[{doc['title']}]\n{content}"
+        section_tokens = count_tokens(section)
+        remaining = token_budget - used_tokens
+
+        if section_tokens > remaining:
+            if remaining < MIN_PARTIAL_TOKENS:
+                break
+            section = truncate_to_tokens(section, remaining)
+            section_tokens = count_tokens(section)
+            truncated += 1
+
+        sections.append(section)
+        used_tokens += section_tokens
+        if used_tokens >= token_budget:
+            break
+
+    stats = {
+        "candidates": len(similar_docs),
+        "included": len(sections),
+        "tokens": used_tokens,
+        "token_budget": token_budget,
+        "overlap_tokens_removed": saved_tokens,
+        "truncated": truncated
+    }
+    return "\n\n".join(sections), stats
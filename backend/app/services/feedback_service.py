@@ -181,7 +181,7 @@ class FeedbackService:
 길이는 500-800자 정도로 작성하세요."""
 
         # GPT API 호출
-        return self.rag_service._call_gpt(prompt)
+        return await self.rag_service._call_gpt(prompt)
     
     def _analyze_section_scores(self, section_scores: Dict) -> Dict:
         """섹션별 점수 분석"""
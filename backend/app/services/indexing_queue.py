@@ -0,0 +1,222 @@
+"""
+문서 인덱싱 작업 큐
+업로드 요청에서는 작업만 등록하고, 앱 lifespan에서 시작한 워커가
+PostgreSQL 테이블(indexing_jobs)에서 FOR UPDATE SKIP LOCKED로 작업을 가져가 처리합니다.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+from sqlalchemy import text, update
+
+from app.config import settings
+from app.database import engine
+from app.models.document import Document, IndexingJob
+from app.services.rag_service import RAGService
+from app.utils.file_handler import file_fingerprint
+from app.utils.text_extractor import iter_document_pages
+
+
+def enqueue_indexing_job(session: Session, document_id: int) -> IndexingJob:
+    """
+    인덱싱 작업 등록 (커밋 포함)
+    같은 프로세스의 워커는 즉시 깨우고, 다른 프로세스의 워커는 폴링으로 가져감
+    """
+    job = IndexingJob(document_id=document_id)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    indexing_workers.wake()
+    return job
+
+
+def _claim_next_job() -> Optional[int]:
+    """
+    대기 중인 작업 1건을 원자적으로 가져와 running으로 변경
+    - FOR UPDATE SKIP LOCKED: 여러 워커/프로세스가 같은 작업을 가져가지 않음
+    - 제한 시간을 넘긴 running 작업(워커 비정상 종료)은 재시도 대상으로 포함하고,
+      재시도 횟수를 모두 쓴 작업은 failed로 정리 (running 상태로 남지 않도록)
+    """
+    expire_query = """
+        UPDATE indexing_jobs
+        SET status = 'failed', finished_at = now(),
+            error = COALESCE(error, 'Indexing job timed out (worker stopped or exceeded time limit)')
+        WHERE status = 'running'
+        AND started_at < now() - make_interval(secs => :timeout)
+        AND attempts >= :max_attempts
+    """
+    claim_query = """
+        UPDATE indexing_jobs
+        SET status = 'running', started_at = now(), attempts = attempts + 1,
+            stage = NULL, progress = 0, error = NULL, next_attempt_at = NULL
+        WHERE id = (
+            SELECT id FROM indexing_jobs
+            WHERE ((status = 'queued' AND (next_attempt_at IS NULL OR next_attempt_at <= now()))
+                OR (status = 'running' AND started_at < now() - make_interval(secs => :timeout)))
+            AND attempts < :max_attempts
+            ORDER BY id
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id
+    """
+    params = {
+        "timeout": settings.INDEXING_JOB_TIMEOUT_SECONDS,
+        "max_attempts": settings.INDEXING_MAX_ATTEMPTS
+    }
+    with Session(engine) as session:
+        expired = session.execute(text(expire_query), params).rowcount
+        if expired:
+            print(f"⚠️ 재시도 횟수를 초과한 시간 초과 인덱싱 작업 {expired}건을 failed로 변경")
+        job_id = session.execute(text(claim_query), params).scalar()
+        session.commit()
+        return job_id
+
+
+def _load_job(job_id: int) -> Tuple[IndexingJob, Optional[Document]]:
+    """작업과 문서 조회 (세션에서 분리해 반환 - 추출/임베딩 동안 DB 연결을 잡지 않음)"""
+    with Session(engine) as session:
+        job = session.get(IndexingJob, job_id)
+        document = session.get(Document, job.document_id)
+        session.expunge(job)
+        if document is not None:
+            session.expunge(document)
+        return job, document
+
+
+def _update_job(job_id: int, **fields):
+    """작업 상태 갱신 후 즉시 커밋 (상태 API에서 진행 상황 조회 가능)"""
+    with Session(engine) as session:
+        session.execute(update(IndexingJob).where(IndexingJob.id == job_id).values(**fields))
+        session.commit()
+
+
+def _fail_job(job_id: int, attempts: int, error: str, timings: Dict[str, float]) -> bool:
+    """
+    실패 기록 - 재시도 횟수가 남아 있으면 지수 백오프 후 다시 대기열로 (재시도 여부 반환)
+    API 키 오류/공급자 장애처럼 계속 실패하는 경우 시도 횟수를 순식간에 소진하지 않도록 대기
+    """
+    retry = attempts < settings.INDEXING_MAX_ATTEMPTS
+    delay = min(
+        settings.INDEXING_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+        settings.INDEXING_RETRY_MAX_SECONDS
+    ) if retry else None
+    with Session(engine) as session:
+        # 재시도 시각은 claim 쿼리와 같은 DB 시계(now()) 기준
+        session.execute(
+            text("""
+                UPDATE indexing_jobs
+                SET status = :status, error = :error, timings = :timings, finished_at = :finished_at,
+                    next_attempt_at = now() + make_interval(secs => :delay)
+                WHERE id = :job_id
+            """),
+            {
+                "job_id": job_id,
+                "status": "queued" if retry else "failed",
+                "error": error,
+                "timings": json.dumps(timings),
+                "finished_at": None if retry else datetime.utcnow(),
+                "delay": delay
+            }
+        )
+        session.commit()
+    return retry
+
+
+async def process_job(job_id: int):
+    """작업 1건 처리: 파일 지문 계산 → 텍스트 추출/인덱싱 (작업 상태 DB 갱신은 이벤트 루프 밖에서)"""
+    timings: Dict[str, float] = {}
+    job, document = await asyncio.to_thread(_load_job, job_id)
+
+    try:
+        if document is None:
+            raise ValueError(f"Document not found: {job.document_id}")
+
+        started = time.perf_counter()
+        await asyncio.to_thread(_update_job, job_id, stage="fingerprint", progress=0.1)
+        fingerprint = await asyncio.to_thread(file_fingerprint, document.file_path)
+        timings["fingerprint"] = round((time.perf_counter() - started) * 1000, 1)
+
+        # 페이지 추출(프로세스 풀)과 청크 분할/임베딩을 스트리밍으로 함께 진행
+        started = time.perf_counter()
+        await asyncio.to_thread(
+            _update_job, job_id, stage="index", progress=0.2, timings=json.dumps(timings)
+        )
+        with Session(engine) as session:
+            # index_document는 단계별 자체 세션 사용 (이 세션은 생성자 인자로만 전달)
+            success = await RAGService(session).index_document(
+                document.id,
+                iter_document_pages(document.file_path, document.file_type),
+                fingerprint=fingerprint
+            )
+        timings["index"] = round((time.perf_counter() - started) * 1000, 1)
+
+        if not success:
+            raise ValueError("No indexable text extracted from document")
+
+        await asyncio.to_thread(
+            _update_job, job_id,
+            status="completed", progress=1.0,
+            timings=json.dumps(timings), finished_at=datetime.utcnow()
+        )
+        print(f"✅ 인덱싱 작업 완료: job={job_id}, document={job.document_id}, {timings}")
+
+    except Exception as e:
+        retry = await asyncio.to_thread(_fail_job, job_id, job.attempts, str(e), timings)
+        print(f"❌ 인덱싱 작업 실패: job={job_id}, attempt={job.attempts}, retry={retry}, {e}")
+
+
+class IndexingWorkerPool:
+    """lifespan에서 시작/종료하는 인덱싱 워커 태스크 묶음"""
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self, worker_count: int):
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(worker_id))
+            for worker_id in range(worker_count)
+        ]
+        print(f"✅ Indexing workers started: {worker_count}")
+
+    def wake(self):
+        """새 작업 등록 시 대기 중인 워커 깨우기"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self):
+        self._stopping = True
+        self.wake()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, worker_id: int):
+        while not self._stopping:
+            try:
+                job_id = await asyncio.to_thread(_claim_next_job)
+                if job_id is not None:
+                    await process_job(job_id)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Indexing worker {worker_id} error: {e}")
+
+            # 대기열이 비어 있으면 새 작업 알림 또는 폴링 주기까지 대기
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.INDEXING_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+indexing_workers = IndexingWorkerPool()
@@ -0,0 +1,134 @@
+"""
+온보딩 키워드 매처
+키워드 사전(data/rag_keywords.json)을 Aho-Corasick 오토마톤으로 한 번만 빌드해
+질문 전체를 한 번의 선형 탐색으로 매칭합니다. 사전 파일이 바뀌면 자동으로 다시 빌드합니다.
+"""
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+DEFAULT_KEYWORDS_PATH = Path(__file__).resolve().parents[2] / "data" / "rag_keywords.json"
+
+
+class AhoCorasick:
+    """다중 패턴 부분 문자열 탐색 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build_failure_links(self):
+        # 루트의 자식은 실패 시 루트로 돌아가고, 그 아래 노드는 BFS 순서로 실패 링크 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # 실패 링크 노드의 출력도 함께 매칭
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        """text에 등장하는 패턴 인덱스 집합 (겹치는 매칭 포함)"""
+        found: Set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            found.update(self._output[node])
+        return found
+
+
+class KeywordMatcher:
+    """카테고리 우선순위를 보존하는 키워드 추출기 (사전 파일 핫 리로드)"""
+
+    def __init__(self, path: Path = DEFAULT_KEYWORDS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        # (오토마톤, 카테고리별 키워드 목록, 패턴 인덱스 → 카테고리 인덱스 목록)
+        self._state = (AhoCorasick([]), [], [])
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    categories = [
+                        [word.lower() for word in category["keywords"]]
+                        for category in json.load(f)["categories"]
+                    ]
+            except Exception as e:
+                print(f"❌ 키워드 사전 로드 실패: {e}")
+                return
+
+            words = list(dict.fromkeys(word for words in categories for word in words))
+            word_index = {word: index for index, word in enumerate(words)}
+            pattern_categories: List[List[int]] = [[] for _ in words]
+            for category_index, category_words in enumerate(categories):
+                for word in category_words:
+                    pattern_categories[word_index[word]].append(category_index)
+
+            # 빌드가 끝난 뒤 한 번에 교체 (조회 중인 요청은 이전 오토마톤 사용)
+            self._state = (AhoCorasick(words), categories, pattern_categories)
+            self._mtime = mtime
+            print(f"✅ 키워드 사전 로드: 카테고리 {len(categories)}개, 키워드 {len(words)}개")
+
+    def extract(self, question: str, limit: int = 8) -> List[str]:
+        """
+        질문에 등장한 키워드가 속한 카테고리의 키워드 전체를 반환
+        사전의 카테고리 순서 → 카테고리 내 키워드 순서로 정렬되어 항상 같은 결과를 반환
+        """
+        self._reload_if_changed()
+        automaton, categories, pattern_categories = self._state
+
+        matched_categories = sorted({
+            category_index
+            for pattern_index in automaton.find(question.lower())
+            for category_index in pattern_categories[pattern_index]
+        })
+
+        keywords = list(dict.fromkeys(
+            word for category_index in matched_categories for word in categories[category_index]
+        ))
+        return keywords[:limit]
+
+
+keyword_matcher = KeywordMatcher()
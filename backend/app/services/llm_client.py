@@ -0,0 +1,222 @@
+"""
+LLM API 클라이언트
+OpenAI 호환 API를 공유 keep-alive 연결 풀로 비동기 호출합니다.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+
+
+class LLMClient:
+    """공유 연결 풀 + 동시 호출 수 제한을 가진 비동기 LLM 클라이언트"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        timeout: float,
+        max_concurrency: int,
+        max_connections: int,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.transport = transport  # 테스트용 (httpx.MockTransport 등), 기본은 실제 네트워크
+
+        # 이벤트 루프별로 생성 (스크립트에서 asyncio.run을 여러 번 호출하는 경우 대비)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_configured(self) -> bool:
+        """API 키 설정 여부"""
+        return bool(self.api_key)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프용 HTTP 클라이언트 반환 (연결 풀 공유)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                # Content-Type은 요청별로 지정 (JSON / multipart 음성 업로드)
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                transport=self.transport
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    async def _request(self, path: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """동시 호출 수 제한 안에서 POST 요청 (json, data, files 등은 httpx에 그대로 전달)"""
+        client = self._get_client()
+        async with self._semaphore:
+            response = await client.post(
+                path,
+                timeout=httpx.Timeout(timeout) if timeout else httpx.USE_CLIENT_DEFAULT,
+                **kwargs
+            )
+        response.raise_for_status()
+        return response
+
+    async def _post(self, path: str, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        """JSON POST 요청"""
+        response = await self._request(path, timeout=timeout, json=payload)
+        return response.json()
+
+    async def chat_completion(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Chat Completions API 호출
+
+        Returns:
+            응답 메시지 본문
+
+        Raises:
+            httpx.HTTPError: 네트워크 오류, 타임아웃, 2xx 이외의 응답
+        """
+        result = await self._post(
+            "/chat/completions",
+            {
+                "model": model or settings.CHAT_MODEL,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            },
+            timeout=timeout
+        )
+        return result["choices"][0]["message"]["content"].strip()
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Chat Completions API 스트리밍 호출 (stream=true, SSE 응답)
+        응답 토큰이 도착하는 대로 본문 조각(delta)을 생성
+        """
+        client = self._get_client()
+        async with self._semaphore:
+            async with client.stream(
+                "POST",
+                "/chat/completions",
+                json={
+                    "model": model or settings.CHAT_MODEL,
+                    "messages": messages,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                    "stream": True
+                },
+                timeout=httpx.Timeout(timeout) if timeout else httpx.USE_CLIENT_DEFAULT
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+
+    async def embeddings(
+        self,
+        inputs: List[str],
+        model: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> List[List[float]]:
+        """Embeddings API 배치 호출 (입력 순서대로 반환)"""
+        result = await self._post(
+            "/embeddings",
+            {"model": model or settings.EMBEDDING_MODEL, "input": inputs},
+            timeout=timeout
+        )
+        data = sorted(result["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    async def transcribe(
+        self,
+        audio: bytes,
+        filename: str = "audio.webm",
+        model: str = "whisper-1",
+        language: str = "ko",
+        timeout: Optional[float] = None
+    ) -> str:
+        """Audio Transcriptions API 호출 (STT)"""
+        response = await self._request(
+            "/audio/transcriptions",
+            timeout=timeout,
+            data={"model": model, "language": language},
+            files={"file": (filename, audio)}
+        )
+        return response.json()["text"]
+
+    async def speech(
+        self,
+        text: str,
+        voice: str = "alloy",
+        speed: float = 1.0,
+        model: str = "tts-1",
+        timeout: Optional[float] = None
+    ) -> bytes:
+        """Audio Speech API 호출 (TTS) - mp3 바이트 반환"""
+        response = await self._request(
+            "/audio/speech",
+            timeout=timeout,
+            json={"model": model, "voice": voice, "speed": speed, "input": text}
+        )
+        return response.content
+
+    async def aclose(self):
+        """연결 풀 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+_llm_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """애플리케이션 공용 LLM 클라이언트"""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = LLMClient(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.LLM_TIMEOUT,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_connections=settings.LLM_MAX_CONNECTIONS
+        )
+    return _llm_client
+
+
+async def close_llm_client():
+    """애플리케이션 종료 시 연결 풀 정리"""
+    if _llm_client is not None:
+        await _llm_client.aclose()
@@ -1,113 +1,698 @@
 """
 RAG 서비스 - 완전 수정 버전
 """
-import os
 import json
 import asyncio
-from typing import List, Dict, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-import openai
-from app.database import get_session
+import hashlib
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, List, Dict, Optional, Union
+from sqlmodel import Session
+from sqlalchemy import text, insert, delete, update, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import httpx
+from app.config import settings
+from app.database import engine, get_session
+from app.models.document import Document, DocumentChunk, EmbeddingCache
+from app.services.chunker import create_chunker
+from app.services.context_packer import pack_context
+from app.services.reranker import reranker
+from app.services.keyword_matcher import keyword_matcher
+from app.services.ai_provider import get_ai_provider
+from app.services.semantic_cache import answer_cache
+from app.services.single_flight import normalize_question, query_flight
+from app.services.vector_index import vector_index
+from app.utils.metrics import rag_stage_seconds
+
+GPT_ERROR_MESSAGE = "죄송합니다. 일시적인 오류가 발생했습니다."
+ANSWER_ERROR_MESSAGE = "앗, 잠깐만요! 🐻\n일시적인 오류가 발생했어요.\n잠시 후 다시 시도해주세요."
+
+
+# RAG 문서 변경 시 증가 - 변경 전후의 동일 질문이 병합되지 않도록 병합 키에 포함
+corpus_version = 0
+
+
+def notify_corpus_changed():
+    """RAG 문서가 인덱싱/삭제되었을 때 호출 - 답변 캐시 무효화, 코퍼스 버전 증가"""
+    global corpus_version
+    corpus_version += 1
+    answer_cache.invalidate()
+
 
 class RAGService:
     def __init__(self, session: Session):
         self.session = session
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        self.chunk_size = 1000
-        self.chunk_overlap = 200
+        self.ai_provider = get_ai_provider()
+        self.embedding_model = settings.EMBEDDING_MODEL
+        self.embedding_batch_size = settings.EMBEDDING_BATCH_SIZE
+        # 임베딩 캐시 모델 키 - 가짜 공급자의 벡터가 실제 임베딩 캐시와 섞이지 않도록 공급자명 포함
+        self.embedding_cache_model = (
+            self.embedding_model if self.ai_provider.name == "openai"
+            else f"{self.ai_provider.name}:{self.embedding_model}"
+        )
+        self._query_embeddings: Dict[str, Optional[List[float]]] = {}
+        self.stage_timings: Dict[str, float] = {}  # 현재 요청의 단계별 소요 시간 (ms, 같은 단계는 합산)
         self.onboarding_keywords = [
             "온보딩", "신입사원", "교육", "훈련", "가이드", "매뉴얼", "절차", "프로세스"
         ]
         self.stopwords = ["은", "는", "이", "가", "을", "를", "에", "의", "로", "으로", "와", "과", "도", "만", "부터", "까지", "에서", "에게", "한테"]
 
-    async def similarity_search(self, query: str, k: int = 5) -> List[Dict]:
-        """유사도 검색 - 신입사원 온보딩용 개선"""
+    @contextmanager
+    def _timed(self, stage: str):
+        """단계 소요 시간을 stage_timings(ms)에 누적하고 /metrics 히스토그램에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stage_timings[stage] = round(self.stage_timings.get(stage, 0.0) + elapsed * 1000, 1)
+            rag_stage_seconds.observe(elapsed, stage=stage)
+
+    async def index_document(
+        self,
+        document_id: int,
+        content: Union[str, AsyncIterable[str]],
+        fingerprint: Optional[Dict] = None
+    ) -> bool:
+        """
+        문서 인덱싱 - 청크 분할 → 배치 임베딩 → 단일 트랜잭션 일괄 저장
+        
+        Args:
+            document_id: 인덱싱할 문서 ID
+            content: 문서 전체 텍스트 또는 페이지 단위 비동기 텍스트 스트림
+            fingerprint: 인덱싱 상태와 함께 저장할 파일 지문 (content_hash, file_mtime, file_size)
+        
+        Returns:
+            인덱싱 성공 여부 (추출된 텍스트가 없으면 False)
+        
+        Raises:
+            추출/임베딩/저장 중 발생한 예외 (트랜잭션 롤백 후 그대로 전달 - 작업 상태에 실제 원인 기록)
+            RuntimeError: 공급자가 설정되어 있는데 일부 청크 임베딩이 실패한 경우
+                (청크는 저장하지만 파일 지문은 비워 다음 재인덱싱 대상이 됨)
+        """
+        try:
+            chunker = create_chunker()
+            chunks: List[Dict] = []
+            embeddings: List[Optional[List[float]]] = []
+            pending: List[Dict] = []
+            
+            async def embed_pending():
+                # 변경되지 않은 청크는 캐시된 임베딩을 재사용하고, 나머지만 배치 단위로 임베딩 API 호출
+                embeddings.extend(await self._embed_chunks([chunk["content"] for chunk in pending]))
+                chunks.extend(pending)
+                pending.clear()
+            
+            # 페이지가 도착하는 대로 청크를 만들고, 배치가 차면 추출과 병행하여 임베딩
+            async for segment in self._iter_segments(content):
+                pending.extend(chunker.feed(segment))
+                if len(pending) >= self.embedding_batch_size:
+                    await embed_pending()
+            pending.extend(chunker.finish())
+            if pending:
+                await embed_pending()
+            
+            if not chunks:
+                print(f"⚠️ 인덱싱할 내용이 없습니다: document_id={document_id}")
+                return False
+            
+            print(f"📄 문서 {document_id}: {len(chunks)}개 청크 생성")
+            
+            missing_embeddings = sum(1 for embedding in embeddings if embedding is None)
+            if missing_embeddings:
+                # 임베딩이 빠진 청크가 있으면 파일 지문을 저장하지 않음 - 다음 증분 재인덱싱에서 다시 처리
+                fingerprint = {"content_hash": None, "file_mtime": None}
+            
+            # DB 저장은 별도 세션/스레드에서 실행 (대량 INSERT 동안 이벤트 루프가 멈추지 않도록)
+            document = await asyncio.to_thread(
+                self._run_in_new_session, self._replace_document_chunks,
+                document_id, chunks, embeddings, fingerprint
+            )
+            
+            vector_index.upsert_document(
+                document_id,
+                document.title,
+                document.category,
+                [(index, chunk["content"], embedding) for index, (chunk, embedding) in enumerate(zip(chunks, embeddings))]
+            )
+            notify_corpus_changed()
+            
+            if missing_embeddings and self.ai_provider.is_configured:
+                # 임베딩 API 장애 등 - 청크는 키워드 검색용으로 저장하되 작업은 실패로 기록해 재시도
+                raise RuntimeError(
+                    f"Embedding failed for {missing_embeddings}/{len(chunks)} chunks "
+                    "(saved without file fingerprint for retry)"
+                )
+            
+            print(f"✅ 문서 {document_id} 인덱싱 완료: 청크 {len(chunks)}개, 임베딩 {len(chunks) - missing_embeddings}개")
+            return True
+            
+        except Exception as e:
+            print(f"❌ 문서 인덱싱 오류 (document_id={document_id}): {e}")
+            raise
+
+    def _replace_document_chunks(
+        self,
+        session: Session,
+        document_id: int,
+        chunks: List[Dict],
+        embeddings: List[Optional[List[float]]],
+        fingerprint: Optional[Dict]
+    ):
+        """기존 청크 교체 + 일괄 INSERT + 인덱싱 상태 갱신을 하나의 트랜잭션으로 처리 - 문서 (title, category) 반환"""
+        document = session.execute(
+            select(Document.title, Document.category).where(Document.id == document_id)
+        ).one()
+        
+        rows = [
+            {
+                "document_id": document_id,
+                "content": chunk["content"],
+                "chunk_index": index,
+                **self._embedding_columns(embedding),
+                "category": document.category,
+                "is_indexed": True,
+                "chunk_metadata": json.dumps(
+                    {"start": chunk["start"], "end": chunk["end"], **chunk.get("metadata", {})},
+                    ensure_ascii=False
+                ),
+                "created_at": datetime.utcnow()
+            }
+            for index, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+        ]
+        
+        session.execute(
+            delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
+        )
+        session.execute(insert(DocumentChunk), rows)
+        session.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(is_indexed=True, **(fingerprint or {}))
+        )
+        session.commit()
+        return document
+
+    @staticmethod
+    async def _iter_segments(content: Union[str, AsyncIterable[str]]) -> AsyncIterator[str]:
+        """문자열과 비동기 텍스트 스트림을 같은 방식으로 순회"""
+        if isinstance(content, str):
+            yield content
+            return
+        async for segment in content:
+            yield segment
+
+    def _content_hash(self, content: str) -> str:
+        """임베딩 캐시 키 - sha256(모델명 + 청크 텍스트)"""
+        return hashlib.sha256(f"{self.embedding_cache_model}\n{content}".encode("utf-8")).hexdigest()
+
+    async def _embed_chunks(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        임베딩 캐시를 거쳐 청크 임베딩
+        캐시에 없는 텍스트만 임베딩 API로 계산한 뒤 캐시에 저장
+        """
+        hashes = [self._content_hash(content) for content in texts]
+        cached: Dict[str, List[float]] = await asyncio.to_thread(
+            self._run_in_new_session, self._query_cached_embeddings, list(dict.fromkeys(hashes))
+        )
+        
+        # 캐시 미스 텍스트만 (중복 제거 후) 임베딩
+        missing = {}
+        for content_hash, content in zip(hashes, texts):
+            if content_hash not in cached and content_hash not in missing:
+                missing[content_hash] = content
+        
+        if missing:
+            vectors = await self._embed_texts(list(missing.values()))
+            new_rows = [
+                {
+                    "content_hash": content_hash,
+                    "model": self.embedding_cache_model,
+                    "embedding": vector,
+                    "created_at": datetime.utcnow()
+                }
+                for content_hash, vector in zip(missing.keys(), vectors)
+                if vector is not None
+            ]
+            if new_rows:
+                await asyncio.to_thread(self._run_in_new_session, self._store_cached_embeddings, new_rows)
+            cached.update({row["content_hash"]: row["embedding"] for row in new_rows})
+        
+        print(f"🧠 임베딩 캐시: 재사용 {len(texts) - len(missing)}개, 신규 계산 {len(missing)}개")
+        return [cached.get(content_hash) for content_hash in hashes]
+
+    @staticmethod
+    def _query_cached_embeddings(session: Session, unique_hashes: List[str]) -> Dict[str, List[float]]:
+        """임베딩 캐시 조회 (IN 목록은 1000개씩)"""
+        cached = {}
+        for batch_start in range(0, len(unique_hashes), 1000):
+            rows = session.execute(
+                select(EmbeddingCache.content_hash, EmbeddingCache.embedding)
+                .where(EmbeddingCache.content_hash.in_(unique_hashes[batch_start:batch_start + 1000]))
+            ).fetchall()
+            cached.update({row.content_hash: row.embedding for row in rows})
+        return cached
+
+    @staticmethod
+    def _store_cached_embeddings(session: Session, rows: List[Dict]):
+        """새로 계산한 임베딩을 캐시에 저장 (동시 인덱싱으로 이미 있는 키는 무시)"""
+        session.execute(
+            pg_insert(EmbeddingCache)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["content_hash"])
+        )
+        session.commit()
+
+    async def _embed_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        텍스트 목록을 배치 단위로 임베딩
+        API 키가 없거나 호출이 실패한 배치는 None으로 채움 (키워드 검색으로 대체)
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        if not self.ai_provider.is_configured or not texts:
+            return embeddings
+        
+        for batch_start in range(0, len(texts), self.embedding_batch_size):
+            batch = texts[batch_start:batch_start + self.embedding_batch_size]
+            try:
+                vectors = await self.ai_provider.embeddings(batch, model=self.embedding_model)
+                embeddings[batch_start:batch_start + len(vectors)] = vectors
+            except Exception as e:
+                print(f"Embedding API error (batch {batch_start}): {e}")
+        
+        return embeddings
+
+    async def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        mode: Optional[str] = None,
+        category: str = "RAG"
+    ) -> List[Dict]:
+        """
+        유사도 검색
+        
+        Args:
+            query: 검색 질의
+            k: 반환할 청크 수
+            mode: 검색 모드 (기본값: settings.RAG_SEARCH_MODE)
+                - vector: pgvector 코사인 거리 k-NN 검색
+                - lexical: pg_trgm 트라이그램 유사도 검색 (GIN 인덱스)
+                - hybrid: 트라이그램 + 벡터 검색을 동시에 실행하고 RRF로 결합
+                - keyword: 제목/내용 키워드 검색
+                - auto: 벡터 → 트라이그램 → 키워드 순으로 결과가 나올 때까지 대체
+            category: 검색할 문서 카테고리 (청크의 비정규화 컬럼으로 각 검색 쿼리 안에서 필터링)
+        
+        RAG_RERANK_ENABLED이면 RAG_RERANK_CANDIDATES개 후보를 가져와 재순위화한 뒤 상위 k개 반환
+        단계별 소요 시간은 self.stage_timings에 누적 (요청마다 호출하는 쪽에서 초기화)
+        (retrieval 전체, 그 안의 query_embedding / vector_query / lexical_query / keywords / keyword_query, rerank)
+        """
+        rerank = settings.RAG_RERANK_ENABLED
+        candidates = max(k, settings.RAG_RERANK_CANDIDATES) if rerank else k
+        
+        with self._timed("retrieval"):
+            results = await self._retrieve(query, candidates, mode or settings.RAG_SEARCH_MODE, category)
+        
+        if not rerank:
+            return results
+        
+        rerank_started = time.perf_counter()
+        with self._timed("rerank"):
+            reranked = reranker.rerank(query, results, k)
+        rerank_ms = (time.perf_counter() - rerank_started) * 1000
+        print(f"🔀 재순위화: {len(results)}개 후보 → {len(reranked)}개 ({rerank_ms:.1f}ms)")
+        return reranked
+
+    async def _retrieve(self, query: str, k: int, mode: str, category: str) -> List[Dict]:
+        """검색 모드별 1차 검색"""
+        if mode == "hybrid":
+            return await self.hybrid_search(query, k, category)
+        
+        if mode in ("auto", "vector"):
+            results = await self._vector_search(query, k, category)
+            if results or mode == "vector":
+                return results
+        
+        if mode in ("auto", "lexical"):
+            results = await self._lexical_search(query, k, category)
+            if results or mode == "lexical":
+                return results
+        
+        return await self._keyword_search(query, k, category)
+
+    async def hybrid_search(self, query: str, k: int = 5, category: str = "RAG") -> List[Dict]:
+        """
+        하이브리드 검색 - 트라이그램(lexical) 검색과 벡터 검색을 동시에 실행하고
+        Reciprocal Rank Fusion(RRF)으로 하나의 순위 목록으로 결합
+        
+        각 결과의 similarity는 RRF 점수이며, scores/ranks에 검색 경로별 점수와 순위를 포함
+        """
+        candidates = max(k, settings.RAG_HYBRID_CANDIDATES)
+        
+        async def vector_leg() -> List[Dict]:
+            embedding = await self._embed_query(query)
+            if embedding is None:
+                return []
+            return await self._nearest_chunks(embedding, candidates, category)
+        
+        async def lexical_leg() -> List[Dict]:
+            with self._timed("lexical_query"):
+                return await asyncio.to_thread(
+                    self._run_in_new_session, self._query_lexical_chunks, query, candidates, category
+                )
+        
+        legs = {"lexical": lexical_leg(), "vector": vector_leg()}
+        leg_results = await asyncio.gather(*legs.values(), return_exceptions=True)
+        
+        ranked_lists = {}
+        for leg_name, leg_result in zip(legs.keys(), leg_results):
+            if isinstance(leg_result, Exception):
+                print(f"❌ 하이브리드 검색 {leg_name} 오류: {leg_result}")
+                leg_result = []
+            ranked_lists[leg_name] = leg_result
+        
+        fused = self._reciprocal_rank_fusion(ranked_lists, settings.RAG_RRF_K)
+        leg_summary = ", ".join(f"{leg_name} {len(docs)}개" for leg_name, docs in ranked_lists.items())
+        print(f"✅ 하이브리드 검색: {leg_summary} → {len(fused[:k])}개 청크")
+        return fused[:k]
+
+    @staticmethod
+    def _reciprocal_rank_fusion(ranked_lists: Dict[str, List[Dict]], rrf_k: int) -> List[Dict]:
+        """RRF 점수(Σ 1 / (rrf_k + rank))로 여러 순위 목록을 결합"""
+        fused: Dict[tuple, Dict] = {}
+        
+        for leg_name, docs in ranked_lists.items():
+            for rank, doc in enumerate(docs, start=1):
+                key = (doc["document_id"], doc["chunk_index"])
+                if key not in fused:
+                    fused[key] = {
+                        "title": doc["title"],
+                        "content": doc["content"],
+                        "similarity": 0.0,
+                        "document_id": doc["document_id"],
+                        "chunk_index": doc["chunk_index"],
+                        "scores": {name: None for name in ranked_lists},
+                        "ranks": {name: None for name in ranked_lists}
+                    }
+                fused[key]["similarity"] += 1.0 / (rrf_k + rank)
+                fused[key]["scores"][leg_name] = doc["similarity"]
+                fused[key]["ranks"][leg_name] = rank
+        
+        return sorted(fused.values(), key=lambda doc: doc["similarity"], reverse=True)
+
+    @staticmethod
+    def _run_in_new_session(query_fn, *args):
+        """별도 DB 세션에서 함수 실행 (asyncio.to_thread로 이벤트 루프 밖에서 실행 - 검색 병렬화/인덱싱 저장용)"""
+        with Session(engine) as session:
+            return query_fn(session, *args)
+
+    async def _vector_search(self, query: str, k: int, category: str) -> List[Dict]:
+        """pgvector HNSW 인덱스를 이용한 코사인 거리 k-NN 검색"""
+        try:
+            embedding = await self._embed_query(query)
+            if embedding is None:
+                return []
+            
+            results = await self._nearest_chunks(embedding, k, category)
+            print(f"✅ 벡터 검색으로 {len(results)}개 청크 발견")
+            return results
+            
+        except Exception as e:
+            print(f"❌ 벡터 검색 오류: {e}")
+            return []
+
+    async def _nearest_chunks(self, embedding: List[float], k: int, category: str) -> List[Dict]:
+        """코사인 거리 상위 k개 청크 - 메모리 벡터 인덱스가 로드되어 있으면 DB 대신 사용"""
+        if vector_index.loaded:
+            with self._timed("vector_memory"):
+                return await asyncio.to_thread(vector_index.search, embedding, k, category)
+        
+        with self._timed("vector_query"):
+            return await asyncio.to_thread(
+                self._run_in_new_session, self._query_vector_chunks, embedding, k, category
+            )
+
+    @staticmethod
+    def _embedding_columns(embedding: Optional[List[float]]) -> Dict:
+        """EMBEDDING_STORAGE에 맞춰 청크 임베딩 컬럼 값 구성"""
+        if settings.EMBEDDING_STORAGE == "vector":
+            return {"embedding": embedding}
+        if settings.EMBEDDING_STORAGE == "halfvec":
+            return {
+                "embedding": embedding if settings.EMBEDDING_KEEP_FULL_PRECISION else None,
+                "embedding_half": embedding
+            }
+        raise ValueError(f"Unsupported EMBEDDING_STORAGE: {settings.EMBEDDING_STORAGE}")
+
+    def _query_vector_chunks(self, session: Session, embedding: List[float], k: int, category: str) -> List[Dict]:
+        """
+        코사인 거리 기준 상위 k개 청크 조회
+        카테고리/인덱싱 필터를 청크 컬럼으로 ANN 탐색 안에서 적용하고 (RAG는 부분 HNSW 인덱스 사용),
+        문서 제목은 상위 k개에 대해서만 조인
+        halfvec 저장 시 float16 인덱스로 후보를 넓게 찾은 뒤 float32 임베딩으로 재채점
+        """
+        if settings.EMBEDDING_STORAGE == "halfvec":
+            column, vector_type = "embedding_half", "halfvec"
+            rescore = settings.EMBEDDING_KEEP_FULL_PRECISION and settings.RAG_RESCORE_CANDIDATES > 0
+        elif settings.EMBEDDING_STORAGE == "vector":
+            column, vector_type, rescore = "embedding", "vector", False
+        else:
+            raise ValueError(f"Unsupported EMBEDDING_STORAGE: {settings.EMBEDDING_STORAGE}")
+        
+        candidates = max(k, settings.RAG_RESCORE_CANDIDATES) if rescore else k
+        # float32 임베딩이 없는 행(마이그레이션 중 등)은 float16 거리 유지
+        distance = (
+            "COALESCE(ann.embedding <=> CAST(:embedding AS vector), ann.distance)"
+            if rescore else "ann.distance"
+        )
+        
+        vector_query = f"""
+            WITH ann AS (
+                SELECT 
+                    dc.document_id,
+                    dc.content,
+                    dc.chunk_index,
+                    dc.embedding,
+                    dc.{column} <=> CAST(:embedding AS {vector_type}) as distance
+                FROM document_chunks dc
+                WHERE dc.category = :category AND dc.is_indexed
+                AND dc.{column} IS NOT NULL
+                ORDER BY dc.{column} <=> CAST(:embedding AS {vector_type})
+                LIMIT :candidates
+            ),
+            nearest AS (
+                SELECT 
+                    ann.document_id,
+                    ann.content,
+                    ann.chunk_index,
+                    {distance} as distance
+                FROM ann
+                ORDER BY distance
+                LIMIT :k
+            )
+            SELECT 
+                nearest.content,
+                nearest.chunk_index,
+                d.title,
+                d.category,
+                d.id as document_id,
+                nearest.distance
+            FROM nearest
+            JOIN documents d ON nearest.document_id = d.id
+            ORDER BY nearest.distance
+        """
+        
+        # HNSW 탐색 후보 수(ef_search, 기본 40)가 후보 수보다 작으면 결과가 적게 반환됨
+        session.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {"ef_search": str(max(40, candidates))}
+        )
+        result = session.execute(
+            text(vector_query),
+            {
+                "embedding": self._to_vector_literal(embedding),
+                "candidates": candidates,
+                "k": k,
+                "category": category
+            }
+        ).fetchall()
+        
+        return [
+            {
+                "title": row.title,
+                "content": row.content,
+                "similarity": 1.0 - float(row.distance),
+                "distance": float(row.distance),
+                "document_id": row.document_id,
+                "chunk_index": row.chunk_index
+            }
+            for row in result
+        ]
+
+    async def _lexical_search(self, query: str, k: int, category: str) -> List[Dict]:
+        """pg_trgm 트라이그램 검색 - 임베딩을 사용할 수 없을 때의 대체 경로"""
+        try:
+            with self._timed("lexical_query"):
+                results = await asyncio.to_thread(
+                    self._run_in_new_session, self._query_lexical_chunks, query, k, category
+                )
+            print(f"✅ 트라이그램 검색으로 {len(results)}개 청크 발견")
+            return results
+            
+        except Exception as e:
+            print(f"❌ 트라이그램 검색 오류: {e}")
+            return []
+
+    def _query_lexical_chunks(self, session: Session, query: str, k: int, category: str) -> List[Dict]:
+        """
+        트라이그램 유사도 상위 k개 청크 조회
+        `query <% column` 조건은 GIN(gin_trgm_ops) 인덱스를 사용하며,
+        word_similarity 값을 실제 유사도 점수로 반환
+        """
+        lexical_query = """
+            WITH content_hits AS (
+                SELECT dc.id as chunk_id, word_similarity(:query, dc.content) as score
+                FROM document_chunks dc
+                WHERE dc.category = :category AND dc.is_indexed
+                AND :query <% dc.content
+            ),
+            title_hits AS (
+                SELECT dc.id as chunk_id, word_similarity(:query, d.title) as score
+                FROM documents d
+                JOIN document_chunks dc ON dc.document_id = d.id
+                WHERE d.category = :category AND d.is_indexed
+                AND :query <% d.title
+            ),
+            hits AS (
+                SELECT chunk_id, MAX(score) as score
+                FROM (
+                    SELECT chunk_id, score FROM content_hits
+                    UNION ALL
+                    SELECT chunk_id, score FROM title_hits
+                ) all_hits
+                GROUP BY chunk_id
+            )
+            SELECT 
+                dc.content,
+                dc.chunk_index,
+                d.title,
+                d.category,
+                d.id as document_id,
+                hits.score as similarity
+            FROM hits
+            JOIN document_chunks dc ON dc.id = hits.chunk_id
+            JOIN documents d ON dc.document_id = d.id
+            ORDER BY hits.score DESC, d.upload_date DESC
+            LIMIT :k
+        """
+        
+        # 트랜잭션 범위에서만 word_similarity 임계값 적용
+        session.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(settings.RAG_LEXICAL_THRESHOLD)}
+        )
+        result = session.execute(
+            text(lexical_query),
+            {"query": query, "k": k, "category": category}
+        ).fetchall()
+        
+        return [
+            {
+                "title": row.title,
+                "content": row.content,
+                "similarity": float(row.similarity),
+                "document_id": row.document_id,
+                "chunk_index": row.chunk_index
+            }
+            for row in result
+        ]
+
+    async def _embed_query(self, query: str) -> Optional[List[float]]:
+        """질의 임베딩 (같은 서비스 인스턴스 안에서는 질의당 한 번만 호출)"""
+        if query not in self._query_embeddings:
+            with self._timed("query_embedding"):
+                self._query_embeddings[query] = (await self._embed_texts([query]))[0]
+        return self._query_embeddings[query]
+
+    @staticmethod
+    def _to_vector_literal(embedding: List[float]) -> str:
+        """pgvector 입력 형식 문자열로 변환"""
+        return "[" + ",".join(str(value) for value in embedding) + "]"
+
+    async def _keyword_search(self, query: str, k: int, category: str) -> List[Dict]:
+        """키워드 기반 검색 (별도 세션/스레드에서 실행)"""
+        return await asyncio.to_thread(
+            self._run_in_new_session, self._query_keyword_chunks, query, k, category
+        )
+
+    def _query_keyword_chunks(self, session: Session, query: str, k: int, category: str) -> List[Dict]:
+        """키워드 기반 검색 - 신입사원 온보딩용 개선"""
         try:
             print(f"🔍 RAG 검색 시작: {query}")
             
-            # 1. 제목 우선 검색 (정확한 매칭)
-            title_query = f"""
+            # 1. 제목 매칭 - 질의 전체, 추출 키워드, 대출 키워드를 한 번의 쿼리로 검색
+            # 후보 용어 순서가 우선순위 (질의 전체 → 추출 키워드 → 대출 키워드)
+            with self._timed("keywords"):
+                terms = [query] + self._extract_keywords(query)
+            if any(word in query.lower() for word in ["대출", "상품", "추천", "상담"]):
+                terms += ["가계대출", "주택담보대출", "전월세보증금대출", "개인대출", "신용대출"]
+            terms = list(dict.fromkeys(terms))
+            
+            title_query = """
+                WITH terms AS (
+                    SELECT term, ord
+                    FROM unnest(CAST(:terms AS text[])) WITH ORDINALITY AS t(term, ord)
+                ),
+                matched_documents AS (
+                    SELECT 
+                        d.id,
+                        d.title,
+                        d.upload_date,
+                        (array_agg(terms.term ORDER BY terms.ord))[1] as matched_term,
+                        MIN(terms.ord) as term_rank,
+                        COUNT(*) as match_count
+                    FROM documents d
+                    JOIN terms ON d.title ILIKE '%' || terms.term || '%'
+                    WHERE d.is_indexed = true AND d.category = :category
+                    GROUP BY d.id, d.title, d.upload_date
+                )
                 SELECT 
                     dc.content,
                     dc.chunk_index,
-                    d.title,
-                    d.category,
-                    d.id as document_id,
+                    md.title,
+                    md.id as document_id,
+                    md.matched_term,
+                    md.match_count,
                     1.0 as similarity
-                FROM document_chunks dc
-                JOIN documents d ON dc.document_id = d.id
-                WHERE d.is_indexed = true AND d.category = 'RAG'
-                AND d.title ILIKE :query
-                ORDER BY d.upload_date DESC
+                FROM matched_documents md
+                JOIN document_chunks dc ON dc.document_id = md.id
+                ORDER BY md.term_rank, md.match_count DESC, md.upload_date DESC, dc.chunk_index
                 LIMIT :k
             """
             
-            result = self.session.execute(
-                text(title_query), 
-                {"query": f"%{query}%", "k": k}
-            ).fetchall()
+            with self._timed("keyword_query"):
+                result = session.execute(
+                    text(title_query),
+                    {"terms": terms, "k": k, "category": category}
+                ).fetchall()
             
             if result:
-                print(f"✅ 제목 매칭으로 {len(result)}개 문서 발견")
+                print(f"✅ 제목 매칭 ('{result[0].matched_term}')으로 {len(result)}개 문서 발견")
                 return [
                     {
                         "title": row.title,
                         "content": row.content,
                         "similarity": row.similarity,
                         "document_id": row.document_id,
-                        "chunk_index": row.chunk_index
+                        "chunk_index": row.chunk_index,
+                        "matched_term": row.matched_term,
+                        "match_count": row.match_count
                     }
                     for row in result
                 ]
             
-            # 2. 키워드별 개별 검색
-            keywords = self._extract_keywords(query)
-            print(f"🔍 키워드 검색: {keywords}")
-            
-            for keyword in keywords:
-                result = self.session.execute(
-                    text(title_query), 
-                    {"query": f"%{keyword}%", "k": k}
-                ).fetchall()
-                
-                if result:
-                    print(f"✅ 키워드 '{keyword}'로 {len(result)}개 문서 발견")
-                    return [
-                        {
-                            "title": row.title,
-                            "content": row.content,
-                            "similarity": row.similarity,
-                            "document_id": row.document_id,
-                            "chunk_index": row.chunk_index
-                        }
-                        for row in result
-                    ]
-            
-            # 3. 추가 키워드 검색 (대출 관련)
-            if any(word in query.lower() for word in ["대출", "상품", "추천", "상담"]):
-                loan_keywords = ["가계대출", "주택담보대출", "전월세보증금대출", "개인대출", "신용대출"]
-                for loan_keyword in loan_keywords:
-                    result = self.session.execute(
-                        text(title_query), 
-                        {"query": f"%{loan_keyword}%", "k": k}
-                    ).fetchall()
-                    
-                    if result:
-                        print(f"✅ 대출 키워드 '{loan_keyword}'로 {len(result)}개 문서 발견")
-                        return [
-                            {
-                                "title": row.title,
-                                "content": row.content,
-                                "similarity": row.similarity,
-                                "document_id": row.document_id,
-                                "chunk_index": row.chunk_index
-                            }
-                            for row in result
-                        ]
-            
-            # 4. 내용 기반 검색 (마지막 시도)
-            content_query = f"""
+            # 2. 내용 기반 검색 (마지막 시도)
+            content_query = """
                 SELECT 
                     dc.content,
                     dc.chunk_index,
@@ -117,23 +702,24 @@ class RAGService:
                     0.8 as similarity
                 FROM document_chunks dc
                 JOIN documents d ON dc.document_id = d.id
-                WHERE d.is_indexed = true AND d.category = 'RAG'
+                WHERE dc.category = :category AND dc.is_indexed
                 AND dc.content ILIKE :query
                 ORDER BY d.upload_date DESC
                 LIMIT :k
             """
             
-            result = self.session.execute(
-                text(content_query), 
-                {"query": f"%{query}%", "k": k}
-            ).fetchall()
+            with self._timed("keyword_query"):
+                result = session.execute(
+                    text(content_query), 
+                    {"query": f"%{query}%", "k": k, "category": category}
+                ).fetchall()
             
             if result:
                 print(f"✅ 내용 검색으로 {len(result)}개 문서 발견")
                 return [
                     {
                         "title": row.title,
-                    "content": row.content,
+                        "content": row.content,
                         "similarity": row.similarity,
                         "document_id": row.document_id,
                         "chunk_index": row.chunk_index
@@ -146,91 +732,45 @@ class RAGService:
             
         except Exception as e:
             print(f"❌ RAG 검색 오류: {e}")
+            session.rollback()
             return []
 
     def _extract_keywords(self, question: str) -> List[str]:
-        """질문에서 키워드 추출 - 신입사원 온보딩용"""
-        # 신입사원이 자주 묻는 키워드들
-        onboarding_keywords = {
-            "대출": ["대출", "가계대출", "주택담보대출", "전월세보증금대출", "기업대출", "대환대출", "신용대출"],
-            "상품": ["상품", "상품설명서", "상품안내"],
-            "고객": ["고객", "70대", "연령", "나이"],
-            "추천": ["추천", "상담", "문의"],
-            "금리": ["금리", "이자", "수수료"],
-            "약관": ["약관", "기본약관", "특약", "이용약관"],
-            "양식": ["양식", "서식", "신청서", "위임장", "확인서", "해촉증명서", "이의신청서"],
-            "증명서": ["증명서", "해촉증명서", "소득증명서", "재직증명서"],
-            "신청서": ["신청서", "이의신청서", "대출신청서", "계좌신청서", "피해구제신청서"],
-            "약정서": ["약정서", "신용보증약정서", "대출약정서", "대출거래약정서"],
-            "동의서": ["동의서", "개인정보동의서", "제3자제공동의서", "개인정보수집동의서"],
-            "안내": ["안내", "고객권리안내문", "대출만기안내", "대출만기경과안내"],
-            "상황표": ["상황표", "수신거래상황표", "여신거래상황표"],
-            "계좌": ["계좌", "증권계좌", "계좌개설", "증권계좌개설", "계좌신청", "계좌통합관리"],
-            "증권": ["증권", "증권계좌", "증권계좌개설", "증권서비스", "증권계좌개설서비스"],
-            "예금": ["예금", "입출금이자유로운예금", "적립식예금", "거치식예금", "외화예금"],
-            "전자금융": ["전자금융", "전자금융거래", "모바일뱅킹", "이체한도", "오픈뱅킹"],
-            "보이스피싱": ["보이스피싱", "피해구제", "전기통신금융사기", "피해구제신청서"],
-            "신용보증": ["신용보증", "신용보증약정서", "신용보증서", "보증채무이행청구서"],
-            "체크카드": ["체크카드", "교통카드", "후불교통카드"],
-            "모임통장": ["모임통장", "모임통장서비스"],
-            "햇살론": ["햇살론", "햇살론뱅크"],
-            "전세지킴": ["전세지킴", "전세지킴보증약관"]
-        }
-        
-        keywords = []
-        question_lower = question.lower()
-        
-        # 질문에서 키워드 찾기
-        for category, words in onboarding_keywords.items():
-            for word in words:
-                if word in question_lower:
-                    keywords.extend(words)
-                    break
-        
-        # 중복 제거하고 상위 8개만 반환 (더 많은 키워드로 검색)
-        unique_keywords = list(set(keywords))
-        print(f"🔍 추출된 키워드: {unique_keywords}")
-        return unique_keywords[:8]
+        """
+        질문에서 키워드 추출 - 신입사원 온보딩용
+        키워드 사전(data/rag_keywords.json)으로 빌드한 Aho-Corasick 매처를 사용하며,
+        사전 우선순위 순서로 상위 8개 반환
+        """
+        keywords = keyword_matcher.extract(question, limit=8)
+        print(f"🔍 추출된 키워드: {keywords}")
+        return keywords
     
-    def _call_gpt(self, prompt: str) -> str:
-        """GPT API 직접 호출"""
+    @staticmethod
+    def _gpt_messages(prompt: str) -> List[Dict]:
+        """GPT 호출 메시지 구성"""
+        return [
+            {"role": "system", "content": "당신은 은행 온보딩 어시스턴트입니다. 🐻"},
+            {"role": "user", "content": prompt}
+        ]
+
+    async def _call_gpt(self, prompt: str) -> str:
+        """GPT API 호출 (공용 비동기 LLM 클라이언트 사용)"""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": "gpt-3.5-turbo",
-                "messages": [
-                    {"role": "system", "content": "당신은 은행 온보딩 어시스턴트입니다. 🐻"},
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": 1000,
-                "temperature": 0.7
-            }
-            
-            import requests
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30
+            return await self.ai_provider.chat_completion(
+                self._gpt_messages(prompt),
+                max_tokens=1000,
+                temperature=0.7
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
-            else:
-                print(f"OpenAI API error: {response.status_code} - {response.text}")
-                return "죄송합니다. 일시적인 오류가 발생했습니다."
-                
+        except httpx.HTTPStatusError as e:
+            print(f"OpenAI API error: {e.response.status_code} - {e.response.text}")
+            return GPT_ERROR_MESSAGE
         except Exception as e:
             print(f"GPT API call error: {e}")
-            return "죄송합니다. 일시적인 오류가 발생했습니다."
+            return GPT_ERROR_MESSAGE
 
     async def generate_rag_answer(self, question: str) -> Dict:
-        """RAG 답변 생성 메서드 - 완전 수정"""
+        """RAG 답변 생성 메서드 - 검색 → 프롬프트 구성 → GPT 호출 → 후처리 (단계별 시간 기록)"""
+        started = time.perf_counter()
         try:
             # 유사도 검색으로 관련 문서 찾기
             similar_docs = await self.similarity_search(question, k=5)
@@ -239,21 +779,124 @@ class RAGService:
             if not similar_docs:
                 # 관련 문서가 없으면 일반 GPT 답변
                 print("관련 문서 없음 - 일반 GPT 답변 생성")
-                answer = self._call_gpt(f"질문: {question}\n\n은행 업무에 관련된 답변을 해주세요.")
-                return {
-                    "answer": answer,
-                    "sources": [],
-                    "response_time": 0.0
-                }
             
-            # 컨텍스트 구성
-            context = "\n\n".join([
-                f"[{doc['title']}]\n{doc['content']}"
-                for doc in similar_docs
-            ])
+            result = await self._answer_from_docs(question, similar_docs)
+            return {**result, "response_time": round(time.perf_counter() - started, 3)}
+            
+        except Exception as e:
+            print(f"Generate RAG answer error: {e}")
+            return {
+                "answer": ANSWER_ERROR_MESSAGE,
+                "sources": [],
+                "response_time": round(time.perf_counter() - started, 3),
+                "failed": True
+            }
+
+    async def _answer_from_docs(
+        self,
+        question: str,
+        similar_docs: List[Dict],
+        llm_semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Dict:
+        """검색 결과로 프롬프트 구성 → GPT 호출 (llm_semaphore가 있으면 그 안에서) → 후처리"""
+        with self._timed("prompt"):
+            prompt = self._build_prompt(question, similar_docs)
+        
+        if llm_semaphore is not None:
+            async with llm_semaphore:
+                with self._timed("llm"):
+                    answer = await self._call_gpt(prompt)
+        else:
+            with self._timed("llm"):
+                answer = await self._call_gpt(prompt)
+        failed = answer == GPT_ERROR_MESSAGE
+        
+        with self._timed("postprocess"):
+            # 토스뱅크를 하경은행으로 변경
+            answer = answer.replace("토스뱅크", "하경은행")
+            
+            # 참고자료를 답변에 추가 (중복 제거)
+            sources = self._build_sources(similar_docs)
+            answer += self._format_sources_footer(sources)
+        
+        return {
+            "answer": answer,
+            "sources": sources,
+            "failed": failed
+        }
+
+    async def stream_rag_answer(self, question: str, include_timings: bool = False) -> AsyncIterator[Dict]:
+        """
+        스트리밍 RAG 답변 생성
+        검색된 참고자료(sources) → 답변 토큰(token) → 참고 자료 목록(token) → 완료(done) 순으로 이벤트 생성
+        include_timings이면 done 이벤트에 단계별 소요 시간(ms) 포함 (llm_first_token: 첫 토큰까지)
+        """
+        started = time.perf_counter()
+        self.stage_timings = {}
+        try:
+            similar_docs = await self.similarity_search(question, k=5)
+            print(f"RAG 검색 결과: {len(similar_docs)}개 문서 발견")
+            
+            sources = self._build_sources(similar_docs)
+            yield {"event": "sources", "data": sources}
+            
+            # 토큰 경계에서 잘린 "토스뱅크"도 치환할 수 있도록 마지막 몇 글자는 보류 후 전송
+            holdback = len("토스뱅크") - 1
+            pending = ""
+            with self._timed("prompt"):
+                messages = self._gpt_messages(self._build_prompt(question, similar_docs))
+            
+            llm_started = time.perf_counter()
+            async for delta in self.ai_provider.stream_chat_completion(
+                messages,
+                max_tokens=1000,
+                temperature=0.7
+            ):
+                if "llm_first_token" not in self.stage_timings:
+                    first_token = time.perf_counter() - llm_started
+                    self.stage_timings["llm_first_token"] = round(first_token * 1000, 1)
+                    rag_stage_seconds.observe(first_token, stage="llm_first_token")
+                pending = (pending + delta).replace("토스뱅크", "하경은행")
+                if len(pending) > holdback:
+                    yield {"event": "token", "data": pending[:-holdback]}
+                    pending = pending[-holdback:]
+            
+            llm_elapsed = time.perf_counter() - llm_started
+            self.stage_timings["llm"] = round(llm_elapsed * 1000, 1)
+            rag_stage_seconds.observe(llm_elapsed, stage="llm")
             
-            # AI 하리보 신입사원 온보딩 프롬프트
-            prompt = f"""
+            footer = self._format_sources_footer(sources)
+            if pending or footer:
+                yield {"event": "token", "data": pending + footer}
+            
+            timings = self._finish_timings(started)
+            done = {"sources": sources}
+            if include_timings:
+                done["timings"] = timings
+            yield {"event": "done", "data": done}
+            
+        except Exception as e:
+            print(f"Stream RAG answer error: {e}")
+            yield {
+                "event": "error",
+                "data": {"message": ANSWER_ERROR_MESSAGE}
+            }
+
+    def _build_prompt(self, question: str, similar_docs: List[Dict]) -> str:
+        """검색 결과로 GPT 프롬프트 구성 (검색 결과가 없으면 일반 질문 프롬프트)"""
+        if not similar_docs:
+            return f"질문: {question}\n\n은행 업무에 관련된 답변을 해주세요."
+        
+        # 컨텍스트 구성 (점수 순, 인접 청크 중첩 제거, 토큰 예산 내)
+        context, context_stats = pack_context(similar_docs)
+        print(
+            f"📦 컨텍스트 구성: {context_stats['included']}/{context_stats['candidates']}개 청크, "
+            f"{context_stats['tokens']}/{context_stats['token_budget']} 토큰 "
+            f"(중첩 제거 {context_stats['overlap_tokens_removed']} 토큰)"
+        )
+        
+        # AI 하리보 신입사원 온보딩 프롬프트
+        return f"""
 당신은 AI 하리보입니다. 🐻 신입사원 온보딩을 도와주는 친근한 은행 어시스턴트예요.
 
 다음 검색 컨텍스트를 기반으로 답변하세요:
@@ -306,68 +949,190 @@ class RAGService:
 
 답변:
 """
-            
-            answer = self._call_gpt(prompt)
-            
-            # 토스뱅크를 하경은행으로 변경
-            answer = answer.replace("토스뱅크", "하경은행")
-            
-            # 참고자료 구성 - 임시로 모든 문서 포함 (디버깅용)
-            sources = []
-            for doc in similar_docs:
-                sources.append({
-                    "title": doc["title"],
-                    "content": doc["content"][:200] + "..." if len(doc["content"]) > 200 else doc["content"]
-                })
-            
-            # 참고자료를 답변에 추가 (중복 제거)
-            if sources:
-                # 중복 제거 (title 기준)
-                unique_sources = []
-                seen_titles = set()
-                for source in sources:
-                    if source['title'] not in seen_titles:
-                        unique_sources.append(source)
-                        seen_titles.add(source['title'])
-                
-                if unique_sources:
-                    answer += "\n\n참고 자료:\n"
-                    for source in unique_sources:
-                        answer += f"\n• {source['title']}"
-                
-                # sources를 unique_sources로 업데이트
-                sources = unique_sources
-            
-            return {
-                "answer": answer,
-                "sources": sources,
-                "response_time": 0.0
-            }
-            
-        except Exception as e:
-            print(f"Generate RAG answer error: {e}")
-            return {
-                "answer": "앗, 잠깐만요! 🐻\n일시적인 오류가 발생했어요.\n잠시 후 다시 시도해주세요.",
-                "sources": [],
-                "response_time": 0.0
-            }
+
+    def _build_sources(self, similar_docs: List[Dict]) -> List[Dict]:
+        """참고자료 목록 구성 (제목 기준 중복 제거)"""
+        sources = []
+        seen_titles = set()
+        for doc in similar_docs:
+            if doc["title"] in seen_titles:
+                continue
+            seen_titles.add(doc["title"])
+            sources.append({
+                "title": doc["title"],
+                "content": doc["content"][:200] + "..." if len(doc["content"]) > 200 else doc["content"]
+            })
+        return sources
+
+    @staticmethod
+    def _format_sources_footer(sources: List[Dict]) -> str:
+        """답변 끝에 붙는 참고 자료 목록"""
+        if not sources:
+            return ""
+        return "\n\n참고 자료:\n" + "".join(f"\n• {source['title']}" for source in sources)
 
     async def process_query(self, question: str) -> Dict:
-        """쿼리 처리 메인 메서드"""
+        """
+        쿼리 처리 메인 메서드
+        동일한 질문(정규화 기준, 같은 코퍼스 버전)이 처리 중이면 그 결과를 함께 사용
+        """
+        key = (normalize_question(question), corpus_version)
+        result, coalesced = await query_flight.do(key, lambda: self._answer_query(question))
+        if coalesced:
+            print(f"🔗 동일 질문 병합: {question}")
+        return {**result, "coalesced": coalesced}
+
+    async def _answer_query(self, question: str) -> Dict:
+        """
+        시맨틱 캐시 적중 시 저장된 답변 반환, 아니면 RAG 답변 생성 후 캐시
+        결과의 timings에 단계별 소요 시간(ms) 포함
+        """
+        started = time.perf_counter()
+        self.stage_timings = {}
         try:
+            query_embedding = None
+            if settings.SEMANTIC_CACHE_ENABLED:
+                query_embedding = await self._embed_query(question)
+                if query_embedding is not None:
+                    with self._timed("cache_lookup"):
+                        cached = answer_cache.get(query_embedding)
+                    if cached is not None:
+                        print(f"⚡ 시맨틱 캐시 적중: {question}")
+                        return {
+                            **cached,
+                            "response_time": round(time.perf_counter() - started, 3),
+                            "cached": True,
+                            "timings": self._finish_timings(started)
+                        }
+            
             # RAG 답변 생성
             result = await self.generate_rag_answer(question)
             
-            return {
+            response = {
                 "answer": result["answer"],
                 "sources": result.get("sources", []),
-                "response_time": result.get("response_time", 0.0)
+                "response_time": round(time.perf_counter() - started, 3),
+                "cached": False
             }
             
+            # 오류 응답은 캐시하지 않음
+            if query_embedding is not None and not result.get("failed"):
+                answer_cache.set(query_embedding, {
+                    "answer": response["answer"],
+                    "sources": response["sources"]
+                })
+            
+            response["timings"] = self._finish_timings(started)
+            return response
+            
         except Exception as e:
             print(f"Process query error: {e}")
             return {
-                "answer": "앗, 잠깐만요! 🐻\n일시적인 오류가 발생했어요.\n잠시 후 다시 시도해주세요.",
+                "answer": ANSWER_ERROR_MESSAGE,
                 "sources": [],
-                "response_time": 0.0
+                "response_time": round(time.perf_counter() - started, 3),
+                "cached": False,
+                "timings": self._finish_timings(started)
             }
+
+    async def answer_batch(self, questions: List[str]) -> List[Dict]:
+        """
+        여러 질문 일괄 답변
+        - 정규화 기준으로 같은 질문은 한 번만 처리하고 결과 공유
+        - 질의 임베딩은 배치 임베딩 호출로 한 번에 계산 (EMBEDDING_BATCH_SIZE 단위)
+        - 검색은 CHAT_BATCH_RETRIEVAL_CONCURRENCY개까지 동시 실행 (검색 경로별 별도 DB 세션)
+        - GPT 호출은 CHAT_BATCH_LLM_CONCURRENCY개까지 동시 실행
+        반환: 입력 순서대로 질문별 결과 (status: ok / cached / error)
+        """
+        started = time.perf_counter()
+        
+        first_index: Dict[str, int] = {}
+        unique_questions: Dict[str, str] = {}
+        for index, question in enumerate(questions):
+            key = normalize_question(question)
+            if key not in unique_questions:
+                first_index[key] = index
+                unique_questions[key] = question
+        
+        # 1. 질의 임베딩 일괄 계산 (검색과 시맨틱 캐시에서 공용)
+        missing = [question for question in unique_questions.values() if question not in self._query_embeddings]
+        if missing:
+            with self._timed("query_embedding"):
+                embeddings = await self._embed_texts(missing)
+            self._query_embeddings.update(zip(missing, embeddings))
+        
+        retrieval_semaphore = asyncio.Semaphore(settings.CHAT_BATCH_RETRIEVAL_CONCURRENCY)
+        llm_semaphore = asyncio.Semaphore(settings.CHAT_BATCH_LLM_CONCURRENCY)
+        
+        async def answer_one(question: str) -> Dict:
+            # 질문별 단계 시간을 분리하기 위해 서비스 인스턴스를 따로 두고 임베딩 메모는 공유
+            item_service = RAGService(self.session)
+            item_service._query_embeddings = self._query_embeddings
+            item_started = time.perf_counter()
+            try:
+                embedding = self._query_embeddings.get(question)
+                use_cache = settings.SEMANTIC_CACHE_ENABLED and embedding is not None
+                
+                cached = answer_cache.get(embedding) if use_cache else None
+                if cached is not None:
+                    return {
+                        **cached,
+                        "status": "cached",
+                        "response_time": round(time.perf_counter() - item_started, 3),
+                        "timings": item_service.stage_timings
+                    }
+                
+                # 2. 검색 (동시 실행 수 제한)
+                async with retrieval_semaphore:
+                    similar_docs = await item_service.similarity_search(question, k=5)
+                
+                # 3. 프롬프트 구성 → GPT 호출 (동시 호출 수 제한) → 후처리
+                result = await item_service._answer_from_docs(question, similar_docs, llm_semaphore)
+                if not result["failed"] and use_cache:
+                    answer_cache.set(embedding, {"answer": result["answer"], "sources": result["sources"]})
+                
+                return {
+                    "status": "error" if result["failed"] else "ok",
+                    "answer": result["answer"],
+                    "sources": result["sources"],
+                    "error": GPT_ERROR_MESSAGE if result["failed"] else None,
+                    "response_time": round(time.perf_counter() - item_started, 3),
+                    "timings": item_service.stage_timings
+                }
+            
+            except Exception as e:
+                print(f"Batch answer error: {question} - {e}")
+                return {
+                    "status": "error",
+                    "answer": ANSWER_ERROR_MESSAGE,
+                    "sources": [],
+                    "error": str(e),
+                    "response_time": round(time.perf_counter() - item_started, 3),
+                    "timings": item_service.stage_timings
+                }
+        
+        answers = await asyncio.gather(*[answer_one(question) for question in unique_questions.values()])
+        answers_by_key = dict(zip(unique_questions.keys(), answers))
+        
+        results = []
+        for index, question in enumerate(questions):
+            key = normalize_question(question)
+            results.append({
+                "index": index,
+                "question": question,
+                **answers_by_key[key],
+                "duplicate_of": first_index[key] if first_index[key] != index else None
+            })
+        
+        failed = sum(1 for result in results if result["status"] == "error")
+        print(
+            f"📋 일괄 답변: {len(questions)}개 질문 (고유 {len(unique_questions)}개), "
+            f"실패 {failed}개, {time.perf_counter() - started:.1f}s"
+        )
+        return results
+
+    def _finish_timings(self, started: float) -> Dict[str, float]:
+        """전체 소요 시간(total)을 기록하고 단계별 소요 시간 사본 반환"""
+        elapsed = time.perf_counter() - started
+        rag_stage_seconds.observe(elapsed, stage="total")
+        return {**self.stage_timings, "total": round(elapsed * 1000, 1)}
@@ -3,16 +3,14 @@ RAG 기반 시뮬레이션 서비스
 제공된 데이터를 활용한 STT/LLM/TTS 기반 음성 시뮬레이션
 """
 import json
-import os
-import tempfile
 import base64
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from sqlmodel import Session, select
-import openai
 from pathlib import Path
 
 from app.models.user import User
+from app.services.ai_provider import get_ai_provider
 
 
 class RAGSimulationService:
@@ -20,16 +18,8 @@ class RAGSimulationService:
     
     def __init__(self, session: Session):
         self.session = session
-        # OpenAI 클라이언트 초기화 (API 키가 있을 때만)
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            try:
-                self.openai_client = openai.OpenAI(api_key=api_key)
-            except Exception as e:
-                print(f"OpenAI 클라이언트 초기화 실패: {e}")
-                self.openai_client = None
-        else:
-            self.openai_client = None
+        # AI 공급자 (settings.AI_PROVIDER - OpenAI 또는 오프라인 가짜 공급자)
+        self.ai_provider = get_ai_provider()
         
         # 데이터 파일 경로 설정 (Docker 컨테이너 내부 경로)
         self.data_path = Path("/app/data")
@@ -198,7 +188,7 @@ class RAGSimulationService:
         
         return situations
     
-    def start_voice_simulation(self, user_id: int, persona_id: str, scenario_id: str, gender: str = 'male') -> Dict:
+    async def start_voice_simulation(self, user_id: int, persona_id: str, scenario_id: str, gender: str = 'male') -> Dict:
         """음성 시뮬레이션 시작"""
         # 데이터가 없으면 로드
         if not self.personas_cache or not self.scenarios_cache:
@@ -235,11 +225,11 @@ class RAGSimulationService:
         # 성별 정보는 이미 페르소나 데이터에 포함되어 있으므로 추가하지 않음
         
         # 초기 고객 메시지 생성
-        initial_message_data = self._generate_initial_customer_message(persona, scenario)
+        initial_message_data = await self._generate_initial_customer_message(persona, scenario)
         
         # TTS로 음성 생성
         initial_text = initial_message_data.get("text", "안녕하세요, 도움이 필요합니다.")
-        initial_audio = self._text_to_speech(initial_text, persona)
+        initial_audio = await self._text_to_speech(initial_text, persona)
         
         initial_message = {
             "type": "customer",
@@ -270,7 +260,7 @@ class RAGSimulationService:
             "initial_message": initial_message
         }
     
-    def process_voice_interaction(self, session_data: Dict, audio_data: bytes, 
+    async def process_voice_interaction(self, session_data: Dict, audio_data: bytes, 
                                 user_message: str = "") -> Dict:
         """음성 상호작용 처리"""
         try:
@@ -310,7 +300,7 @@ class RAGSimulationService:
             # STT: 음성을 텍스트로 변환 (사용자가 제공한 텍스트가 있으면 우선 사용)
             if not user_message:
                 print(f"STT 처리 시작: 오디오 크기 {len(audio_data) if audio_data else 0} bytes")
-                transcribed_text = self._speech_to_text(audio_data)
+                transcribed_text = await self._speech_to_text(audio_data)
             else:
                 print(f"텍스트 입력: '{user_message}'")
                 transcribed_text = user_message
@@ -324,18 +314,18 @@ class RAGSimulationService:
             response_persona = actual_persona if actual_persona else persona
             response_scenario = actual_scenario if actual_scenario else scenario
             
-            customer_response = self._generate_customer_response_with_rag(
+            customer_response = await self._generate_customer_response_with_rag(
                 transcribed_text, response_persona, response_scenario
             )
             print(f"고객 응답: '{customer_response.get('text', '')}'")
             
             # TTS: 고객 응답을 음성으로 변환
             print("TTS 처리 시작")
-            customer_audio = self._text_to_speech(customer_response["text"], persona)
+            customer_audio = await self._text_to_speech(customer_response["text"], persona)
             print(f"TTS 완료: 오디오 길이 {len(customer_audio) if customer_audio else 0}")
             
             # 응답 평가
-            evaluation = self._evaluate_user_response(transcribed_text, persona, scenario)
+            evaluation = await self._evaluate_user_response(transcribed_text, persona, scenario)
             
             result = {
                 "transcribed_text": transcribed_text,
@@ -355,33 +345,26 @@ class RAGSimulationService:
             traceback.print_exc()
             raise
     
-    def _speech_to_text(self, audio_data: bytes) -> str:
+    async def _speech_to_text(self, audio_data: bytes) -> str:
         """음성을 텍스트로 변환 (STT) - whisper-1 사용"""
-        if not self.openai_client:
+        if not self.ai_provider.is_configured:
             return "OpenAI API 키가 설정되지 않았습니다."
             
         if not audio_data:
             return "오디오 데이터가 없습니다."
 
         try:
-            # OpenAI Whisper API 사용
-            # 다양한 오디오 형식 지원
-            audio_file = tempfile.NamedTemporaryFile(delete=False, suffix=".webm")
-            audio_file.write(audio_data)
-            audio_file.close()
-            
+            # 임시 파일 없이 메모리의 오디오를 그대로 업로드 (webm 등 다양한 형식 지원)
             print(f"STT 처리: 오디오 파일 크기 {len(audio_data)} bytes")
             
-            with open(audio_file.name, "rb") as f:
-                transcript = self.openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=f,
-                    language="ko"  # 한국어 설정
-                )
+            transcript = await self.ai_provider.transcribe(
+                audio_data,
+                filename="audio.webm",
+                language="ko"  # 한국어 설정
+            )
             
-            os.unlink(audio_file.name)
-            print(f"STT 성공: '{transcript.text}'")
-            return transcript.text
+            print(f"STT 성공: '{transcript}'")
+            return transcript
             
         except Exception as e:
             print(f"STT 오류: {e}")
@@ -389,10 +372,10 @@ class RAGSimulationService:
             traceback.print_exc()
             return "음성 인식에 실패했습니다."
     
-    def _text_to_speech(self, text: str, persona: Dict) -> str:
-        """텍스트를 음성으로 변환 (TTS) - gpt-4o-mini-tts 사용"""
-        if not self.openai_client:
-            print("TTS 오류: OpenAI 클라이언트가 초기화되지 않았습니다.")
+    async def _text_to_speech(self, text: str, persona: Dict) -> str:
+        """텍스트를 음성으로 변환 (TTS) - tts-1 사용"""
+        if not self.ai_provider.is_configured:
+            print("TTS 오류: AI 공급자가 설정되지 않았습니다.")
             return ""
             
         if not text:
@@ -406,21 +389,18 @@ class RAGSimulationService:
             voice_characteristics = self._get_voice_characteristics(persona)
             print(f"TTS 음성 특성: {voice_characteristics}")
             
-            # OpenAI TTS API 사용
-            response = self.openai_client.audio.speech.create(
-                model="tts-1",
+            audio_data, mime_type = await self.ai_provider.synthesize_speech(
+                text,
                 voice=voice_characteristics.get("voice", "alloy"),
-                speed=voice_characteristics.get("speed", 1.0),
-                input=text
+                speed=voice_characteristics.get("speed", 1.0)
             )
             
             # 음성 파일을 base64로 인코딩하여 반환
-            audio_data = response.content
             audio_base64 = base64.b64encode(audio_data).decode('utf-8')
             
             print(f"TTS 성공: 오디오 크기 {len(audio_data)} bytes, Base64 길이 {len(audio_base64)}")
             
-            return f"data:audio/mpeg;base64,{audio_base64}"
+            return f"data:{mime_type};base64,{audio_base64}"
             
         except Exception as e:
             print(f"TTS 오류: {e}")
@@ -472,7 +452,7 @@ class RAGSimulationService:
             "speed": speed_map.get(tone, 1.0)
         }
     
-    def _generate_initial_customer_message(self, persona: Dict, scenario: Dict) -> Dict:
+    async def _generate_initial_customer_message(self, persona: Dict, scenario: Dict) -> Dict:
         """초기 고객 메시지 생성"""
         storyline = scenario.get("storyline", {})
         sample_utterances = persona.get("sample_utterances", [])
@@ -509,14 +489,15 @@ class RAGSimulationService:
         """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            content = await self.ai_provider.chat_completion(
+                [{"role": "user", "content": prompt}],
                 model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=200
+                max_tokens=200,
+                temperature=1.0  # API 기본값 유지
             )
             
             return {
-                "text": response.choices[0].message.content,
+                "text": content,
                 "phase": "initial"
             }
             
@@ -527,7 +508,7 @@ class RAGSimulationService:
                 "phase": "initial"
             }
     
-    def _generate_customer_response_with_rag(self, user_message: str, persona: Dict, 
+    async def _generate_customer_response_with_rag(self, user_message: str, persona: Dict, 
                                            scenario: Dict) -> Dict:
         """RAG 기반 고객 응답 생성"""
         # RAG 컨텍스트 생성
@@ -555,14 +536,15 @@ class RAGSimulationService:
         """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            content = await self.ai_provider.chat_completion(
+                [{"role": "user", "content": prompt}],
                 model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300
+                max_tokens=300,
+                temperature=1.0  # API 기본값 유지
             )
             
             return {
-                "text": response.choices[0].message.content,
+                "text": content,
                 "phase": self._determine_conversation_phase(scenario)
             }
             
@@ -648,7 +630,7 @@ class RAGSimulationService:
         else:
             return "concluding"
     
-    def _evaluate_user_response(self, user_message: str, persona: Dict, scenario: Dict) -> str:
+    async def _evaluate_user_response(self, user_message: str, persona: Dict, scenario: Dict) -> str:
         """사용자 응답 평가"""
         evaluation_rubric = scenario.get('evaluation_rubric', [])
         
@@ -676,13 +658,14 @@ class RAGSimulationService:
         """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            content = await self.ai_provider.chat_completion(
+                [{"role": "user", "content": prompt}],
                 model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=200
+                max_tokens=200,
+                temperature=1.0  # API 기본값 유지
             )
             
-            return response.choices[0].message.content
+            return content
             
         except Exception as e:
             print(f"응답 평가 오류: {e}")
@@ -0,0 +1,144 @@
+"""
+시맨틱 답변 캐시
+질문 임베딩의 코사인 유사도로 이전 답변을 재사용합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+
+class SemanticCache:
+    """TTL + LRU 정책의 임베딩 기반 답변 캐시 (프로세스 메모리)"""
+
+    def __init__(self, threshold: float, ttl_seconds: float, max_size: int):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        # 정규화된 임베딩 행렬 (max_size 행 미리 할당, 첫 저장 시 차원 결정) - 앞쪽 _size 행만 유효
+        self._matrix: Optional[np.ndarray] = None
+        self._stored_at = np.zeros(max_size, dtype=np.float64)
+        self._row_keys: List[int] = []
+        self._size = 0
+        # key -> 행 번호, key -> 답변 (LRU 순서)
+        self._rows: Dict[int, int] = {}
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _remove_row(self, row: int):
+        """행 삭제 - 마지막 행을 빈자리로 옮겨 유효 행을 앞쪽에 연속으로 유지"""
+        key = self._row_keys[row]
+        last = self._size - 1
+        if row != last:
+            moved = self._row_keys[last]
+            self._matrix[row] = self._matrix[last]
+            self._stored_at[row] = self._stored_at[last]
+            self._row_keys[row] = moved
+            self._rows[moved] = row
+        self._row_keys.pop()
+        self._size -= 1
+        del self._rows[key]
+        del self._entries[key]
+
+    def _evict_expired(self, now: float):
+        expired = np.flatnonzero(now - self._stored_at[:self._size] > self.ttl_seconds)
+        for row in expired[::-1]:
+            self._remove_row(int(row))
+
+    def _clear(self):
+        self._row_keys = []
+        self._size = 0
+        self._rows.clear()
+        self._entries.clear()
+
+    def get(self, embedding: List[float]) -> Optional[Dict]:
+        """임계값 이상으로 가장 유사한 질문의 답변 반환 (없으면 None)"""
+        query = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_expired(now)
+            if not self._size or query.shape[0] != self._matrix.shape[1]:
+                self.misses += 1
+                return None
+
+            scores = self._matrix[:self._size] @ query
+            best = int(np.argmax(scores))
+
+            if float(scores[best]) < self.threshold:
+                self.misses += 1
+                return None
+
+            key = self._row_keys[best]
+            self._entries.move_to_end(key)  # LRU 갱신
+            self.hits += 1
+            return self._entries[key]
+
+    def set(self, embedding: List[float], answer: Dict):
+        """답변 저장 (최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        if self.max_size <= 0:
+            return
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                # 임베딩 차원이 바뀌면 기존 항목과 비교할 수 없으므로 비우고 재할당
+                self._matrix = np.empty((self.max_size, vector.shape[0]), dtype=np.float32)
+                self._clear()
+            if self._size >= self.max_size:
+                self._remove_row(self._rows[next(iter(self._entries))])
+
+            row = self._size
+            key = self._next_key
+            self._next_key += 1
+            self._matrix[row] = vector
+            self._stored_at[row] = time.monotonic()
+            self._row_keys.append(key)
+            self._size += 1
+            self._rows[key] = row
+            self._entries[key] = answer
+
+    def invalidate(self):
+        """전체 캐시 무효화 (RAG 문서 재인덱싱/삭제 시)"""
+        with self._lock:
+            self._clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        """캐시 적중/실패 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": settings.SEMANTIC_CACHE_ENABLED,
+                "size": self._size,
+                "max_size": self.max_size,
+                "threshold": self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations
+            }
+
+
+answer_cache = SemanticCache(
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+    max_size=settings.SEMANTIC_CACHE_MAX_SIZE
+)
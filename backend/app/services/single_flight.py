@@ -0,0 +1,58 @@
+"""
+동일 요청 병합 (single-flight)
+같은 키의 요청이 처리 중이면 새로 계산하지 않고 진행 중인 결과를 함께 기다립니다.
+"""
+import asyncio
+import re
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TRAILING_PUNCTUATION_PATTERN = re.compile(r"[\s?!.~,]+$")
+
+
+def normalize_question(question: str) -> str:
+    """병합 키용 질문 정규화 (유니코드 정규화, 소문자, 공백 통일, 끝 문장부호 제거)"""
+    normalized = unicodedata.normalize("NFKC", question).lower()
+    normalized = _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+    return _TRAILING_PUNCTUATION_PATTERN.sub("", normalized)
+
+
+class SingleFlight:
+    """키별로 진행 중인 계산을 하나만 유지하는 요청 병합기 (프로세스 메모리)"""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        key에 대해 fn을 한 번만 실행하고 결과 공유
+        반환: (결과, 다른 요청의 계산을 공유했는지 여부)
+        """
+        task = self._in_flight.get(key)
+        shared = task is not None
+
+        if shared:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            task = asyncio.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # 먼저 요청한 쪽이 취소되어도 함께 기다리는 요청의 계산은 계속 진행
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> Dict:
+        total = self.executed + self.coalesced
+        return {
+            "in_flight": len(self._in_flight),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_rate": self.coalesced / total if total else 0.0
+        }
+
+
+query_flight = SingleFlight()
@@ -0,0 +1,234 @@
+"""
+프로세스 메모리 벡터 인덱스
+소규모 코퍼스(청크 약 20만 개 이하)용으로 인덱싱된 청크 임베딩을 카테고리별 연속 float32 행렬에 올려두고
+행렬-벡터 곱 한 번과 argpartition으로 상위 k개를 찾아 채팅 경로에서 DB 왕복을 없앱니다.
+
+- 앱 시작 시 DB에서 전체 로드 (settings.VECTOR_INDEX_ENABLED)
+- 문서 인덱싱/삭제 시 해당 문서 행만 증분 반영
+- 프로세스별 사본이므로 다른 프로세스에서 인덱싱한 문서는 재시작(또는 load) 전까지 보이지 않음
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlmodel import Session
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+
+EMBEDDING_DIMENSIONS = 1536
+MIN_CAPACITY = 1024
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class _Partition:
+    """카테고리 하나의 임베딩 행렬과 행별 메타데이터 (행 순서 일치)"""
+
+    def __init__(self):
+        self.matrix = np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        self.document_ids = np.empty(0, dtype=np.int64)
+        # (document_id, chunk_index, 문서 제목, 청크 내용)
+        self.rows: List[Tuple[int, int, str, str]] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.rows)
+
+    def _reserve(self, size: int):
+        """용량이 부족하면 두 배로 늘려 재할당 (추가 비용 분할 상환)"""
+        capacity = self.matrix.shape[0]
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, MIN_CAPACITY)
+        matrix = np.empty((capacity, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        matrix[:self.size] = self.matrix[:self.size]
+        document_ids = np.empty(capacity, dtype=np.int64)
+        document_ids[:self.size] = self.document_ids[:self.size]
+        self.matrix, self.document_ids = matrix, document_ids
+
+    def append(self, rows: Sequence[Tuple[int, int, str, str]], vectors: np.ndarray):
+        start = self.size
+        self._reserve(start + len(rows))
+        self.matrix[start:start + len(rows)] = _normalize(vectors)
+        self.document_ids[start:start + len(rows)] = [row[0] for row in rows]
+        self.rows.extend(rows)
+
+    def remove(self, document_ids: Iterable[int]) -> int:
+        """해당 문서 행 삭제 - 마지막 행을 빈자리로 옮겨 행렬 전체 복사 없이 처리"""
+        positions = np.flatnonzero(np.isin(self.document_ids[:self.size], list(document_ids)))
+        for position in positions[::-1]:
+            last = self.size - 1
+            if position != last:
+                self.matrix[position] = self.matrix[last]
+                self.document_ids[position] = self.document_ids[last]
+                self.rows[position] = self.rows[last]
+            self.rows.pop()
+        return len(positions)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[float, Tuple[int, int, str, str]]]:
+        if not self.size:
+            return []
+        scores = self.matrix[:self.size] @ query
+        if k < self.size:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+        return [(float(scores[index]), self.rows[index]) for index in top]
+
+
+class InMemoryVectorIndex:
+    """카테고리별 파티션을 가진 코사인 유사도 인덱스 (스레드 안전)"""
+
+    def __init__(self, max_chunks: int = 200_000):
+        self.max_chunks = max_chunks
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._partitions: Dict[str, _Partition] = {}
+        self._searches = 0
+
+    def load(self) -> bool:
+        """
+        인덱싱된 청크 전체를 DB에서 로드 (halfvec 저장 시에도 float32로 변환)
+        max_chunks를 넘으면 메모리 보호를 위해 로드하지 않음
+        """
+        started = time.perf_counter()
+        # embedding_half 컬럼은 halfvec 저장 형식에서만 존재
+        if settings.EMBEDDING_STORAGE == "halfvec":
+            embedding = "COALESCE(dc.embedding, CAST(dc.embedding_half AS vector))"
+            has_embedding = "(dc.embedding IS NOT NULL OR dc.embedding_half IS NOT NULL)"
+        else:
+            embedding, has_embedding = "dc.embedding", "dc.embedding IS NOT NULL"
+
+        with Session(engine) as session:
+            total = session.execute(text(
+                f"SELECT count(*) FROM document_chunks dc WHERE dc.is_indexed AND {has_embedding}"
+            )).scalar()
+            if total > self.max_chunks:
+                print(f"⚠️ 메모리 벡터 인덱스 비활성화: 청크 {total:,}개 > 최대 {self.max_chunks:,}개")
+                self.clear()
+                return False
+
+            query = text(f"""
+                SELECT
+                    dc.category,
+                    dc.document_id,
+                    dc.chunk_index,
+                    d.title,
+                    dc.content,
+                    {embedding} as embedding
+                FROM document_chunks dc
+                JOIN documents d ON dc.document_id = d.id
+                WHERE dc.is_indexed AND {has_embedding}
+                ORDER BY dc.category, dc.document_id, dc.chunk_index
+            """).columns(embedding=Vector(EMBEDDING_DIMENSIONS))
+            result = session.execute(query, execution_options={"stream_results": True})
+
+            partitions: Dict[str, _Partition] = {}
+            for batch in result.partitions(5000):
+                grouped: Dict[str, List] = {}
+                for row in batch:
+                    grouped.setdefault(row.category, []).append(row)
+                for category, rows in grouped.items():
+                    partitions.setdefault(category, _Partition()).append(
+                        [(row.document_id, row.chunk_index, row.title, row.content) for row in rows],
+                        np.asarray([row.embedding for row in rows], dtype=np.float32)
+                    )
+
+        with self._lock:
+            self._partitions = partitions
+            self.loaded = True
+
+        counts = ", ".join(f"{category} {partition.size:,}" for category, partition in partitions.items())
+        print(f"✅ 메모리 벡터 인덱스 로드 ({time.perf_counter() - started:.1f}s): {counts or '청크 없음'}")
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._partitions = {}
+            self.loaded = False
+
+    def upsert_document(
+        self,
+        document_id: int,
+        title: str,
+        category: str,
+        chunks: Sequence[Tuple[int, str, Optional[Sequence[float]]]]
+    ):
+        """
+        문서 재인덱싱 반영 - 기존 행 삭제 후 (chunk_index, 내용, 임베딩) 목록 추가
+        추가 후 max_chunks를 넘으면 인덱스를 해제 (이후 검색은 DB 사용)
+        """
+        if not self.loaded:
+            return
+        rows = [(document_id, chunk_index, title, content) for chunk_index, content, embedding in chunks
+                if embedding is not None]
+        vectors = np.asarray(
+            [embedding for _, _, embedding in chunks if embedding is not None], dtype=np.float32
+        ).reshape(len(rows), EMBEDDING_DIMENSIONS)
+
+        with self._lock:
+            if not self.loaded:
+                return
+            for partition in self._partitions.values():
+                partition.remove([document_id])
+            total = sum(partition.size for partition in self._partitions.values()) + len(rows)
+            if total > self.max_chunks:
+                # load()와 같은 상한 - 넘으면 인덱스를 해제하고 DB 벡터 검색으로 대체
+                print(f"⚠️ 메모리 벡터 인덱스 비활성화: 청크 {total:,}개 > 최대 {self.max_chunks:,}개")
+                self._partitions = {}
+                self.loaded = False
+                return
+            if rows:
+                self._partitions.setdefault(category, _Partition()).append(rows, vectors)
+
+    def remove_documents(self, document_ids: Iterable[int]):
+        """삭제된 문서의 행 제거"""
+        document_ids = list(document_ids)
+        if not self.loaded or not document_ids:
+            return
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.remove(document_ids)
+
+    def search(self, embedding: Sequence[float], k: int, category: str) -> List[Dict]:
+        """코사인 유사도 상위 k개 청크 (DB 벡터 검색과 같은 결과 형식)"""
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        with self._lock:
+            partition = self._partitions.get(category)
+            hits = partition.search(query, k) if partition else []
+            self._searches += 1
+
+        return [
+            {
+                "title": title,
+                "content": content,
+                "similarity": score,
+                "distance": 1.0 - score,
+                "document_id": document_id,
+                "chunk_index": chunk_index
+            }
+            for score, (document_id, chunk_index, title, content) in hits
+        ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "searches": self._searches,
+                "chunks": {category: partition.size for category, partition in self._partitions.items()},
+                "memory_mb": round(
+                    sum(partition.matrix.nbytes for partition in self._partitions.values()) / 1024 / 1024, 1
+                )
+            }
+
+
+vector_index = InMemoryVectorIndex(max_chunks=settings.VECTOR_INDEX_MAX_CHUNKS)
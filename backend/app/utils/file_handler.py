@@ -4,7 +4,8 @@
 """
 import os
 import shutil
-from typing import Optional
+import hashlib
+from typing import Dict, Optional
 from fastapi import UploadFile, HTTPException
 from pathlib import Path
 import uuid
@@ -118,6 +119,33 @@ def get_file_size_str(size_bytes: int) -> str:
     return f"{size_bytes:.1f} TB"
 
 
+def hash_file(file_path: str) -> str:
+    """
+    파일 내용 sha256
+    Args:
+        file_path: 파일 경로
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
+def file_fingerprint(file_path: str) -> Dict:
+    """
+    인덱싱 시 함께 저장할 파일 지문
+    Args:
+        file_path: 파일 경로
+    Returns:
+        dict: content_hash, file_mtime, file_size
+    """
+    stat = Path(file_path).stat()
+    return {
+        "content_hash": hash_file(file_path),
+        "file_mtime": stat.st_mtime,
+        "file_size": stat.st_size
+    }
 
@@ -0,0 +1,108 @@
+"""
+Prometheus 형식 지표
+외부 라이브러리 없이 히스토그램을 프로세스 메모리에 누적하고 /metrics 텍스트로 출력합니다.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 초 단위 기본 버킷 (5ms ~ 60s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """라벨별 누적 히스토그램"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 라벨 값 → (버킷별 개수, 합계, 전체 개수)
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[key] = series
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    @staticmethod
+    def _format_labels(pairs: List[Tuple[str, str]]) -> str:
+        if not pairs:
+            return ""
+        escaped = [
+            name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+            for name, value in pairs
+        ]
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            label_pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = self._format_labels(label_pairs + [("le", repr(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_bucket{self._format_labels(label_pairs + [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{self._format_labels(label_pairs)} {total}")
+            lines.append(f"{self.name}_count{self._format_labels(label_pairs)} {count}")
+        return lines
+
+
+_registry: List[Histogram] = []
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Optional[Sequence[float]] = None) -> Histogram:
+    """히스토그램 생성 및 /metrics 출력 대상으로 등록"""
+    metric = Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS)
+    _registry.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    """등록된 전체 지표를 Prometheus 텍스트 형식으로 출력"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# RAG 처리 단계별 소요 시간
+rag_stage_seconds = histogram(
+    "rag_stage_duration_seconds",
+    "RAG pipeline stage latency in seconds",
+    labelnames=("stage",)
+)
+
+# 채팅 요청 전체 소요 시간
+chat_request_seconds = histogram(
+    "chat_request_duration_seconds",
+    "Chat request latency in seconds",
+    labelnames=("endpoint", "cached")
+)
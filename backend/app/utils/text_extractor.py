@@ -0,0 +1,119 @@
+"""
+문서 텍스트 추출
+PDF/DOCX 파싱은 CPU 작업이므로 프로세스 풀에서 실행하고,
+페이지 단위로 순서대로 반환하여 청크 분할기로 바로 흘려보냅니다.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, List, Optional
+
+import aiofiles
+
+from app.config import settings
+
+SUPPORTED_FILE_TYPES = {".txt", ".pdf", ".docx"}
+
+# 텍스트 파일을 나눠 읽는 단위 (문자)
+TEXT_BLOCK_SIZE = 64 * 1024
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=settings.EXTRACTION_PROCESSES)
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """애플리케이션 종료 시 프로세스 풀 정리"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+# ---- 프로세스 풀에서 실행되는 함수 (모듈 최상위 함수여야 pickle 가능) ----
+
+def _count_pdf_pages(file_path: str) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(file_path).pages)
+
+
+def _extract_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+    from pypdf import PdfReader
+    reader = PdfReader(file_path)
+    return [(reader.pages[index].extract_text() or "") + "\n" for index in range(start, end)]
+
+
+def _extract_docx_blocks(file_path: str) -> List[str]:
+    """DOCX 문단과 표를 문서 순서대로 추출 (문단 묶음 단위로 반환)"""
+    import docx
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = docx.Document(file_path)
+    lines = []
+    for element in document.element.body.iterchildren():
+        if element.tag.endswith("}p"):
+            lines.append(Paragraph(element, document).text)
+        elif element.tag.endswith("}tbl"):
+            for row in Table(element, document).rows:
+                lines.append(" | ".join(cell.text.strip() for cell in row.cells))
+
+    blocks = []
+    for start in range(0, len(lines), 50):
+        blocks.append("\n".join(lines[start:start + 50]) + "\n")
+    return blocks
+
+
+# ---- 비동기 인터페이스 ----
+
+async def iter_document_pages(file_path: str, file_type: str) -> AsyncIterator[str]:
+    """
+    문서 텍스트를 페이지(또는 블록) 단위로 순서대로 생성
+    - .txt: 블록 단위 비동기 읽기
+    - .pdf: 페이지 범위를 여러 프로세스에서 병렬 추출, 완료 순서와 관계없이 페이지 순서대로 반환
+    - .docx: python-docx로 문단/표 추출
+    """
+    if file_type == ".txt":
+        async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+            while True:
+                block = await f.read(TEXT_BLOCK_SIZE)
+                if not block:
+                    break
+                yield block
+        return
+
+    loop = asyncio.get_running_loop()
+    pool = _get_process_pool()
+
+    if file_type == ".pdf":
+        page_count = await loop.run_in_executor(pool, _count_pdf_pages, file_path)
+        pages_per_task = settings.EXTRACTION_PAGES_PER_TASK
+        ranges = [
+            (start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
+
+        # 진행 중인 작업 수를 제한해 앞쪽 페이지부터 순서대로 흘려보냄
+        max_in_flight = settings.EXTRACTION_PROCESSES * 2
+        pending = []
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < max_in_flight:
+                start, end = ranges[next_range]
+                pending.append(loop.run_in_executor(pool, _extract_pdf_pages, file_path, start, end))
+                next_range += 1
+            for page in await pending.pop(0):
+                yield page
+        return
+
+    if file_type == ".docx":
+        for block in await loop.run_in_executor(pool, _extract_docx_blocks, file_path):
+            yield block
+        return
+
+    raise ValueError(f"Unsupported file type: {file_type}")
+
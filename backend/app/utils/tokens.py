@@ -0,0 +1,66 @@
+"""
+토큰 수 계산 유틸리티
+tiktoken이 설치되어 있으면 모델 토크나이저를 사용하고, 없으면 문자 종류별 근사치를 사용합니다.
+"""
+import re
+from functools import lru_cache
+
+from app.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - 선택 의존성
+    tiktoken = None
+
+# 한글/한자 등은 대략 1글자 ≈ 1토큰, 그 외(영문/숫자/기호)는 약 4글자 ≈ 1토큰
+_WIDE_CHAR_PATTERN = re.compile(r"[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u4e00-\u9fff]")
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(settings.CHAT_MODEL)
+    except Exception:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            print(f"⚠️ tiktoken 인코딩 로드 실패, 근사치 사용: {e}")
+            return None
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 토큰 수"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+
+    wide_chars = len(_WIDE_CHAR_PATTERN.findall(text))
+    return wide_chars + (len(text) - wide_chars + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """최대 토큰 수에 맞게 텍스트 앞부분만 남김"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+
+    if count_tokens(text) <= max_tokens:
+        return text
+    # 근사치는 글자 수에 대해 단조 증가하므로 이진 탐색으로 잘라낼 위치 결정
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+검색 지연 시간 벤치마크 스크립트
+learning_materials_for_RAG.txt로 합성 documents/document_chunks 코퍼스를 만들어
+10k → 100k → 1M 청크로 키워가며 RAGService.similarity_search 모드별 p50/p95/p99를 측정하고
+커밋 간 비교용 JSON 결과를 저장합니다.
+
+⚠️ 합성 데이터 적재를 위해 document_chunks 검색 인덱스를 삭제/재생성하므로
+   벤치마크 전용 로컬 DB(DATABASE_URL)에서만 실행하세요.
+
+사용 예:
+    DATABASE_URL=postgresql://.../benchdb AI_PROVIDER=fake \\
+        python scripts/benchmark_retrieval.py --sizes 10000,100000 --iterations 50
+"""
+import argparse
+import asyncio
+import io
+import json
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from sqlmodel import Session
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine, init_db, search_indexes, SEARCH_INDEXES, _run_ddl
+from app.services.ai_provider import get_ai_provider
+from app.services.chunker import create_chunker
+from app.services.rag_service import RAGService
+from app.services.vector_index import vector_index
+
+BENCHMARK_PATH_PREFIX = "benchmark://"
+CHUNKS_PER_DOCUMENT = 100
+EMBEDDING_NOISE = 0.15  # 같은 원본 청크에서 만든 합성 청크 간 임베딩 차이
+DEFAULT_MODES = ["vector", "lexical", "hybrid", "keyword", "auto"]
+# "memory": 메모리 벡터 인덱스를 로드한 상태의 vector 모드 (VECTOR_INDEX_MAX_CHUNKS 이하에서만 로드)
+MEMORY_MODE = "memory"
+
+
+def load_base_chunks():
+    """학습 자료를 청크로 분할 - 합성 코퍼스의 원본 (제목, 내용) 목록"""
+    materials_file = project_root / "data" / "learning_materials_for_RAG.txt"
+    content = materials_file.read_text(encoding="utf-8")
+
+    # 각 청크 제목은 가장 가까운 앞쪽 '## ' 소제목
+    headings = []
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        if line.startswith("## "):
+            headings.append((offset, line[3:].strip()))
+        offset += len(line)
+
+    chunks = []
+    for chunk in create_chunker().split(content):
+        title = "은행 신입사원 연수 학습 자료집"
+        for heading_offset, heading in headings:
+            if heading_offset > chunk["start"]:
+                break
+            title = heading
+        chunks.append((title, chunk["content"]))
+    return chunks
+
+
+def build_queries(base_chunks, count: int):
+    """소제목 기반 질의 목록 (결정적)"""
+    titles = list(dict.fromkeys(title for title, _ in base_chunks))
+    templates = ["{}에 대해 알려주세요", "{} 관련해서 고객에게 어떻게 설명하나요?", "{}"]
+    queries = []
+    for index in range(count):
+        title = titles[index % len(titles)].split("]", 1)[-1].strip()
+        queries.append(templates[index % len(templates)].format(title))
+    return queries
+
+
+async def embed_texts(texts):
+    """설정된 AI 공급자로 임베딩 (원본 청크/질의 수만큼만 호출)"""
+    provider = get_ai_provider()
+    vectors = []
+    for start in range(0, len(texts), settings.EMBEDDING_BATCH_SIZE):
+        vectors.extend(await provider.embeddings(texts[start:start + settings.EMBEDDING_BATCH_SIZE]))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def check_database(allow_existing: bool):
+    """벤치마크용이 아닌 RAG 문서가 있으면 중단 (운영 DB 보호)"""
+    with Session(engine) as session:
+        existing = session.execute(
+            text("SELECT COUNT(*) FROM documents WHERE category = 'RAG' AND file_path NOT LIKE :prefix"),
+            {"prefix": f"{BENCHMARK_PATH_PREFIX}%"}
+        ).scalar()
+    if existing and not allow_existing:
+        print(f"❌ 벤치마크가 아닌 RAG 문서 {existing}개가 있습니다. 전용 DB를 사용하거나 --allow-existing을 지정하세요.")
+        sys.exit(1)
+
+
+def clear_benchmark_data():
+    with Session(engine) as session:
+        session.execute(text(
+            "DELETE FROM document_chunks WHERE document_id IN "
+            "(SELECT id FROM documents WHERE file_path LIKE :prefix)"
+        ), {"prefix": f"{BENCHMARK_PATH_PREFIX}%"})
+        session.execute(text("DELETE FROM documents WHERE file_path LIKE :prefix"),
+                        {"prefix": f"{BENCHMARK_PATH_PREFIX}%"})
+        session.commit()
+    print("🧹 기존 벤치마크 데이터 삭제")
+
+
+def drop_chunk_indexes():
+    """대량 적재 전 document_chunks 검색 인덱스 삭제 (적재 후 한 번에 재생성)"""
+    with Session(engine) as session:
+        for name, ddl in SEARCH_INDEXES:
+            if "ON document_chunks" in ddl:
+                session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        session.commit()
+
+
+def rebuild_indexes() -> float:
+    started = time.perf_counter()
+    _run_ddl(search_indexes(), "Index")
+    with Session(engine) as session:
+        session.execute(text("ANALYZE documents"))
+        session.execute(text("ANALYZE document_chunks"))
+        session.commit()
+    return time.perf_counter() - started
+
+
+def embedding_columns():
+    """EMBEDDING_STORAGE에 맞춰 채울 임베딩 컬럼 (문서 인덱싱 시와 동일)"""
+    return [name for name, value in RAGService._embedding_columns([0.0]).items() if value is not None]
+
+
+def index_sizes():
+    """document_chunks 인덱스별 크기 (MB) - 저장 형식별 메모리 요구량 비교용"""
+    with Session(engine) as session:
+        rows = session.execute(text(
+            "SELECT indexrelname, pg_relation_size(indexrelid) AS size FROM pg_stat_user_indexes "
+            "WHERE relname = 'document_chunks' ORDER BY indexrelname"
+        )).fetchall()
+    return {row.indexrelname: round(row.size / 1024 / 1024, 1) for row in rows}
+
+
+def plan_index_names(plan) -> list:
+    """EXPLAIN (FORMAT JSON) 계획에서 사용된 인덱스 이름 목록"""
+    names = [plan["Index Name"]] if "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        names.extend(plan_index_names(child))
+    return names
+
+
+def query_plan_indexes(query: str, query_embedding, k: int):
+    """
+    RAG 벡터/트라이그램 검색의 청크 조회가 사용하는 인덱스 (EXPLAIN)
+    RAG 부분 인덱스(ix_document_chunks_rag_*)를 타는지 확인용
+    """
+    column, vector_type = (
+        ("embedding_half", "halfvec") if settings.EMBEDDING_STORAGE == "halfvec" else ("embedding", "vector")
+    )
+    plans = {
+        "vector": (
+            f"SELECT dc.id FROM document_chunks dc "
+            f"WHERE dc.category = :category AND dc.is_indexed AND dc.{column} IS NOT NULL "
+            f"ORDER BY dc.{column} <=> CAST(:embedding AS {vector_type}) LIMIT :k"
+        ),
+        "lexical": (
+            "SELECT dc.id FROM document_chunks dc "
+            "WHERE dc.category = :category AND dc.is_indexed AND :query <% dc.content"
+        )
+    }
+    params = {
+        "category": "RAG",
+        "embedding": "[" + ",".join(f"{value:.6f}" for value in query_embedding) + "]",
+        "query": query,
+        "k": k
+    }
+    with Session(engine) as session:
+        return {
+            mode: plan_index_names(
+                session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()[0]["Plan"]
+            )
+            for mode, sql in plans.items()
+        }
+
+
+def grow_corpus(current_size: int, target_size: int, base_chunks, base_embeddings, seed: int):
+    """
+    합성 청크를 target_size까지 추가 (COPY로 적재)
+    - 문서당 CHUNKS_PER_DOCUMENT개 청크, 제목은 원본 소제목 + 일련번호
+    - 임베딩은 원본 청크 임베딩 + 결정적 가우시안 잡음 후 정규화
+    """
+    rng = np.random.default_rng(seed + current_size)
+    columns = embedding_columns()
+    raw_connection = engine.raw_connection()
+    try:
+        cursor = raw_connection.cursor()
+        chunk_number = current_size
+        while chunk_number < target_size:
+            document_number = chunk_number // CHUNKS_PER_DOCUMENT
+            base_title = base_chunks[document_number % len(base_chunks)][0]
+            cursor.execute(
+                "INSERT INTO documents (title, category, file_path, file_type, file_size, description, "
+                "uploaded_by, upload_date, download_count, is_indexed) "
+                "VALUES (%s, 'RAG', %s, '.txt', 0, 'benchmark', 1, now(), 0, true) RETURNING id",
+                (f"{base_title} #{document_number}", f"{BENCHMARK_PATH_PREFIX}{document_number}")
+            )
+            document_id = cursor.fetchone()[0]
+
+            count = min(CHUNKS_PER_DOCUMENT, target_size - chunk_number)
+            base_indexes = (np.arange(chunk_number, chunk_number + count)) % len(base_chunks)
+            vectors = base_embeddings[base_indexes] + EMBEDDING_NOISE * rng.standard_normal(
+                (count, base_embeddings.shape[1])
+            ).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+            buffer = io.StringIO()
+            for offset, (base_index, vector) in enumerate(zip(base_indexes, vectors)):
+                content = f"{base_chunks[base_index][1]} (사례 {document_number}-{offset})"
+                content = content.replace("\\", "\\\\").replace("\t", " ").replace("\n", "\\n").replace("\r", " ")
+                embedding = "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+                embeddings = "\t".join([embedding] * len(columns))
+                buffer.write(f"{document_id}\t{content}\t{offset}\t{embeddings}\tRAG\tt\t{{}}\t{datetime.utcnow().isoformat()}\n")
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY document_chunks (document_id, content, chunk_index, {', '.join(columns)}, "
+                "category, is_indexed, chunk_metadata, created_at) FROM STDIN",
+                buffer
+            )
+
+            chunk_number += count
+            if document_number % 100 == 0:
+                raw_connection.commit()
+                print(f"  📥 {chunk_number:,}/{target_size:,} 청크 적재")
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+
+
+def percentile_summary(latencies_ms):
+    values = np.asarray(latencies_ms)
+    return {
+        "n": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "mean_ms": round(float(values.mean()), 2),
+        "min_ms": round(float(values.min()), 2),
+        "max_ms": round(float(values.max()), 2)
+    }
+
+
+async def measure_mode(mode: str, queries, query_embeddings, args):
+    """모드 하나의 질의 지연 측정 (질의 임베딩 시간은 제외)"""
+    latencies = []
+    stage_totals = {}
+    empty_results = 0
+    budget_exceeded = False
+
+    with Session(engine) as session:
+        rag_service = RAGService(session)
+        rag_service._query_embeddings.update(dict(zip(queries, query_embeddings)))
+
+        mode_started = time.perf_counter()
+        for iteration in range(args.warmup + args.iterations):
+            query = queries[iteration % len(queries)]
+            rag_service.stage_timings = {}  # 질의별 단계 시간만 합산되도록 초기화
+            started = time.perf_counter()
+            results = await rag_service.similarity_search(query, k=args.k, mode=mode)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            if iteration < args.warmup:
+                continue
+            latencies.append(elapsed_ms)
+            empty_results += 0 if results else 1
+            for stage, value in rag_service.stage_timings.items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + value
+
+            if time.perf_counter() - mode_started > args.max_seconds_per_mode:
+                budget_exceeded = True
+                break
+
+    summary = percentile_summary(latencies)
+    summary.update({
+        "mode": mode,
+        "empty_results": empty_results,
+        "budget_exceeded": budget_exceeded,
+        "stage_mean_ms": {stage: round(total / len(latencies), 2) for stage, total in stage_totals.items()}
+    })
+    return summary
+
+
+async def measure_memory_mode(queries, query_embeddings, args):
+    """메모리 벡터 인덱스를 로드해 vector 모드 측정 후 해제 (다른 모드 측정에 영향 없도록)"""
+    started = time.perf_counter()
+    loaded = vector_index.load()
+    load_seconds = time.perf_counter() - started
+    try:
+        summary = await measure_mode("vector", queries, query_embeddings, args)
+    finally:
+        vector_index.clear()
+    summary.update({
+        "mode": MEMORY_MODE,
+        "memory_index_loaded": loaded,
+        "memory_index_load_seconds": round(load_seconds, 1)
+    })
+    return summary
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def database_versions():
+    with Session(engine) as session:
+        postgres = session.execute(text("SHOW server_version")).scalar()
+        pgvector = session.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")).scalar()
+    return {"postgres": postgres, "pgvector": pgvector}
+
+
+async def run(args):
+    engine.echo = False  # SQL 로깅이 측정값에 섞이지 않도록 비활성화
+    init_db()
+    check_database(args.allow_existing)
+    clear_benchmark_data()
+
+    base_chunks = load_base_chunks()
+    queries = build_queries(base_chunks, args.queries)
+    print(f"📚 원본 청크 {len(base_chunks)}개, 질의 {len(queries)}개, AI 공급자: {settings.AI_PROVIDER}")
+
+    base_embeddings = await embed_texts([content for _, content in base_chunks])
+    query_embeddings = (await embed_texts(queries)).tolist()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "ai_provider": settings.AI_PROVIDER,
+        "database": database_versions(),
+        "settings": {
+            "k": args.k,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "RAG_RERANK_ENABLED": settings.RAG_RERANK_ENABLED,
+            "RAG_RERANK_CANDIDATES": settings.RAG_RERANK_CANDIDATES,
+            "RAG_HYBRID_CANDIDATES": settings.RAG_HYBRID_CANDIDATES,
+            "RAG_LEXICAL_THRESHOLD": settings.RAG_LEXICAL_THRESHOLD,
+            "EMBEDDING_STORAGE": settings.EMBEDDING_STORAGE,
+            "EMBEDDING_KEEP_FULL_PRECISION": settings.EMBEDDING_KEEP_FULL_PRECISION,
+            "RAG_RESCORE_CANDIDATES": settings.RAG_RESCORE_CANDIDATES
+        },
+        "results": []
+    }
+
+    current_size = 0
+    for size in args.sizes:
+        print(f"\n{'='*60}\n📈 코퍼스 {size:,} 청크\n{'='*60}")
+        load_started = time.perf_counter()
+        drop_chunk_indexes()
+        grow_corpus(current_size, size, base_chunks, base_embeddings, args.seed)
+        load_seconds = time.perf_counter() - load_started
+        index_seconds = rebuild_indexes()
+        current_size = size
+        sizes = index_sizes()
+        print(f"✅ 적재 {load_seconds:.1f}s, 인덱스 생성 {index_seconds:.1f}s, 인덱스 크기 {sizes} MB")
+        plan_indexes = query_plan_indexes(queries[0], query_embeddings[0], args.k)
+        print(f"🔎 검색 쿼리 사용 인덱스: {plan_indexes}")
+
+        for mode in args.modes:
+            if mode == MEMORY_MODE:
+                summary = await measure_memory_mode(queries, query_embeddings, args)
+            else:
+                summary = await measure_mode(mode, queries, query_embeddings, args)
+            summary.update({
+                "corpus_chunks": size,
+                "load_seconds": round(load_seconds, 1),
+                "index_seconds": round(index_seconds, 1),
+                "index_size_mb": sizes,
+                "plan_indexes": plan_indexes
+            })
+            report["results"].append(summary)
+            print(
+                f"  {mode:<8} p50 {summary['p50_ms']:>9.2f}ms  p95 {summary['p95_ms']:>9.2f}ms  "
+                f"p99 {summary['p99_ms']:>9.2f}ms  (n={summary['n']}, empty={summary['empty_results']})"
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n💾 결과 저장: {args.output}")
+
+    if not args.keep:
+        clear_benchmark_data()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="RAG 검색 지연 시간 벤치마크")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="측정할 코퍼스 크기 (청크 수, 쉼표 구분, 오름차순)")
+    parser.add_argument("--modes", default=",".join(DEFAULT_MODES), help="측정할 검색 모드 (쉼표 구분)")
+    parser.add_argument("--iterations", type=int, default=100, help="모드별 측정 질의 수")
+    parser.add_argument("--warmup", type=int, default=5, help="측정에서 제외할 워밍업 질의 수")
+    parser.add_argument("--queries", type=int, default=30, help="서로 다른 질의 수")
+    parser.add_argument("--k", type=int, default=5, help="검색 결과 수")
+    parser.add_argument("--max-seconds-per-mode", type=float, default=300.0,
+                        help="모드별 최대 측정 시간 (초과 시 측정 중단 후 budget_exceeded 표시)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로")
+    parser.add_argument("--keep", action="store_true", help="측정 후 합성 데이터 유지")
+    parser.add_argument("--allow-existing", action="store_true", help="벤치마크가 아닌 RAG 문서가 있어도 실행")
+    args = parser.parse_args()
+
+    args.sizes = sorted(int(size) for size in args.sizes.split(","))
+    args.modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    if args.output is None:
+        stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        args.output = project_root / "benchmark_results" / f"retrieval_{git_commit()[:8]}_{stamp}.json"
+    return args
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
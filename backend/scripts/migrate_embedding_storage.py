@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+청크 임베딩 저장 형식 마이그레이션 스크립트
+기존 document_chunks 행의 임베딩을 vector(float32) ↔ halfvec(float16) 컬럼으로 복사하고
+대상 형식의 HNSW 인덱스만 남깁니다. 선택 시 원래 형식의 컬럼도 비워 저장 공간을 줄입니다.
+
+마이그레이션 후 .env의 EMBEDDING_STORAGE를 대상 형식으로 바꿔야 검색/인덱싱에 반영됩니다.
+halfvec 컬럼은 pgvector 0.7 이상이 필요합니다 (확장을 먼저 업데이트하고 버전이 낮으면 중단).
+
+사용 예:
+    python scripts/migrate_embedding_storage.py --to halfvec
+    python scripts/migrate_embedding_storage.py --to halfvec --drop-source   # float32 재채점 없이 사용
+    python scripts/migrate_embedding_storage.py --to vector                  # 되돌리기
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from sqlmodel import Session
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine, init_db, enable_halfvec, search_indexes, SEARCH_INDEXES, _run_ddl
+
+# 형식별 (컬럼, 캐스트 타입)
+STORAGE_COLUMNS = {
+    "vector": ("embedding", "vector(1536)"),
+    "halfvec": ("embedding_half", "halfvec(1536)")
+}
+
+
+def column_indexes(column: str):
+    """해당 임베딩 컬럼의 HNSW 인덱스 이름 목록"""
+    return [name for name, ddl in SEARCH_INDEXES if f"({column} " in ddl and "USING hnsw" in ddl]
+
+
+def drop_indexes(names):
+    with Session(engine) as session:
+        for name in names:
+            session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        session.commit()
+
+
+def column_counts():
+    with Session(engine) as session:
+        row = session.execute(text(
+            "SELECT count(*) AS total, count(embedding) AS vector, count(embedding_half) AS halfvec "
+            "FROM document_chunks"
+        )).one()
+    return {"total": row.total, "vector": row.vector, "halfvec": row.halfvec}
+
+
+def index_sizes():
+    with Session(engine) as session:
+        rows = session.execute(text(
+            "SELECT indexrelname, pg_size_pretty(pg_relation_size(indexrelid)) AS size "
+            "FROM pg_stat_user_indexes WHERE relname = 'document_chunks' ORDER BY indexrelname"
+        )).fetchall()
+    return {row.indexrelname: row.size for row in rows}
+
+
+def update_in_batches(sql: str, batch_size: int, label: str) -> int:
+    """id 범위 단위로 UPDATE를 나눠 실행 (행 잠금/WAL을 배치 크기로 제한)"""
+    with Session(engine) as session:
+        min_id, max_id = session.execute(text("SELECT min(id), max(id) FROM document_chunks")).one()
+    if min_id is None:
+        return 0
+
+    updated = 0
+    for start in range(min_id, max_id + 1, batch_size):
+        with Session(engine) as session:
+            result = session.execute(text(sql), {"start": start, "end": start + batch_size})
+            session.commit()
+        updated += result.rowcount or 0
+        print(f"  🔄 {label}: id {min(start + batch_size - 1, max_id):,}/{max_id:,} ({updated:,}행)")
+    return updated
+
+
+def migrate(target: str, drop_source: bool, batch_size: int):
+    source = "halfvec" if target == "vector" else "vector"
+    target_column, target_type = STORAGE_COLUMNS[target]
+    source_column, _ = STORAGE_COLUMNS[source]
+
+    init_db()
+    # 양방향 모두 embedding_half 컬럼 필요 (현재 EMBEDDING_STORAGE=vector여도 추가)
+    if not enable_halfvec():
+        sys.exit(1)
+    print(f"📊 마이그레이션 전: {column_counts()}")
+    print(f"📦 인덱스 크기: {index_sizes()}")
+    started = time.perf_counter()
+
+    # 대상 인덱스는 채운 뒤 한 번에 생성 (행마다 HNSW 갱신하지 않도록)
+    drop_indexes(column_indexes(target_column))
+    copied = update_in_batches(
+        f"UPDATE document_chunks SET {target_column} = {source_column}::{target_type} "
+        f"WHERE id >= :start AND id < :end AND {target_column} IS NULL AND {source_column} IS NOT NULL",
+        batch_size,
+        f"{source} → {target} 복사"
+    )
+
+    # 원래 형식의 HNSW 인덱스는 검색에 쓰이지 않으므로 삭제
+    drop_indexes(column_indexes(source_column))
+
+    cleared = 0
+    if drop_source:
+        cleared = update_in_batches(
+            f"UPDATE document_chunks SET {source_column} = NULL "
+            f"WHERE id >= :start AND id < :end AND {source_column} IS NOT NULL AND {target_column} IS NOT NULL",
+            batch_size,
+            f"{source} 컬럼 비우기"
+        )
+
+    _run_ddl(search_indexes(target), "Index")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM ANALYZE document_chunks"))
+
+    print(f"\n✅ 마이그레이션 완료 ({time.perf_counter() - started:.1f}s): 복사 {copied:,}행, 비움 {cleared:,}행")
+    print(f"📊 마이그레이션 후: {column_counts()}")
+    print(f"📦 인덱스 크기: {index_sizes()}")
+    if settings.EMBEDDING_STORAGE != target:
+        print(f"⚠️ 현재 EMBEDDING_STORAGE={settings.EMBEDDING_STORAGE} - .env에서 {target}로 변경하세요.")
+    if target == "halfvec" and drop_source and settings.EMBEDDING_KEEP_FULL_PRECISION:
+        print("⚠️ float32 임베딩을 비웠으므로 EMBEDDING_KEEP_FULL_PRECISION=false로 설정하세요.")
+    if target == "halfvec" and not drop_source and not settings.EMBEDDING_KEEP_FULL_PRECISION:
+        print("⚠️ EMBEDDING_KEEP_FULL_PRECISION=false이면 float32 임베딩은 쓰이지 않습니다. "
+              "저장 공간을 줄이려면 --drop-source로 다시 실행하세요.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청크 임베딩 저장 형식 마이그레이션")
+    parser.add_argument("--to", choices=sorted(STORAGE_COLUMNS), default=settings.EMBEDDING_STORAGE,
+                        help="대상 저장 형식 (기본값: EMBEDDING_STORAGE)")
+    parser.add_argument("--drop-source", action="store_true",
+                        help="복사 후 원래 형식 컬럼을 비움 (halfvec 대상이면 float32 재채점 불가)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="UPDATE 1회당 id 범위")
+    args = parser.parse_args()
+
+    print(f"🚀 임베딩 저장 형식 마이그레이션 → {args.to}")
+    migrate(args.to, args.drop_source, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
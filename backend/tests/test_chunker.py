@@ -0,0 +1,121 @@
+"""
+청크 분할기 테스트
+스트리밍 입력과 한 번에 분할한 결과가 같은지, 오프셋/토큰 제한/제목 경계/중첩 규칙을 확인합니다.
+"""
+import random
+
+from app.services.chunker import SentenceChunker, TextChunker
+from app.utils.tokens import count_tokens
+
+DOCUMENT = """# 은행 업무 기초
+
+## [BA01] 예금
+
+예금은 고객이 은행에 돈을 맡기는 거래입니다. 보통예금은 입출금이 자유롭습니다. 정기예금은 약정 기간 동안 예치합니다.
+예금자보호법에 따라 1인당 5천만원까지 보호됩니다. 금리는 상품마다 다릅니다.
+
+### 가입 절차
+
+1. 신분증을 확인합니다.
+2. 상품설명서를 안내합니다.
+고객이 이해했는지 확인한 뒤 서명을 받습니다. 마지막으로 통장을 발급합니다.
+
+## [BA02] 대출
+
+대출은 은행이 고객에게 돈을 빌려주는 거래입니다. 담보대출과 신용대출이 있습니다. 금리와 한도는 신용도에 따라 달라집니다.
+상환 방식에는 원리금균등, 원금균등, 만기일시 상환이 있습니다. 중도상환수수료가 있을 수 있습니다.
+"""
+
+
+def random_segments(text, rng):
+    segments = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 40)
+        segments.append(text[position:position + size])
+        position += size
+    return segments
+
+
+def stream(chunker, segments):
+    chunks = []
+    for segment in segments:
+        chunks.extend(chunker.feed(segment))
+    return chunks + chunker.finish()
+
+
+def test_text_chunker_streaming_matches_split_and_offsets():
+    text = DOCUMENT * 3
+    expected = TextChunker(200, 40).split(text)
+    rng = random.Random(0)
+    for _ in range(20):
+        assert stream(TextChunker(200, 40), random_segments(text, rng)) == expected
+
+    for chunk in expected:
+        assert len(chunk["content"]) <= 200
+        assert text[chunk["start"]:chunk["end"]].strip() == chunk["content"]
+    # 인접 청크는 chunk_overlap 이내로 겹침
+    for previous, following in zip(expected, expected[1:]):
+        assert 0 <= previous["end"] - following["start"] <= 40
+
+
+def test_sentence_chunker_streaming_matches_split():
+    text = DOCUMENT * 3
+    expected = SentenceChunker(60, 15).split(text)
+    rng = random.Random(1)
+    for _ in range(20):
+        assert stream(SentenceChunker(60, 15), random_segments(text, rng)) == expected
+
+
+def test_sentence_chunker_offsets_and_token_limit():
+    text = DOCUMENT * 2
+    chunks = SentenceChunker(60, 15).split(text)
+
+    assert len(chunks) > 4
+    for chunk in chunks:
+        assert text[chunk["start"]:chunk["end"]].strip() == chunk["content"]
+        # 제목 줄이 붙는 경우를 제외한 본문 문장은 chunk_tokens 이내
+        body = "".join(line for line in chunk["content"].splitlines(keepends=True) if not line.startswith("#"))
+        assert count_tokens(body) <= 60
+
+
+def test_sentence_chunker_splits_at_headings_with_metadata():
+    chunks = SentenceChunker(400, 50).split(DOCUMENT)
+
+    # ## 제목마다 새 청크, # 대분류는 첫 ## 소제목과 같은 청크
+    assert [chunk["metadata"]["section"] for chunk in chunks] == ["BA01", "BA02"]
+    assert chunks[0]["content"].startswith("# 은행 업무 기초\n\n## [BA01] 예금")
+    assert chunks[0]["metadata"]["headings"] == ["은행 업무 기초", "[BA01] 예금"]
+    assert "### 가입 절차" in chunks[0]["content"]  # 청크가 절반 미만이면 ### 에서 나누지 않음
+    assert chunks[1]["content"].startswith("## [BA02] 대출")
+
+
+def test_sentence_chunker_overlap_only_on_token_split():
+    sentences = [f"{index}번 문장입니다." for index in range(40)]
+    text = "## 섹션 하나\n" + " ".join(sentences) + "\n## 섹션 둘\n" + " ".join(sentences[:3]) + "\n"
+    chunks = SentenceChunker(60, 25).split(text)
+    first_section = [chunk for chunk in chunks if chunk["metadata"]["headings"] == ["섹션 하나"]]
+
+    assert len(first_section) > 1
+    for previous, following in zip(first_section, first_section[1:]):
+        overlap = previous["end"] - following["start"]
+        assert overlap > 0
+        assert count_tokens(text[following["start"]:previous["end"]]) <= 25
+
+    # 제목 경계에서는 중첩 없이 새로 시작
+    second_section = chunks[len(first_section)]
+    assert second_section["start"] >= first_section[-1]["end"]
+    assert second_section["content"].startswith("## 섹션 둘")
+
+
+def test_sentence_chunker_splits_long_sentence_and_unbroken_text():
+    long_sentence = "가" * 500
+    chunks = SentenceChunker(100, 10).split(long_sentence)
+    assert "".join(chunk["content"] for chunk in chunks) == long_sentence
+    assert all(count_tokens(chunk["content"]) <= 100 for chunk in chunks)
+
+    # 줄바꿈 없는 긴 텍스트는 finish() 전에도 청크가 나옴
+    chunker = SentenceChunker(100, 10)
+    unbroken = "예금 상품을 안내합니다. " * 2000
+    assert len(unbroken) > chunker.max_pending_chars
+    assert chunker.feed(unbroken)
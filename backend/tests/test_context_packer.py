@@ -0,0 +1,105 @@
+"""
+컨텍스트 구성 테스트
+점수 순 정렬, 인접 청크 중첩 제거, 중복 제외, 토큰 예산 적용을 확인합니다.
+"""
+from app.services.context_packer import MIN_OVERLAP_CHARS, MIN_PARTIAL_TOKENS, pack_context
+from app.utils.tokens import count_tokens
+
+OVERLAP = "예금자보호법에 따라 1인당 5천만원까지 보호됩니다."
+assert len(OVERLAP) >= MIN_OVERLAP_CHARS
+
+
+def doc(content, similarity, document_id=1, chunk_index=0, title="예금 안내"):
+    return {
+        "content": content,
+        "similarity": similarity,
+        "document_id": document_id,
+        "chunk_index": chunk_index,
+        "title": title
+    }
+
+
+def test_sections_sorted_by_similarity():
+    context, stats = pack_context([
+        doc("두 번째 문서 내용", 0.5, document_id=2, title="B"),
+        doc("첫 번째 문서 내용", 0.9, document_id=1, title="A")
+    ], token_budget=1000)
+
+    assert context == "[A]\n첫 번째 문서 내용\n\n[B]\n두 번째 문서 내용"
+    assert stats["included"] == 2
+    assert stats["candidates"] == 2
+
+
+def test_strips_overlap_with_previous_chunk():
+    first = "정기예금은 만기까지 예치하는 상품입니다. " + OVERLAP
+    second = OVERLAP + " 금리는 가입 시점에 확정됩니다."
+
+    context, stats = pack_context([doc(first, 0.9, chunk_index=0), doc(second, 0.8, chunk_index=1)], 1000)
+
+    assert context.count(OVERLAP) == 1
+    assert context.endswith("[예금 안내]\n금리는 가입 시점에 확정됩니다.")
+    assert stats["overlap_tokens_removed"] == count_tokens(second) - count_tokens("금리는 가입 시점에 확정됩니다.")
+
+
+def test_strips_overlap_with_following_chunk_ranked_first():
+    first = "정기예금은 만기까지 예치하는 상품입니다. " + OVERLAP
+    second = OVERLAP + " 금리는 가입 시점에 확정됩니다."
+
+    context, _ = pack_context([doc(second, 0.9, chunk_index=1), doc(first, 0.8, chunk_index=0)], 1000)
+
+    assert context.count(OVERLAP) == 1
+    assert context.endswith("[예금 안내]\n정기예금은 만기까지 예치하는 상품입니다.")
+
+
+def test_keeps_short_or_unrelated_overlaps():
+    # MIN_OVERLAP_CHARS 미만 일치, 다른 문서, 인접하지 않은 청크는 그대로 유지
+    short = "짧은 일치"
+    docs = [
+        doc("앞 청크 " + short, 0.9, chunk_index=0),
+        doc(short + " 뒤 청크", 0.8, chunk_index=1),
+        doc(OVERLAP + " 다른 문서", 0.7, document_id=2, chunk_index=1, title="B"),
+        doc("앞 내용 " + OVERLAP, 0.6, document_id=1, chunk_index=5)
+    ]
+    context, stats = pack_context(docs, 1000)
+
+    assert context.count(short) == 2
+    assert context.count(OVERLAP) == 2
+    assert stats["included"] == 4
+    assert stats["overlap_tokens_removed"] == 0
+
+
+def test_skips_duplicate_chunks():
+    context, stats = pack_context([doc("같은 청크", 0.9), doc("같은 청크", 0.8)], 1000)
+
+    assert context == "[예금 안내]\n같은 청크"
+    assert stats["included"] == 1
+
+
+def test_token_budget_truncates_then_stops():
+    long_text = "예금 상품 설명 문장입니다. " * 200
+    docs = [
+        doc(long_text, 0.9, document_id=1),
+        doc(long_text, 0.8, document_id=2),
+        doc("남은 예산이 없어 제외", 0.7, document_id=3)
+    ]
+    budget = 300
+    context, stats = pack_context(docs, budget)
+
+    assert stats["tokens"] <= budget
+    assert count_tokens(context.split("\n\n")[0]) <= budget
+    assert stats["truncated"] == 1
+    assert stats["included"] == 1
+    assert "제외" not in context
+
+
+def test_small_remaining_budget_does_not_add_partial_section():
+    first = "가" * 100
+    budget = count_tokens(f"[예금 안내]\n{first}") + MIN_PARTIAL_TOKENS - 1
+    context, stats = pack_context([
+        doc(first, 0.9, document_id=1),
+        doc("나" * 500, 0.8, document_id=2)
+    ], budget)
+
+    assert stats["included"] == 1
+    assert stats["truncated"] == 0
+    assert "나" not in context
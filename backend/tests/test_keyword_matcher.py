@@ -0,0 +1,79 @@
+"""
+키워드 매처 테스트
+Aho-Corasick 탐색 결과를 단순 부분 문자열 탐색과 비교하고, 카테고리 순서와 사전 핫 리로드를 확인합니다.
+"""
+import json
+import os
+import random
+
+from app.services.keyword_matcher import AhoCorasick, KeywordMatcher
+
+
+def brute_force(patterns, text):
+    return {index for index, pattern in enumerate(patterns) if pattern and pattern in text}
+
+
+def test_overlapping_and_nested_patterns():
+    patterns = ["he", "she", "his", "hers", "예금", "정기예금", "금리"]
+    automaton = AhoCorasick(patterns)
+
+    text = "ushers 정기예금리"
+    assert automaton.find(text) == brute_force(patterns, text)
+    assert automaton.find("") == set()
+    assert AhoCorasick([]).find("anything") == set()
+
+
+def test_matches_brute_force_on_random_text():
+    rng = random.Random(0)
+    alphabet = "ab가나"
+    patterns = list(dict.fromkeys(
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(30)
+    ))
+    automaton = AhoCorasick(patterns)
+
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert automaton.find(text) == brute_force(patterns, text)
+
+
+def write_keywords(path, categories):
+    path.write_text(
+        json.dumps({"categories": [{"keywords": words} for words in categories]}, ensure_ascii=False),
+        encoding="utf-8"
+    )
+
+
+def test_extract_returns_matched_categories_in_dictionary_order(tmp_path):
+    path = tmp_path / "keywords.json"
+    write_keywords(path, [["예금", "적금"], ["대출", "금리"], ["카드"]])
+    matcher = KeywordMatcher(path)
+
+    # 질문 속 등장 순서와 관계없이 사전의 카테고리 → 키워드 순서
+    assert matcher.extract("카드 만들고 대출 금리 알려주세요") == ["대출", "금리", "카드"]
+    assert matcher.extract("DEPOSIT 없음") == []
+    assert matcher.extract("예금 대출 카드", limit=3) == ["예금", "적금", "대출"]
+
+
+def test_extract_is_case_insensitive(tmp_path):
+    path = tmp_path / "keywords.json"
+    write_keywords(path, [["ATM", "OTP"]])
+    matcher = KeywordMatcher(path)
+
+    assert matcher.extract("atm 수수료") == ["atm", "otp"]
+
+
+def test_reloads_when_dictionary_changes(tmp_path):
+    path = tmp_path / "keywords.json"
+    write_keywords(path, [["예금"]])
+    matcher = KeywordMatcher(path)
+    assert matcher.extract("예금 펀드") == ["예금"]
+
+    write_keywords(path, [["펀드", "ETF"]])
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))  # 파일 시스템 mtime 해상도와 무관하게 변경 감지
+    assert matcher.extract("예금 펀드") == ["펀드", "etf"]
+
+
+def test_missing_dictionary_matches_nothing(tmp_path):
+    matcher = KeywordMatcher(tmp_path / "missing.json")
+    assert matcher.extract("예금") == []
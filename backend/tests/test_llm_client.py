@@ -0,0 +1,122 @@
+"""
+LLMClient 테스트
+httpx.MockTransport로 OpenAI 호환 API를 흉내 내 네트워크 없이 실행합니다.
+
+    pip install -r requirements-dev.txt
+    python -m pytest tests
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.llm_client import LLMClient
+
+
+def make_client(handler, max_concurrency: int = 8) -> LLMClient:
+    return LLMClient(
+        api_key="test-key",
+        base_url="https://llm.test/v1/",
+        timeout=5.0,
+        max_concurrency=max_concurrency,
+        max_connections=max_concurrency,
+        transport=httpx.MockTransport(handler)
+    )
+
+
+def test_chat_completion():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "  안녕하세요  "}}]})
+
+    async def run():
+        client = make_client(handler)
+        try:
+            return await client.chat_completion(
+                [{"role": "user", "content": "안녕"}], model="test-model", max_tokens=10
+            )
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == "안녕하세요"
+
+    request = requests[0]
+    assert request.url == "https://llm.test/v1/chat/completions"
+    assert request.headers["Authorization"] == "Bearer test-key"
+    payload = json.loads(request.content)
+    assert payload["model"] == "test-model"
+    assert payload["max_tokens"] == 10
+    assert payload["messages"] == [{"role": "user", "content": "안녕"}]
+
+
+def test_chat_completion_raises_on_error_status():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"error": "boom"})
+
+    async def run():
+        client = make_client(handler)
+        try:
+            await client.chat_completion([{"role": "user", "content": "안녕"}])
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        asyncio.run(run())
+    assert error.value.response.status_code == 500
+
+
+def test_stream_chat_completion():
+    chunks = ["안녕", "하세요", "!"]
+    body = "".join(
+        f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]}, ensure_ascii=False)}\n\n"
+        for chunk in chunks
+    )
+    # 역할만 있는 첫 delta, 주석 줄, [DONE] 이후 데이터는 무시되어야 함
+    body = (
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}\n\n'
+        ": keep-alive\n\n"
+        + body
+        + "data: [DONE]\n\n"
+        + 'data: {"choices": [{"delta": {"content": "무시"}}]}\n\n'
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, text=body)
+
+    async def run():
+        client = make_client(handler)
+        try:
+            return [delta async for delta in client.stream_chat_completion([{"role": "user", "content": "안녕"}])]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == chunks
+
+
+def test_concurrency_limited_by_semaphore():
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    async def run():
+        client = make_client(handler, max_concurrency=2)
+        try:
+            return await asyncio.gather(*[
+                client.chat_completion([{"role": "user", "content": str(i)}]) for i in range(6)
+            ])
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == ["ok"] * 6
+    assert peak == 2
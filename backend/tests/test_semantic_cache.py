@@ -0,0 +1,114 @@
+"""
+SemanticCache 테스트
+임계값 적중/실패, LRU 교체, TTL 만료, 무효화 후 행렬/키 매핑 일관성을 확인합니다.
+"""
+import numpy as np
+
+from app.services import semantic_cache
+from app.services.semantic_cache import SemanticCache
+
+DIMENSIONS = 8
+
+
+def unit(index: int) -> list:
+    return np.eye(DIMENSIONS, dtype=np.float32)[index].tolist()
+
+
+def assert_consistent(cache: SemanticCache):
+    """유효 행과 key → 행 매핑, LRU 목록이 서로 일치하는지 확인"""
+    assert len(cache._row_keys) == cache._size == len(cache._rows) == len(cache._entries)
+    for row, key in enumerate(cache._row_keys):
+        assert cache._rows[key] == row
+
+
+def test_hit_above_threshold_and_miss_below():
+    cache = SemanticCache(threshold=0.95, ttl_seconds=60, max_size=4)
+    cache.set(unit(0), {"answer": "a"})
+
+    # 크기가 달라도 정규화 후 비교
+    assert cache.get([value * 3 for value in unit(0)]) == {"answer": "a"}
+
+    near = np.asarray(unit(0)) + 0.1 * np.asarray(unit(1))  # 코사인 약 0.995
+    assert cache.get(near.tolist()) == {"answer": "a"}
+    assert cache.get(unit(1)) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+
+
+def test_empty_cache_and_dimension_mismatch_miss():
+    cache = SemanticCache(threshold=0.9, ttl_seconds=60, max_size=4)
+    assert cache.get(unit(0)) is None
+
+    cache.set(unit(0), {"answer": "a"})
+    assert cache.get([1.0, 0.0, 0.0]) is None
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = SemanticCache(threshold=0.99, ttl_seconds=60, max_size=3)
+    for index in range(3):
+        cache.set(unit(index), {"answer": index})
+
+    assert cache.get(unit(0)) == {"answer": 0}  # 0을 최근 사용으로 갱신 → 1이 가장 오래됨
+    cache.set(unit(3), {"answer": 3})
+
+    assert cache.get(unit(1)) is None
+    for index in (0, 2, 3):
+        assert cache.get(unit(index)) == {"answer": index}
+    assert cache.stats()["size"] == 3
+    assert_consistent(cache)
+
+
+def test_ttl_expiry_removes_rows(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+
+    cache = SemanticCache(threshold=0.99, ttl_seconds=10, max_size=4)
+    cache.set(unit(0), {"answer": 0})
+    now[0] += 5
+    cache.set(unit(1), {"answer": 1})
+    cache.set(unit(2), {"answer": 2})
+
+    now[0] += 6  # 첫 항목만 만료
+    assert cache.get(unit(0)) is None
+    assert cache.get(unit(1)) == {"answer": 1}
+    assert cache.get(unit(2)) == {"answer": 2}
+    assert cache.stats()["size"] == 2
+    assert_consistent(cache)
+
+    now[0] += 10
+    assert cache.get(unit(1)) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_swap_delete_matches_brute_force():
+    rng = np.random.default_rng(0)
+    cache = SemanticCache(threshold=0.0, ttl_seconds=60, max_size=16)
+    stored = {}
+    for index in range(40):
+        vector = rng.standard_normal(DIMENSIONS)
+        cache.set(vector.tolist(), {"answer": index})
+        stored[index] = vector / np.linalg.norm(vector)
+        stored = dict(list(stored.items())[-16:])  # 조회 없이 저장만 하면 LRU = 삽입 순서
+    assert_consistent(cache)
+
+    for _ in range(20):
+        query = rng.standard_normal(DIMENSIONS)
+        expected = max(stored, key=lambda key: float(stored[key] @ query))
+        assert cache.get(query.tolist())["answer"] == expected
+        # 조회된 항목은 LRU 갱신 - 기대값 순서도 같이 갱신
+        stored[expected] = stored.pop(expected)
+
+
+def test_invalidate_clears_entries():
+    cache = SemanticCache(threshold=0.9, ttl_seconds=60, max_size=4)
+    cache.set(unit(0), {"answer": 0})
+    cache.invalidate()
+
+    assert cache.get(unit(0)) is None
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+    cache.set(unit(1), {"answer": 1})
+    assert cache.get(unit(1)) == {"answer": 1}
+    assert_consistent(cache)
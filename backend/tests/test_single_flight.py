@@ -0,0 +1,96 @@
+"""
+동일 요청 병합 테스트
+같은 키의 동시 요청이 한 번만 실행되는지, 예외/취소가 대기 중인 요청에 어떻게 전달되는지 확인합니다.
+"""
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight, normalize_question
+
+
+def test_normalize_question():
+    assert normalize_question("  예금자  보호란\n무엇인가요??  ") == "예금자 보호란 무엇인가요"
+    assert normalize_question("ＡＴＭ 수수료!") == "atm 수수료"
+    assert normalize_question("금리.~") == normalize_question("금리")
+
+
+def test_concurrent_calls_with_same_key_run_once():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do("q", compute) for _ in range(5)])
+        return flight, results
+
+    flight, results = asyncio.run(run())
+
+    assert calls == 1
+    assert [result for result, _ in results] == ["answer"] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 4, "coalesced_rate": 0.8}
+
+
+def test_different_keys_and_sequential_calls_run_separately():
+    calls = []
+
+    def compute(value):
+        async def inner():
+            calls.append(value)
+            await asyncio.sleep(0)
+            return value
+        return inner
+
+    async def run():
+        flight = SingleFlight()
+        first = await asyncio.gather(flight.do("a", compute("a")), flight.do("b", compute("b")))
+        # 완료된 키는 다시 실행
+        second = await flight.do("a", compute("a2"))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == [("a", False), ("b", False)]
+    assert second == ("a2", False)
+    assert calls == ["a", "b", "a2"]
+
+
+def test_exception_is_shared_and_key_released():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(flight.do("q", fail), flight.do("q", fail), return_exceptions=True)
+        return flight, results
+
+    flight, results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_waiters():
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "answer"
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.create_task(flight.do("q", compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("q", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == ("answer", True)
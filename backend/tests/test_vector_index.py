@@ -0,0 +1,110 @@
+"""
+메모리 벡터 인덱스 테스트
+DB 없이 upsert로 인덱스를 채워 상위 k개 결과를 NumPy 전수 비교와 맞춰 보고,
+문서 교체/삭제와 최대 청크 수 제한을 확인합니다.
+"""
+import numpy as np
+
+from app.services.vector_index import EMBEDDING_DIMENSIONS, InMemoryVectorIndex
+
+
+def make_index(max_chunks: int = 10_000) -> InMemoryVectorIndex:
+    index = InMemoryVectorIndex(max_chunks=max_chunks)
+    index.loaded = True  # load()는 DB 필요 - 빈 인덱스로 시작
+    return index
+
+
+def random_vectors(rng, count: int) -> np.ndarray:
+    return rng.standard_normal((count, EMBEDDING_DIMENSIONS)).astype(np.float32)
+
+
+def add_document(index, document_id, vectors, category="RAG"):
+    index.upsert_document(
+        document_id, f"문서 {document_id}", category,
+        [(chunk_index, f"{document_id}-{chunk_index}", vector.tolist()) for chunk_index, vector in enumerate(vectors)]
+    )
+
+
+def brute_force(vectors_by_key, query, k):
+    normalized_query = query / np.linalg.norm(query)
+    scores = {
+        key: float(vector @ normalized_query / np.linalg.norm(vector))
+        for key, vector in vectors_by_key.items()
+    }
+    return sorted(scores, key=scores.get, reverse=True)[:k], scores
+
+
+def test_top_k_matches_numpy_brute_force():
+    rng = np.random.default_rng(0)
+    index = make_index()
+    rag_vectors = {}
+    for document_id in range(20):
+        vectors = random_vectors(rng, 15)
+        add_document(index, document_id, vectors)
+        rag_vectors.update({(document_id, chunk_index): vector for chunk_index, vector in enumerate(vectors)})
+    add_document(index, 99, random_vectors(rng, 10), category="FAQ")
+
+    for k in (1, 5, 50, 1000):
+        query = rng.standard_normal(EMBEDDING_DIMENSIONS)
+        expected, scores = brute_force(rag_vectors, query, k)
+        results = index.search(query.tolist(), k, "RAG")
+
+        assert [(hit["document_id"], hit["chunk_index"]) for hit in results] == expected
+        for hit in results:
+            key = (hit["document_id"], hit["chunk_index"])
+            assert abs(hit["similarity"] - scores[key]) < 1e-4
+            assert abs(hit["distance"] - (1.0 - hit["similarity"])) < 1e-6
+            assert hit["title"] == f"문서 {key[0]}"
+            assert hit["content"] == f"{key[0]}-{key[1]}"
+
+    assert index.search(rng.standard_normal(EMBEDDING_DIMENSIONS).tolist(), 5, "없는 카테고리") == []
+
+
+def test_upsert_replaces_and_remove_deletes_document_rows():
+    rng = np.random.default_rng(1)
+    index = make_index()
+    first, second, replacement = random_vectors(rng, 3), random_vectors(rng, 4), random_vectors(rng, 2)
+    add_document(index, 1, first)
+    add_document(index, 2, second)
+    add_document(index, 1, replacement)
+    assert index.stats()["chunks"] == {"RAG": 6}
+
+    # 교체된 임베딩으로 찾으면 자기 자신이 1위
+    for chunk_index, vector in enumerate(replacement):
+        hit = index.search(vector.tolist(), 1, "RAG")[0]
+        assert (hit["document_id"], hit["chunk_index"]) == (1, chunk_index)
+
+    index.remove_documents([1])
+    assert index.stats()["chunks"] == {"RAG": 4}
+    results = index.search(first[0].tolist(), 10, "RAG")
+    assert {hit["document_id"] for hit in results} == {2}
+
+
+def test_upsert_skips_chunks_without_embeddings_and_moves_category():
+    rng = np.random.default_rng(2)
+    index = make_index()
+    vector = random_vectors(rng, 1)[0].tolist()
+    index.upsert_document(1, "문서", "RAG", [(0, "임베딩 있음", vector), (1, "임베딩 없음", None)])
+    assert index.stats()["chunks"] == {"RAG": 1}
+
+    index.upsert_document(1, "문서", "FAQ", [(0, "임베딩 있음", vector)])
+    assert index.stats()["chunks"] == {"RAG": 0, "FAQ": 1}
+
+
+def test_upsert_beyond_max_chunks_disables_index():
+    rng = np.random.default_rng(3)
+    index = make_index(max_chunks=5)
+    add_document(index, 1, random_vectors(rng, 3))
+    add_document(index, 1, random_vectors(rng, 5))  # 교체 후 5개 - 상한 이내
+    assert index.loaded
+
+    add_document(index, 2, random_vectors(rng, 1))
+    assert not index.loaded
+    assert index.stats()["chunks"] == {}
+
+
+def test_not_loaded_index_ignores_updates():
+    rng = np.random.default_rng(4)
+    index = InMemoryVectorIndex(max_chunks=100)
+    add_document(index, 1, random_vectors(rng, 2))
+    assert index.stats()["chunks"] == {}